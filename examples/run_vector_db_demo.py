@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import argparse
-import json
+import dataclasses
+import os
 from pathlib import Path
 
+from huf_core.cache import CycleCache
 from huf_core.core import HUFCore, HUFConfig
+from huf_core.disk_cache import DiskCache, cached_elements
 from huf_core.io import write_artifacts
 from huf_core.vector_db_adapter import VectorDBAdapterConfig, vector_db_results_to_elements
 
@@ -18,6 +21,10 @@ def main() -> int:
     ap.add_argument("--regime-field", type=str, default="namespace", help="Column used to define regimes.")
     ap.add_argument("--nonneg-mode", type=str, default="clip", choices=["clip", "shift"], help="How to handle negative scores.")
     ap.add_argument("--top-k", type=int, default=200, help="Optional truncate of retrieval list before HUF.")
+    ap.add_argument("--cache-dir", type=Path, default=os.environ.get("HUF_CACHE_DIR") or None,
+                    help="Opt-in on-disk cache of elements and artifacts (default: $HUF_CACHE_DIR, else off).")
+    ap.add_argument("--artifact-format", choices=["csv", "parquet", "arrow"], default="csv",
+                    help="Table artifacts as CSV/JSONL (default) or Parquet / Arrow IPC (needs pyarrow).")
     args = ap.parse_args()
 
     cfg = VectorDBAdapterConfig(
@@ -27,16 +34,18 @@ def main() -> int:
         trace_include_fields=["source", "cluster", "collection"],
     )
 
-    elements, meta = vector_db_results_to_elements(args.in_path, cfg=cfg, query_label=args.query_label)
+    store = DiskCache(args.cache_dir) if args.cache_dir is not None else None
+    elements, meta = cached_elements(
+        store, "vector_db_results_to_elements", args.in_path,
+        lambda: vector_db_results_to_elements(args.in_path, cfg=cfg, query_label=args.query_label),
+        cfg=dataclasses.asdict(cfg), query_label=args.query_label,
+    )
 
-    core = HUFCore(elements, dataset_id=meta["dataset_id"])
+    core = HUFCore(elements, dataset_id=meta["dataset_id"], cache=CycleCache(backing=store))
     hcfg = HUFConfig(budget_type="mass", exclusion="global", tau=float(args.tau_global))
 
     artifacts = core.cycle(hcfg)
-    write_artifacts(args.out, artifacts)
-
-    args.out.mkdir(parents=True, exist_ok=True)
-    (args.out / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    write_artifacts(args.out, artifacts, format=args.artifact_format, extras={"meta.json": meta})
     print(f"[OK] Wrote artifacts to: {args.out}")
     return 0
 
@@ -1,2 +1,10 @@
 from .core import HUFCore, HUFConfig, RunStamp, REQUIRED_TRACE_FIELDS
 from .core import HUFRun
+from .schema import compact_elements
+from .cache import CycleCache
+from .timeseries import CycleSeries
+
+__all__ = [
+    "HUFCore", "HUFConfig", "RunStamp", "REQUIRED_TRACE_FIELDS", "HUFRun",
+    "compact_elements", "CycleCache", "CycleSeries",
+]
@@ -8,6 +8,8 @@ import math
 import numpy as np
 import pandas as pd
 
+from .backend import get_backend
+
 try:
     from astropy.io import fits
 except Exception:  # pragma: no cover
@@ -99,23 +101,26 @@ def planck_error_metric_from_budget(meta: Dict[str, Any], discarded_budget_globa
         "note": "Exact equality: discarded_budget_global == ||Δf||_2^2 / ||f||_2^2 (pixel basis, energy budget)."
     }
 
-def traffic_phase_band_elements(csv_path: Path) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+def traffic_phase_band_elements(csv_path: Path, backend: Any = "pandas") -> Tuple[pd.DataFrame, Dict[str, Any]]:
     """
     Compressed phase activity distribution.
     Finite elements: TCS x PHASE_BAND counts
     Regimes: TCS
+    backend: array backend for the group counts (same elements on every backend)
     """
     csv_path = Path(csv_path)
     df = pd.read_csv(csv_path)
     df["PHASE_BAND"] = df["PHASE"].apply(_phase_band)
-    counts = df.groupby(["TCS", "PHASE_BAND"]).size().reset_index(name="count")
+    counts = _group_counts(df, ["TCS", "PHASE_BAND"], backend)
+    tcs = [int(t) for t in counts["TCS"].tolist()]
+    bands = counts["PHASE_BAND"].tolist()
     elements = pd.DataFrame({
-        "element_id": counts.apply(lambda r: f"TCS={int(r['TCS'])}/band={r['PHASE_BAND']}", axis=1),
-        "regime_id": counts["TCS"].apply(lambda t: f"TCS={int(t)}"),
+        "element_id": [f"TCS={t}/band={b}" for t, b in zip(tcs, bands)],
+        "regime_id": [f"TCS={t}" for t in tcs],
         "value": counts["count"].astype(float),
     })
     # trace points back to filter rules, not individual row ids by default
-    elements["trace_path"] = counts.apply(lambda r: json.dumps(["Global", f"TCS={int(r['TCS'])}", f"PHASE_BAND={r['PHASE_BAND']}"]), axis=1)
+    elements["trace_path"] = [json.dumps(["Global", f"TCS={t}", f"PHASE_BAND={b}"]) for t, b in zip(tcs, bands)]
     elements["inputs_ref"] = _file_fingerprint(csv_path)
     elements["method_ref"] = "counts(TCS x PHASE_BAND); PHASE_BAND={MajorEven(2,4,6,8),MinorOdd(1,3,5,7),Other(9-12)}"
 
@@ -128,12 +133,18 @@ def traffic_phase_band_elements(csv_path: Path) -> Tuple[pd.DataFrame, Dict[str,
     }
     return elements, meta
 
-def traffic_anomaly_elements(csv_path: Path, anomaly_status: Optional[List[str]] = None, include_call_text: bool = False) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+def traffic_anomaly_elements(
+    csv_path: Path,
+    anomaly_status: Optional[List[str]] = None,
+    include_call_text: bool = False,
+    backend: Any = "pandas"
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     """
     Diagnostic adapter: identify intersections/phases that dominate declared anomaly statuses.
     Finite elements: TCS x PHASE x PHASE_STATUS_TEXT (+ optionally PHASE_CALL_TEXT)
     Regimes: TCS
     Budget: counts within the anomaly subset (conditional mass budget).
+    backend: array backend for the group counts (same elements on every backend)
     """
     csv_path = Path(csv_path)
     df = pd.read_csv(csv_path)
@@ -149,26 +160,32 @@ def traffic_anomaly_elements(csv_path: Path, anomaly_status: Optional[List[str]]
         dfa["PHASE_CALL_TEXT"] = dfa["PHASE_CALL_TEXT"].fillna("Unknown")
         group_cols.append("PHASE_CALL_TEXT")
 
-    counts = dfa.groupby(group_cols).size().reset_index(name="count")
+    counts = _group_counts(dfa, group_cols, backend)
+
+    with_call = include_call_text and "PHASE_CALL_TEXT" in counts.columns
+    tcs = [int(t) for t in counts["TCS"].tolist()]
+    phase = [int(p) for p in counts["PHASE"].tolist()]
+    status = counts["PHASE_STATUS_TEXT"].tolist()
+    call = counts["PHASE_CALL_TEXT"].tolist() if with_call else [None] * len(counts)
 
-    def _id(r) -> str:
-        base = f"TCS={int(r['TCS'])}/phase={int(r['PHASE'])}/status={r['PHASE_STATUS_TEXT']}"
-        if include_call_text and "PHASE_CALL_TEXT" in counts.columns:
-            base += f"/call={r['PHASE_CALL_TEXT']}"
+    def _id(t: int, p: int, st: Any, c: Any) -> str:
+        base = f"TCS={t}/phase={p}/status={st}"
+        if with_call:
+            base += f"/call={c}"
         return base
 
     elements = pd.DataFrame({
-        "element_id": counts.apply(_id, axis=1),
-        "regime_id": counts["TCS"].apply(lambda t: f"TCS={int(t)}"),
+        "element_id": [_id(*r) for r in zip(tcs, phase, status, call)],
+        "regime_id": [f"TCS={t}" for t in tcs],
         "value": counts["count"].astype(float),
     })
 
-    elements["trace_path"] = counts.apply(lambda r: json.dumps([
+    elements["trace_path"] = [json.dumps([
         "AnomalySubset",
-        f"TCS={int(r['TCS'])}",
-        f"PHASE={int(r['PHASE'])}",
-        f"PHASE_STATUS_TEXT={r['PHASE_STATUS_TEXT']}"
-    ] + ([f"PHASE_CALL_TEXT={r['PHASE_CALL_TEXT']}"] if include_call_text and "PHASE_CALL_TEXT" in counts.columns else [])), axis=1)
+        f"TCS={t}",
+        f"PHASE={p}",
+        f"PHASE_STATUS_TEXT={st}"
+    ] + ([f"PHASE_CALL_TEXT={c}"] if with_call else [])) for t, p, st, c in zip(tcs, phase, status, call)]
 
     elements["inputs_ref"] = _file_fingerprint(csv_path)
     elements["method_ref"] = f"counts(TCS x PHASE x PHASE_STATUS_TEXT{' x PHASE_CALL_TEXT' if include_call_text else ''}) over anomaly subset={anomaly_status}"
@@ -287,3 +304,32 @@ def _phase_band(ph) -> str:
     if p in (1, 3, 5, 7):
         return "MinorOdd(1,3,5,7)"
     return "Other(9-12)"
+
+def _group_counts(df: pd.DataFrame, cols: List[str], backend: Any = "pandas") -> pd.DataFrame:
+    """
+    df.groupby(cols).size().reset_index(name="count") on the array backend: each
+    column is factorized (sorted uniques), the codes are combined into one
+    mixed-radix key, and the key is factorized and counted with segment_sum. Rows
+    with a missing key are dropped, and groups come out in sorted key order.
+    """
+    be = get_backend(backend)
+    n = len(df)
+    key = np.zeros(n, dtype=np.int64)
+    valid = np.ones(n, dtype=bool)
+    uniques = []
+    for c in cols:
+        codes, u = be.factorize(df[c].to_numpy())
+        valid &= codes >= 0
+        key = key * max(1, len(u)) + codes
+        uniques.append(u)
+    group, keys = be.factorize(key[valid])
+    keys = np.asarray(keys, dtype=np.int64)
+    counts = be.segment_sum(group, np.ones(group.size, dtype=np.float64), len(keys))
+    out = {}
+    for c, u in zip(reversed(cols), reversed(uniques)):
+        radix = max(1, len(u))
+        out[c] = u.take(keys % radix)
+        keys = keys // radix
+    res = pd.DataFrame({c: out[c] for c in cols})
+    res["count"] = counts.astype(np.int64)
+    return res
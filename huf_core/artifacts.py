@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Tuple
+import json
+
+import numpy as np
+import pandas as pd
+
+ACTIVE_SET_FIELDS: Tuple[str, ...] = (
+    "rank", "item_id", "regime_id", "rho_global_post", "rho_global_pre",
+    "rho_local_pre", "rho_local_post", "value", "tau", "exclusion",
+)
+TRACE_FIELDS: Tuple[str, ...] = (
+    "item_id", "regime_path", "rho_global_post", "inputs_ref", "method_ref", "discarded_budget_global",
+)
+
+
+def trace_path_list(raw: Any, regime_id: Any, element_id: Any) -> List[str]:
+    """Parse a trace_path JSON cell, falling back to [regime_id, element_id]."""
+    if isinstance(raw, str) and raw.strip():
+        try:
+            return json.loads(raw)
+        except Exception:
+            pass
+    return [str(regime_id), str(element_id)]
+
+
+class RecordTable(Sequence):
+    """
+    Columnar artifact table with a list-of-dict view.
+
+    `frame` holds the columns (what write_artifacts serializes); iterating or
+    indexing builds plain-Python record dicts on demand, and `+` with a list
+    gives a list. It is a Sequence, not a list: isinstance(x, list) is False and
+    json.dumps needs `to_list()` (or default=json_default).
+    """
+
+    fields: Tuple[str, ...] = ()
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(self._records(self.frame.iloc[i]))
+        n = len(self.frame)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("record index out of range")
+        return next(self._records(self.frame.iloc[i:i + 1]))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self._records(self.frame)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (RecordTable, list, tuple)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} records)"
+
+    def __add__(self, other: Any) -> List[Dict[str, Any]]:
+        if isinstance(other, (RecordTable, list, tuple)):
+            return list(self) + list(other)
+        return NotImplemented
+
+    def __radd__(self, other: Any) -> List[Dict[str, Any]]:
+        if isinstance(other, (list, tuple)):
+            return list(other) + list(self)
+        return NotImplemented
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def _records(self, frame: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+        cols = list(frame.columns)
+        for row in zip(*(frame[c].tolist() for c in cols)):
+            yield dict(zip(cols, row))
+
+
+def json_default(obj: Any) -> Any:
+    """json.dumps(..., default=json_default) hook: record tables encode as their record lists."""
+    if isinstance(obj, RecordTable):
+        return obj.to_list()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ActiveSetTable(RecordTable):
+    """Artifact 2: kept elements ranked by rho_global_post (rank starts at 1)."""
+
+    fields = ACTIVE_SET_FIELDS
+
+    @classmethod
+    def from_columns(
+        cls,
+        item_id: Any,
+        regime_id: Any,
+        rho_global_post: Any,
+        rho_global_pre: Any,
+        rho_local_pre: Any,
+        rho_local_post: Any,
+        value: Any,
+        tau: float,
+        exclusion: str
+    ) -> "ActiveSetTable":
+        n = len(rho_global_post)
+        return cls(pd.DataFrame({
+            "rank": np.arange(1, n + 1, dtype=np.int64),
+            "item_id": _as_str(item_id),
+            "regime_id": _as_str(regime_id),
+            "rho_global_post": np.asarray(rho_global_post, dtype=np.float64),
+            "rho_global_pre": np.asarray(rho_global_pre, dtype=np.float64),
+            "rho_local_pre": np.asarray(rho_local_pre, dtype=np.float64),
+            "rho_local_post": np.asarray(rho_local_post, dtype=np.float64),
+            "value": np.asarray(value, dtype=np.float64),
+            "tau": np.full(n, float(tau)),
+            "exclusion": np.full(n, exclusion, dtype=object),
+        }))
+
+
+class TraceTable(RecordTable):
+    """
+    Artifact 3: one trace record per kept element, in active-set rank order.
+    The frame keeps trace_path as the raw JSON cell (plus regime_id for the
+    fallback path); regime_path lists are parsed only when records are built.
+    """
+
+    fields = TRACE_FIELDS
+
+    @classmethod
+    def from_columns(
+        cls,
+        item_id: Any,
+        regime_id: Any,
+        trace_path: Any,
+        rho_global_post: Any,
+        inputs_ref: Any,
+        method_ref: Any,
+        discarded_budget_global: float
+    ) -> "TraceTable":
+        n = len(rho_global_post)
+        return cls(pd.DataFrame({
+            "item_id": _as_str(item_id),
+            "regime_id": _as_str(regime_id),
+            "trace_path": np.full(n, None, dtype=object) if trace_path is None else np.asarray(trace_path, dtype=object),
+            "rho_global_post": np.asarray(rho_global_post, dtype=np.float64),
+            "inputs_ref": np.full(n, "", dtype=object) if inputs_ref is None else _as_str(inputs_ref),
+            "method_ref": np.full(n, "", dtype=object) if method_ref is None else _as_str(method_ref),
+            "discarded_budget_global": np.full(n, float(discarded_budget_global)),
+        }))
+
+    def _records(self, frame: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+        for eid, rid, path, gpost, iref, mref, disc in zip(
+            frame["item_id"].tolist(),
+            frame["regime_id"].tolist(),
+            frame["trace_path"].tolist(),
+            frame["rho_global_post"].tolist(),
+            frame["inputs_ref"].tolist(),
+            frame["method_ref"].tolist(),
+            frame["discarded_budget_global"].tolist(),
+        ):
+            yield {
+                "item_id": eid,
+                "regime_path": trace_path_list(path, rid, eid),
+                "rho_global_post": gpost,
+                "inputs_ref": iref,
+                "method_ref": mref,
+                "discarded_budget_global": disc,
+            }
+
+
+def _as_str(x: Any) -> np.ndarray:
+    # Vectorized str(); missing cells keep str(v) ("nan", "None") like the per-row builders did
+    s = pd.Series(np.asarray(x, dtype=object), copy=False)
+    out = s.astype(str).to_numpy(dtype=object)
+    missing = s.isna().to_numpy()
+    if missing.any():
+        out[missing] = [str(v) for v in s[missing]]
+    return out
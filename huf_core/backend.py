@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from typing import Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+BACKENDS = ("pandas", "numpy", "polars")
+
+
+class PandasBackend:
+    """
+    Array primitives behind the columnar engine (reference implementation).
+
+    Every primitive takes and returns numpy arrays, so backends can be swapped
+    without touching the engine:
+      - factorize(values)            -> (intp codes, sorted unique Index)
+      - segment_sum(codes, w, n)     -> float64 totals per code
+      - filter(mask)                 -> positions where mask is True
+      - sort_desc(x)                 -> descending order, ties as sort_values(ascending=False)
+    There is no write primitive: io.write_artifacts serializes every backend's
+    artifacts the same way, so file bytes and manifest checksums never depend on
+    the backend that computed them.
+    """
+    name = "pandas"
+
+    def factorize(self, values: Any) -> Tuple[np.ndarray, pd.Index]:
+        codes, uniques = pd.factorize(values, sort=True)
+        return codes.astype(np.intp, copy=False), pd.Index(uniques)
+
+    def segment_sum(self, codes: np.ndarray, weights: np.ndarray, n_segments: int) -> np.ndarray:
+        # pandas' compensated group-sum on pre-factorized codes (no rehashing): totals
+        # match groupby(...).sum() / transform("sum") bit-for-bit
+        grouper = pd.Categorical.from_codes(codes, categories=pd.RangeIndex(n_segments))
+        return pd.Series(weights, copy=False).groupby(grouper, observed=False).sum().to_numpy(dtype=np.float64)
+
+    def filter(self, mask: np.ndarray) -> np.ndarray:
+        return np.flatnonzero(mask)
+
+    def sort_desc(self, x: np.ndarray) -> np.ndarray:
+        n = len(x)
+        return (n - 1 - np.argsort(x[::-1], kind="quicksort"))[::-1]
+
+    def __reduce__(self) -> Any:
+        return (get_backend, (self.name,))
+
+
+class NumpyBackend(PandasBackend):
+    """
+    Pure numpy factorize (np.unique), filter and ranking. Segment sums stay on the
+    reference compensated kernel: a plain np.bincount (or math.fsum) rounds
+    differently from it in the last ulp, and regime totals must be bit-identical
+    across backends for the artifacts to be.
+    """
+    name = "numpy"
+
+    def factorize(self, values: Any) -> Tuple[np.ndarray, pd.Index]:
+        arr = np.asarray(values)
+        if arr.dtype.kind in "fc":
+            # NaN is missing (code -1), as in the reference factorize
+            present = ~np.isnan(arr)
+            if not present.all():
+                uniques, inverse = np.unique(arr[present], return_inverse=True)
+                codes = np.full(arr.shape, -1, dtype=np.intp)
+                codes[present] = inverse.reshape(-1)
+                return codes, pd.Index(uniques)
+        try:
+            uniques, codes = np.unique(arr, return_inverse=True)
+        except TypeError:
+            # mixed types / None in an object array are not orderable for np.unique;
+            # the reference factorize handles them (None -> code -1)
+            return super().factorize(values)
+        return codes.astype(np.intp, copy=False).reshape(-1), pd.Index(uniques)
+
+
+class PolarsBackend(PandasBackend):
+    """
+    Polars (optional dependency): multithreaded factorize and filtering on Arrow
+    buffers. Ranking keeps the reference tie order and segment sums use the
+    reference compensated kernel (polars' group sums round differently), so the
+    artifacts match the pandas backend exactly.
+    """
+    name = "polars"
+
+    def __init__(self) -> None:
+        try:
+            import polars as pl
+        except ImportError as e:  # pragma: no cover - depends on the environment
+            raise ImportError("backend='polars' requires polars (pip install polars)") from e
+        self._pl = pl
+
+    def factorize(self, values: Any) -> Tuple[np.ndarray, pd.Index]:
+        pl = self._pl
+        s = pl.Series("v", np.asarray(values))
+        uniques = s.unique().sort()
+        codes = uniques.search_sorted(s, side="left").to_numpy()
+        return codes.astype(np.intp, copy=False), pd.Index(uniques.to_numpy())
+
+    def filter(self, mask: np.ndarray) -> np.ndarray:
+        return self._pl.Series(mask).arg_true().to_numpy().astype(np.intp, copy=False)
+
+
+_BACKEND_TYPES = {"pandas": PandasBackend, "numpy": NumpyBackend, "polars": PolarsBackend}
+_INSTANCES: dict = {}
+
+
+def get_backend(backend: Any = "pandas") -> PandasBackend:
+    """Backend by name (instances are shared) or an already-built backend object."""
+    if isinstance(backend, PandasBackend):
+        return backend
+    if backend not in _BACKEND_TYPES:
+        raise ValueError(f"backend must be one of {BACKENDS}")
+    if backend not in _INSTANCES:
+        _INSTANCES[backend] = _BACKEND_TYPES[backend]()
+    return _INSTANCES[backend]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+
+from .engine import ColumnarFrame, _safe_ratio, exclusion_mask
+
+NoiseModel = Union[str, Callable[[np.random.Generator, np.ndarray, int], np.ndarray]]
+NOISE_MODELS = ("poisson", "jitter")
+_CHUNK_CELLS = 1 << 22  # samples x elements per chunk (~32 MB per float64 matrix)
+
+
+@dataclass(frozen=True)
+class BootstrapResult:
+    kept_count: np.ndarray        # per element: number of valid samples that kept it
+    discarded: np.ndarray         # discarded_budget_global per sample (NaN when invalid)
+    n_valid: int                  # samples with at least one kept element
+
+
+def draw_values(rng: np.random.Generator, value: np.ndarray, size: int, noise_model: NoiseModel, scale: float) -> np.ndarray:
+    """
+    (size x n) resampled values.
+      - "poisson": counts redrawn as Poisson(value)
+      - "jitter":  scores times lognormal noise with sigma=scale (median factor 1)
+      - callable(rng, value, size) -> (size x n) nonnegative matrix
+    """
+    if callable(noise_model):
+        out = np.asarray(noise_model(rng, value, size), dtype=np.float64)
+        if out.shape != (size, value.size) or (out < 0).any():
+            raise ValueError("noise model must return a nonnegative (size x n) matrix")
+        return out
+    if noise_model == "poisson":
+        return rng.poisson(value, size=(size, value.size)).astype(np.float64)
+    if noise_model == "jitter":
+        return value * rng.lognormal(0.0, scale, size=(size, value.size))
+    raise ValueError(f"noise_model must be one of {NOISE_MODELS} or a callable")
+
+
+def bootstrap_frame(
+    frame: ColumnarFrame,
+    config: Any,
+    n_samples: int,
+    noise_model: NoiseModel,
+    seed: int,
+    scale: float = 0.1,
+    chunk_size: Optional[int] = None
+) -> BootstrapResult:
+    """
+    Monte Carlo cycles on resampled values, a chunk of samples at a time.
+
+    Each chunk is one (samples x n) matrix: normalization, per-regime totals (one
+    bincount over row-offset regime codes), the exclusion predicate and the
+    discarded budget are whole-matrix operations. A sample whose exclusion keeps
+    nothing counts as invalid (cycle() would raise) and is left out of the
+    inclusion counts.
+    """
+    if n_samples < 1:
+        raise ValueError("n_samples must be >= 1")
+    n = frame.value.size
+    r = frame.n_regimes
+    rows = chunk_size or max(1, _CHUNK_CELLS // max(1, n))
+    rng = np.random.default_rng(seed)
+
+    kept_count = np.zeros(n, dtype=np.int64)
+    discarded = np.full(n_samples, np.nan)
+    n_valid = 0
+    for lo in range(0, n_samples, rows):
+        m = min(rows, n_samples - lo)
+        v = draw_values(rng, frame.value, m, noise_model, scale)
+        total = v.sum(axis=1)
+        rho_global = _safe_ratio(v, total[:, None])
+        offsets = (np.arange(m) * r)[:, None] + frame.codes[None, :]
+        regime_total = np.bincount(offsets.ravel(), weights=v.ravel(), minlength=m * r).reshape(m, r)
+        rho_local = _safe_ratio(v, np.take_along_axis(regime_total, np.broadcast_to(frame.codes, (m, n)), axis=1))
+
+        kept = ~np.asarray(exclusion_mask(config, rho_global, rho_local), dtype=bool)
+        valid = (total > 0) & kept.any(axis=1)
+        discarded_value = np.where(kept, 0.0, v).sum(axis=1)
+        discarded[lo:lo + m] = np.where(valid, _safe_ratio(discarded_value, total), np.nan)
+        kept_count += kept[valid].sum(axis=0)
+        n_valid += int(valid.sum())
+    return BootstrapResult(kept_count=kept_count, discarded=discarded, n_valid=n_valid)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import hashlib
+
+import pandas as pd
+
+from .artifacts import RecordTable
+
+CacheKey = Tuple[str, str]  # (elements fingerprint, param_hash)
+
+
+def elements_fingerprint(elements: pd.DataFrame) -> str:
+    """
+    Content hash of an element table (column names + row values, index ignored).
+
+    Categorical columns hash by value, so a compact table and its plain twin share
+    a fingerprint; float32 and float64 values do not (they are different data).
+    """
+    h = hashlib.sha256()
+    h.update("\x1f".join(map(str, elements.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(elements, index=False).to_numpy().tobytes())
+    return h.hexdigest()[:32]
+
+
+def artifacts_nbytes(artifacts: Dict[str, Any]) -> int:
+    """Approximate in-memory size of a cycle's artifacts (deep, so strings count)."""
+    total = 0
+    for value in artifacts.values():
+        frame = value.frame if isinstance(value, RecordTable) else value
+        if isinstance(frame, pd.DataFrame):
+            total += int(frame.memory_usage(index=True, deep=True).sum())
+    return total
+
+
+class CycleCache:
+    """
+    In-process LRU cache of HUFCore.cycle artifacts.
+
+    Keys are (elements fingerprint, param_hash), the param_hash suffixed with the
+    backend name for numpy-engine cycles on a non-pandas backend; the run stamp is
+    not stored, so a hit gets a fresh stamp. Entries are evicted least-recently-used first once
+    either limit is exceeded:
+      - max_entries: number of cached cycles (None = unbounded)
+      - max_bytes:   total artifacts_nbytes of cached cycles (None = unbounded);
+                     a single result larger than max_bytes is not cached at all
+
+    backing (optional) is a slower second level with the same get/put protocol,
+    e.g. a huf_core.disk_cache.DiskCache: memory misses fall through to it (and
+    are promoted on a hit), and every put is written through.
+
+    Hits hand out shallow copies of the tables and of the error_budget dict, so
+    callers may update or replace those without touching the cached entry.
+    Thread-safe for lookups and inserts under the GIL (one OrderedDict operation
+    each); concurrent misses on the same key both compute, and the later insert wins.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 32,
+        max_bytes: Optional[int] = 512 * 2**20,
+        backing: Optional[Any] = None
+    ):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be >= 1 (or None)")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1 (or None)")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backing = backing
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Dict[str, Any], int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None and self.backing is not None:
+            stored = self.backing.get(key)
+            if stored is not None:
+                self._insert(key, stored)
+                self.hits += 1
+                return _detached(stored)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return _detached(entry[0])
+
+    def put(self, key: Hashable, artifacts: Dict[str, Any]) -> None:
+        stored = {k: v for k, v in artifacts.items() if k != "run_stamp"}
+        if self.backing is not None:
+            self.backing.put(key, stored)
+        self._insert(key, stored)
+
+    def _insert(self, key: Hashable, stored: Dict[str, Any]) -> None:
+        size = artifacts_nbytes(stored)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self.pop(key)
+        self._entries[key] = (_detached(stored), size)
+        self.nbytes += size
+        self._evict()
+
+    def pop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.nbytes -= size
+
+
+def _detached(artifacts: Dict[str, Any]) -> Dict[str, Any]:
+    # O(1) per artifact: shallow copies (pandas copy-on-write shares the column data)
+    out: Dict[str, Any] = {}
+    for key, value in artifacts.items():
+        if isinstance(value, RecordTable):
+            value = type(value)(value.frame.copy(deep=False))
+        elif isinstance(value, pd.DataFrame):
+            value = value.copy(deep=False)
+        elif isinstance(value, dict):
+            value = dict(value)
+        out[key] = value
+    return out
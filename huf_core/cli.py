@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
-import json
+import os
 
+from .backend import BACKENDS
+from .cache import CycleCache
+from .compression import COMPRESSIONS
+from .disk_cache import DiskCache, cached_elements
 from .core import HUFCore, HUFConfig
-from .io import write_artifacts
+from .io import ARTIFACT_FORMATS, TRACE_ENCODERS, write_artifacts
 from .adapters import (
     planck_lfi70_pixel_energy_elements,
     planck_error_metric_from_budget,
@@ -47,6 +51,88 @@ def _print_done(cmd: str, out_dir: Path, artifacts: dict, extra: dict | None = N
             print(f"       {k}: {v}")
 
 
+def _add_sweep_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--sweep-executor",
+        choices=["serial", "thread", "process"],
+        default="serial",
+        help="How the stability-packet taus are run (process shares the element arrays via shared memory).",
+    )
+    p.add_argument("--sweep-workers", type=int, default=None, help="Pool size for thread/process sweeps (default: all cores).")
+    p.add_argument(
+        "--validation",
+        choices=["strict", "fast", "off"],
+        default="fast",
+        help="Artifact checks per cycle: fast = one array check per column, strict = also every trace record.",
+    )
+    p.add_argument(
+        "--backend",
+        choices=list(BACKENDS),
+        default="pandas",
+        help="Array backend for cycles, sweeps and the traffic adapters (polars needs the optional polars package).",
+    )
+
+
+def _add_output_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--artifact-format",
+        choices=list(ARTIFACT_FORMATS),
+        default="csv",
+        help="Table artifacts as CSV/JSONL (default) or Parquet / Arrow IPC (needs pyarrow).",
+    )
+    p.add_argument(
+        "--compression",
+        choices=list(COMPRESSIONS),
+        default=None,
+        help="Compress the table artifacts (CSV/JSONL get a .gz / .zst suffix; zstd needs zstandard).",
+    )
+    p.add_argument("--compress-threads", type=int, default=0, help="Threads for CSV/JSONL compression (default: 1).")
+    p.add_argument(
+        "--trace-encoder",
+        choices=list(TRACE_ENCODERS),
+        default="json",
+        help="JSONL trace encoder: json (default, stdlib) or orjson (faster, compact; needs orjson).",
+    )
+    p.add_argument("--trace-workers", type=int, default=None, help="Threads formatting trace JSONL blocks (default: 1).")
+
+
+def _add_cache_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=os.environ.get("HUF_CACHE_DIR") or None,
+        help="Opt-in on-disk cache of element tables and cycle artifacts (default: $HUF_CACHE_DIR, else off).",
+    )
+    p.add_argument("--cache-max-mb", type=float, default=1024.0, help="Size cap of the cache directory (LRU eviction).")
+
+
+def _disk_cache(args: argparse.Namespace) -> DiskCache | None:
+    if args.cache_dir is None:
+        return None
+    return DiskCache(args.cache_dir, max_bytes=max(1, int(args.cache_max_mb * 2**20)))
+
+
+def _cache_cmd(args: argparse.Namespace) -> int:
+    if args.dir is None:
+        raise SystemExit("huf cache: pass --dir or set HUF_CACHE_DIR")
+    store = DiskCache(args.dir, max_bytes=None)
+    if args.action == "clear":
+        removed = store.clear()
+    elif args.action == "prune":
+        removed = store.prune(max_bytes=int(args.max_mb * 2**20))
+    else:
+        removed = None
+    entries = store.entries()
+    if args.action == "info":
+        for row in entries.itertuples(index=False):
+            print(f"{row.kind:<9} {row.key} {row.bytes / 2**20:9.2f} MB  {row.last_used_utc:%Y-%m-%d %H:%M:%S}")
+    msg = f"[cache] {store.root} | entries={len(entries)} size={entries['bytes'].sum() / 2**20:.2f} MB"
+    if removed is not None:
+        msg += f" removed={removed}"
+    print(msg)
+    return 0
+
+
 def main(argv=None) -> int:
     ap = argparse.ArgumentParser(prog="huf", description="HUF Core runner (contract + artifacts).")
     sub = ap.add_subparsers(dest="cmd", required=True)
@@ -56,11 +142,17 @@ def main(argv=None) -> int:
     p_planck.add_argument("--out", required=True, type=Path)
     p_planck.add_argument("--retained-target", type=float, default=0.97)
     p_planck.add_argument("--nside-out", type=int, default=64)
+    _add_sweep_args(p_planck)
+    _add_cache_args(p_planck)
+    _add_output_args(p_planck)
 
     p_tr = sub.add_parser("traffic", help="Run traffic phase-band compression demo.")
     p_tr.add_argument("--csv", required=True, type=Path)
     p_tr.add_argument("--out", required=True, type=Path)
     p_tr.add_argument("--tau-local", type=float, default=0.05)
+    _add_sweep_args(p_tr)
+    _add_cache_args(p_tr)
+    _add_output_args(p_tr)
 
     p_an = sub.add_parser("traffic-anomaly", help="Run traffic anomaly diagnostic adapter.")
     p_an.add_argument("--csv", required=True, type=Path)
@@ -73,15 +165,32 @@ def main(argv=None) -> int:
     )
     p_an.add_argument("--status", action="append", default=None, help="Repeatable. Example: --status \"Green Termination\"")
     p_an.add_argument("--include-call-text", action="store_true")
+    _add_sweep_args(p_an)
+    _add_cache_args(p_an)
+    _add_output_args(p_an)
 
     p_mk = sub.add_parser("markham", help="Run Markham 2018 fund×account expenditure HUF demo.")
     p_mk.add_argument("--xlsx", required=True, type=Path)
     p_mk.add_argument("--out", required=True, type=Path)
     p_mk.add_argument("--tau-global", type=float, default=0.005)
     p_mk.add_argument("--tau-local", type=float, default=0.02)
+    _add_sweep_args(p_mk)
+    _add_cache_args(p_mk)
+    _add_output_args(p_mk)
+
+    p_cache = sub.add_parser("cache", help="Inspect or prune the on-disk cache (--cache-dir of the run commands).")
+    p_cache.add_argument("action", choices=["info", "prune", "clear"], nargs="?", default="info")
+    p_cache.add_argument("--dir", type=Path, default=os.environ.get("HUF_CACHE_DIR") or None)
+    p_cache.add_argument("--max-mb", type=float, default=1024.0, help="prune: evict least recently used entries down to this size.")
 
     args = ap.parse_args(argv)
 
+    if args.cmd == "cache":
+        return _cache_cmd(args)
+
+    store = _disk_cache(args)
+    cycle_cache = CycleCache(backing=store)
+
     if args.cmd == "planck":
         if not args.fits.exists():
             raise FileNotFoundError(
@@ -91,31 +200,29 @@ def main(argv=None) -> int:
                 "Then re-run this command."
             )
 
-        elements, meta = planck_lfi70_pixel_energy_elements(args.fits, nside_out=args.nside_out)
+        elements, meta = cached_elements(
+            store, "planck_lfi70_pixel_energy_elements", args.fits,
+            lambda: planck_lfi70_pixel_energy_elements(args.fits, nside_out=args.nside_out),
+            nside_out=args.nside_out,
+        )
 
+        core = HUFCore(elements, dataset_id=meta["dataset_id"], copy=False, cache=cycle_cache, validation=args.validation, backend=args.backend)
         # Determine tau from retained-target (keep the smallest rho among the kept set)
-        tmp = elements.copy()
-        tmp["rho"] = tmp["value"] / tmp["value"].sum()
-        sorted_rho = tmp["rho"].sort_values(ascending=False).to_numpy()
-        cum = sorted_rho.cumsum()
-        import numpy as np
-
-        k = int(np.searchsorted(cum, args.retained_target) + 1)
-        tau = float(sorted_rho[min(k - 1, len(sorted_rho) - 1)])
-
-        core = HUFCore(elements, dataset_id=meta["dataset_id"])
+        tau = core.tau_for_retained_target(args.retained_target)
         cfg = HUFConfig(budget_type="energy", exclusion="global", tau=tau)
 
         artifacts = core.cycle(cfg)  # error metric derived exactly from discarded budget (Parseval-style accounting)
         discarded = artifacts["error_budget"]["discarded_budget_global"]
         artifacts["error_budget"].update(planck_error_metric_from_budget(meta, discarded))
-        write_artifacts(args.out, artifacts)
 
         # Stability packet sweep
         sweep = [tau * s for s in (0.8, 0.9, 1.0, 1.1, 1.2)]
-        sp = core.stability_packet(cfg, sweep)
-        sp.to_csv(args.out / "stability_packet.csv", index=False)
-        (args.out / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        sp = core.stability_packet(cfg, sweep, executor=args.sweep_executor, max_workers=args.sweep_workers)
+        write_artifacts(
+            args.out, artifacts, format=args.artifact_format, compression=args.compression, compress_threads=args.compress_threads,
+            trace_encoder=args.trace_encoder, trace_workers=args.trace_workers,
+            extras={"stability_packet.csv": sp, "meta.json": meta},
+        )
 
         _print_done(
             "planck",
@@ -126,8 +233,8 @@ def main(argv=None) -> int:
         return 0
 
     if args.cmd == "traffic":
-        elements, meta = traffic_phase_band_elements(args.csv)
-        core = HUFCore(elements, dataset_id=meta["dataset_id"])
+        elements, meta = cached_elements(store, "traffic_phase_band_elements", args.csv, lambda: traffic_phase_band_elements(args.csv, backend=args.backend))
+        core = HUFCore(elements, dataset_id=meta["dataset_id"], copy=False, cache=cycle_cache, validation=args.validation, backend=args.backend)
         cfg = HUFConfig(budget_type="mass", exclusion="local", tau=float(args.tau_local))
 
         # TV error metric between original and post-exclusion distribution
@@ -144,12 +251,14 @@ def main(argv=None) -> int:
             return {"metric": "total_variation_over_elements", "tv": tv}
 
         artifacts = core.cycle(cfg, error_metric=tv_metric)
-        write_artifacts(args.out, artifacts)
 
         sweep = [0.02, 0.03, 0.05, 0.07, 0.10]
-        sp = core.stability_packet(cfg, sweep)
-        sp.to_csv(args.out / "stability_packet.csv", index=False)
-        (args.out / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        sp = core.stability_packet(cfg, sweep, executor=args.sweep_executor, max_workers=args.sweep_workers)
+        write_artifacts(
+            args.out, artifacts, format=args.artifact_format, compression=args.compression, compress_threads=args.compress_threads,
+            trace_encoder=args.trace_encoder, trace_workers=args.trace_workers,
+            extras={"stability_packet.csv": sp, "meta.json": meta},
+        )
 
         _print_done("traffic", args.out, artifacts, extra={"dataset_id": meta.get("dataset_id"), "tau_local": float(args.tau_local)})
         return 0
@@ -158,23 +267,29 @@ def main(argv=None) -> int:
         statuses = args.status or ["Green Termination"]
         # de-dup while preserving order
         statuses = list(dict.fromkeys([str(s).strip() for s in statuses if str(s).strip()]))
-        elements, meta = traffic_anomaly_elements(args.csv, anomaly_status=statuses, include_call_text=args.include_call_text)
-        core = HUFCore(elements, dataset_id=meta["dataset_id"])
+        elements, meta = cached_elements(
+            store, "traffic_anomaly_elements", args.csv,
+            lambda: traffic_anomaly_elements(args.csv, anomaly_status=statuses, include_call_text=args.include_call_text, backend=args.backend),
+            anomaly_status=statuses, include_call_text=args.include_call_text,
+        )
+        core = HUFCore(elements, dataset_id=meta["dataset_id"], copy=False, cache=cycle_cache, validation=args.validation, backend=args.backend)
         cfg = HUFConfig(budget_type="mass", exclusion="global", tau=float(args.tau_global))
         artifacts = core.cycle(cfg)
-        write_artifacts(args.out, artifacts)
 
         sweep = [cfg.tau * s for s in (0.5, 0.75, 1.0, 1.25, 1.5)]
-        sp = core.stability_packet(cfg, sweep)
-        sp.to_csv(args.out / "stability_packet.csv", index=False)
-        (args.out / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        sp = core.stability_packet(cfg, sweep, executor=args.sweep_executor, max_workers=args.sweep_workers)
+        write_artifacts(
+            args.out, artifacts, format=args.artifact_format, compression=args.compression, compress_threads=args.compress_threads,
+            trace_encoder=args.trace_encoder, trace_workers=args.trace_workers,
+            extras={"stability_packet.csv": sp, "meta.json": meta},
+        )
 
         _print_done("traffic-anomaly", args.out, artifacts, extra={"dataset_id": meta.get("dataset_id"), "tau_global": float(args.tau_global), "status": statuses})
         return 0
 
     if args.cmd == "markham":
-        elements, meta = markham_2018_fund_expenditure_elements(args.xlsx)
-        core = HUFCore(elements, dataset_id=meta["dataset_id"])
+        elements, meta = cached_elements(store, "markham_2018_fund_expenditure_elements", args.xlsx, lambda: markham_2018_fund_expenditure_elements(args.xlsx))
+        core = HUFCore(elements, dataset_id=meta["dataset_id"], copy=False, cache=cycle_cache, validation=args.validation, backend=args.backend)
 
         # Two-threshold exclusion: keep if global>=tau_global OR local>=tau_local.
         cfg = HUFConfig(budget_type="mass", exclusion="dual", tau=float(args.tau_global), tau_local=float(args.tau_local))
@@ -195,13 +310,15 @@ def main(argv=None) -> int:
         artifacts = core.cycle(cfg, error_metric=tv_metric)
         artifacts["meta"] = meta
         artifacts["meta"].update({"tau_global": float(args.tau_global), "tau_local": float(args.tau_local)})
-        write_artifacts(args.out, artifacts)
 
         # Stability packet: sweep tau_global (tau_local fixed)
         sweep = [0.0025, 0.005, 0.0075, 0.01, 0.015]
-        sp = core.stability_packet(cfg, sweep)
-        sp.to_csv(args.out / "stability_packet.csv", index=False)
-        (args.out / "meta.json").write_text(json.dumps(artifacts["meta"], indent=2), encoding="utf-8")
+        sp = core.stability_packet(cfg, sweep, executor=args.sweep_executor, max_workers=args.sweep_workers)
+        write_artifacts(
+            args.out, artifacts, format=args.artifact_format, compression=args.compression, compress_threads=args.compress_threads,
+            trace_encoder=args.trace_encoder, trace_workers=args.trace_workers,
+            extras={"stability_packet.csv": sp, "meta.json": artifacts["meta"]},
+        )
 
         _print_done("markham", args.out, artifacts, extra={"dataset_id": meta.get("dataset_id"), "tau_global": float(args.tau_global), "tau_local": float(args.tau_local)})
         return 0
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any, List, Optional, Sequence, Set
+import gzip
+import io
+import json
+
+COMPRESSIONS = ("gzip", "zstd")
+CODEC_SUFFIX = {"gzip": ".gz", "zstd": ".zst"}
+_SUFFIX_CODEC = {v: k for k, v in CODEC_SUFFIX.items()}
+MANIFEST_NAME = "manifest.json"
+_BLOCK_BYTES = 4 << 20  # uncompressed bytes per gzip member
+
+
+def codec_for(path: Path) -> Optional[str]:
+    """Codec implied by the file extension (artifact.csv.gz -> "gzip"), None for plain files."""
+    return _SUFFIX_CODEC.get(Path(path).suffix)
+
+
+def compressed_name(name: str, compression: Optional[str]) -> str:
+    if compression is None:
+        return name
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"compression must be one of {COMPRESSIONS} or None")
+    return name + CODEC_SUFFIX[compression]
+
+
+def manifest_names(out_dir: Path) -> Optional[Set[str]]:
+    """File names listed in out_dir/manifest.json, or None without a (readable) manifest."""
+    try:
+        return set(json.loads((Path(out_dir) / MANIFEST_NAME).read_text(encoding="utf-8"))["artifacts"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def resolve_artifact(out_dir: Path, candidates: Sequence[str]) -> Optional[Path]:
+    """
+    The variant of one artifact (candidates: its possible file names) that belongs
+    to the run in out_dir. The manifest decides when present; without one, more
+    than one existing candidate is ambiguous (left over from an earlier run in a
+    different format) and raises ValueError rather than guessing.
+    """
+    out_dir = Path(out_dir)
+    listed = manifest_names(out_dir)
+    if listed is not None:
+        hits = [name for name in candidates if name in listed]
+    else:
+        hits = [name for name in candidates if (out_dir / name).exists()]
+    if len(hits) > 1:
+        raise ValueError(f"Several variants of one artifact in {out_dir}: {hits}")
+    if not hits or not (out_dir / hits[0]).exists():
+        return None
+    return out_dir / hits[0]
+
+
+def find_artifact(out_dir: Path, name: str) -> Optional[Path]:
+    """out_dir/name or its .gz / .zst variant, whichever the run wrote (see resolve_artifact)."""
+    return resolve_artifact(out_dir, [name + suffix for suffix in ("",) + tuple(CODEC_SUFFIX.values())])
+
+
+def _zstd() -> Any:
+    # optional dependency, imported only when a .zst artifact is opened
+    try:
+        import zstandard
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError("zstandard is required for .zst artifacts (pip install zstandard)") from e
+    return zstandard
+
+
+def open_text(path: Path, mode: str = "r", level: Optional[int] = None, threads: int = 0) -> IO[str]:
+    """
+    Open an artifact as a UTF-8 text stream, (de)compressing by extension.
+
+    Reads stream-decompress (nothing is inflated up front). Writes with
+    threads > 1 compress on that many threads: zstd natively, gzip as
+    independent members of _BLOCK_BYTES each (a standard multi-member gzip file,
+    read back by any gzip reader; mtime 0, so equal content gives equal bytes).
+    newline="" so CSV writers control line ends.
+    """
+    if mode not in ("r", "w"):
+        raise ValueError("mode must be 'r' or 'w'")
+    path = Path(path)
+    codec = codec_for(path)
+    if codec is None:
+        return path.open(mode, encoding="utf-8", newline="")
+    raw: IO[bytes]
+    if mode == "r":
+        if codec == "gzip":
+            raw = gzip.open(path, "rb")
+        else:
+            raw = _zstd().ZstdDecompressor().stream_reader(path.open("rb"), closefd=True)
+            raw = io.BufferedReader(raw)
+    elif codec == "gzip":
+        raw = _GzipBlockWriter(path.open("wb"), 6 if level is None else level, max(1, threads))
+    else:
+        cctx = _zstd().ZstdCompressor(level=3 if level is None else level, threads=threads if threads > 1 else 0)
+        raw = cctx.stream_writer(path.open("wb"), closefd=True)
+    return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+
+class _GzipBlockWriter(io.RawIOBase):
+    """Writable that gzips fixed-size blocks on a thread pool (zlib releases the GIL) and writes them in order."""
+
+    def __init__(self, fileobj: IO[bytes], level: int, threads: int):
+        self._file = fileobj
+        self._level = level
+        self._pool = ThreadPoolExecutor(max_workers=threads)
+        self._ahead = threads
+        self._buf = bytearray()
+        self._pending: List[Any] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        self._buf += b
+        while len(self._buf) >= _BLOCK_BYTES:
+            self._submit(bytes(self._buf[:_BLOCK_BYTES]))
+            del self._buf[:_BLOCK_BYTES]
+        return len(b)
+
+    def _submit(self, block: bytes) -> None:
+        self._pending.append(self._pool.submit(gzip.compress, block, self._level, mtime=0))
+        while len(self._pending) > self._ahead:
+            self._file.write(self._pending.pop(0).result())
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self._buf:
+                self._submit(bytes(self._buf))
+                self._buf.clear()
+            for fut in self._pending:
+                self._file.write(fut.result())
+            self._pending = []
+        finally:
+            self._pool.shutdown()
+            self._file.close()
+            super().close()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Dict, Iterable, List, Optional, Tuple, Any
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Any
 import json
 import math
 import hashlib
@@ -10,7 +10,23 @@ import numpy as np
 from pathlib import Path
 from datetime import datetime, timezone
 
-REQUIRED_TRACE_FIELDS = ("item_id", "regime_path", "rho_global_post", "inputs_ref", "method_ref", "discarded_budget_global")
+from . import engine as _engine
+from .backend import get_backend
+from .bootstrap import NoiseModel, bootstrap_frame
+from .cache import CycleCache, elements_fingerprint
+from .hierarchy import RegimeTree, hierarchy_coherence_map, level_frame
+from .schema import COMPACT_CATEGORICAL_COLUMNS, canonical_categorical, is_categorical, plain_values
+from .artifacts import ActiveSetTable, TraceTable, _as_str
+from .similarity import as_bitsets, jaccard_matrix, kendall_matrix, spearman_matrix, topk_rank_corr
+from .validation import REQUIRED_TRACE_FIELDS, VALIDATION_MODES, validate_artifacts
+from .sweep import ThresholdSweep, near_threshold_counts, nested_jaccard, retained_target_thresholds, threshold_frame
+
+# REQUIRED_TRACE_FIELDS lives in .validation; re-exported here for existing imports
+__all__ = [
+    "HUFConfig", "RunStamp", "HUFCore", "CycleBatch", "HUFRun", "REQUIRED_TRACE_FIELDS",
+    "config_param_hash", "make_run_stamp", "normalize_series", "jaccard", "spearman_rank_corr",
+]
+
 
 @dataclass(frozen=True)
 class HUFConfig:
@@ -33,9 +49,12 @@ class RunStamp:
 def _hash_text(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()[:16]
 
+def config_param_hash(config: HUFConfig) -> str:
+    return _hash_text(json.dumps(config.__dict__, sort_keys=True))
+
 def make_run_stamp(dataset_id: str, config: HUFConfig, code_fingerprint: str) -> RunStamp:
     created = datetime.now(timezone.utc).isoformat()
-    param_hash = _hash_text(json.dumps(config.__dict__, sort_keys=True))
+    param_hash = config_param_hash(config)
     run_id = _hash_text(dataset_id + "|" + param_hash + "|" + created)
     return RunStamp(
         dataset_id=dataset_id,
@@ -78,51 +97,170 @@ class HUFCore:
       - trace_path (json list[str]) OPTIONAL
       - inputs_ref (str) OPTIONAL
       - method_ref (str) OPTIONAL
+
+    copy=True (default) takes a private deep copy of the table. copy=False is the
+    read-only ingestion mode: the input is validated once and held as a shallow
+    copy sharing the caller's column arrays (pandas copy-on-write keeps either side
+    from seeing the other's later writes; on pandas < 3 the caller must not mutate
+    the table in place afterwards). Cycles never add columns to the held table:
+    the pandas engine derives its columns on a shallow working copy and the numpy
+    engine keeps them in the `columnar` side structure.
+
+    Memory targets per element (measured with tracemalloc on 2M rows, object ids,
+    float64 value, ~0.4% kept):
+      - ingestion: copy=True ~24 B (column pointers + value); copy=False ~1 B
+        (the transient validation mask)
+      - columnar frame (built on the first numpy cycle / sweep): 24 B retained
+        (regime codes, rho_global_pre, rho_local_pre; value is referenced when it
+        is already contiguous float64)
+      - cycle peak: pandas engine <= 140 B (copy=False ~115 B), numpy engine
+        <= 80 B (copy=False ~55 B), plus the kept rows' artifacts
+
+    The compact schema (huf_core.schema.compact_elements) is accepted natively:
+    categorical regime_id / inputs_ref / method_ref hold a 1-2 B code per row
+    instead of a pointer to a string object, and value may be float32. Artifacts
+    match the plain table; every reduction accumulates in float64.
+
+    cache (a CycleCache, may be shared between cores) memoizes cycle() results by
+    (content hash of the elements, param_hash); a repeated config returns the
+    cached artifacts with a fresh run stamp. The content hash is computed once
+    per core, on the first cached cycle. Cycles with an error_metric callback
+    are never cached.
+
+    validation picks how each cycle's artifacts are checked (see
+    huf_core.validation.validate_artifacts): "fast" (default) is one array check
+    per column; "strict" also checks every trace record; "off" skips the checks,
+    e.g. for large production sweeps.
+
+    backend picks the array primitives behind the columnar frame (numpy engine,
+    sweeps, packets, hierarchy cycles; see huf_core.backend): "pandas" (default,
+    reference), "numpy" or "polars" (optional dependency). With a non-pandas
+    backend, cycle() runs the columnar engine by default. Factorize order, kept
+    sets, rank order and regime totals (one compensated segment-sum kernel) are
+    the same on every backend, so the artifacts are identical; cached cycles are
+    still keyed by backend, as a custom backend object may round differently.
     """
 
-    def __init__(self, elements: pd.DataFrame, dataset_id: str, code_fingerprint: str = "huf_core_v1"):
+    def __init__(
+        self,
+        elements: pd.DataFrame,
+        dataset_id: str,
+        code_fingerprint: str = "huf_core_v1",
+        copy: bool = True,
+        cache: Optional[CycleCache] = None,
+        validation: str = "fast",
+        backend: str = "pandas"
+    ):
         required = {"element_id", "regime_id", "value"}
         missing = required - set(elements.columns)
         if missing:
             raise ValueError(f"elements missing columns: {sorted(missing)}")
         if (elements["value"] < 0).any():
             raise ValueError("value must be nonnegative")
-        self.elements = elements.copy()
+        if elements["regime_id"].isna().any():
+            # a null regime has no group: its mass would drop out of the coherence map
+            raise ValueError("regime_id must not be null")
+        if validation not in VALIDATION_MODES:
+            raise ValueError(f"validation must be one of {VALIDATION_MODES}")
+        self.elements = elements.copy(deep=copy)
+        for col in COMPACT_CATEGORICAL_COLUMNS:
+            if col in self.elements.columns and is_categorical(self.elements[col]):
+                self.elements[col] = canonical_categorical(self.elements[col])
         self.dataset_id = dataset_id
         self.code_fingerprint = code_fingerprint
+        self.cache = cache
+        self.validation = validation
+        self.backend = get_backend(backend)
+        self._columnar: Optional[_engine.ColumnarFrame] = None
+        self._regime_tree: Optional[RegimeTree] = None
+        self._fingerprint: Optional[str] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the held elements (cache key half; see huf_core.cache)."""
+        if self._fingerprint is None:
+            self._fingerprint = elements_fingerprint(self.elements)
+        return self._fingerprint
+
+    @property
+    def columnar(self) -> _engine.ColumnarFrame:
+        """Pre-exclusion frame as arrays (regime_id factorized once, reused across cycles)."""
+        if self._columnar is None:
+            self._columnar = _engine.ColumnarFrame.from_elements(self.elements, backend=self.backend)
+        return self._columnar
+
+    @property
+    def regime_tree(self) -> RegimeTree:
+        """Regime hierarchy from the trace paths (built once, reused across hierarchy cycles)."""
+        if self._regime_tree is None:
+            self._regime_tree = RegimeTree.from_elements(self.elements)
+        return self._regime_tree
 
     def cycle(
         self,
         config: HUFConfig,
-        error_metric: Optional[Callable[[pd.DataFrame], Dict[str, Any]]] = None
+        error_metric: Optional[Callable[[pd.DataFrame], Dict[str, Any]]] = None,
+        engine: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Runs: Normalize -> (Propagate placeholder) -> Aggregate placeholder -> Exclusion -> Renormalize
         NOTE: Propagate and Aggregate are extension points; in core they are identity.
         Returns the four required artifacts + stamp.
+        active_set and trace_report are record tables (huf_core.artifacts), not
+        lists: they iterate / index as record dicts, and `.frame` holds the
+        columns; use `.to_list()` (or json_default) where a real list is needed.
+
+        engine:
+          - "pandas": DataFrame reference implementation
+          - "numpy":  columnar engine (integer regime codes + contiguous float64 arrays)
+                      on the core's backend; emits the same artifacts bit-for-bit
+          - None:     "pandas" on the pandas backend, else "numpy" (default)
+        Both engines share cache entries (the artifacts are identical); a numpy-engine
+        cycle on a non-reference backend gets its own entries (see `backend`).
         """
-        df = self.elements.copy()
+        if engine is None:
+            engine = "pandas" if self.backend.name == "pandas" else "numpy"
+        if engine not in ("pandas", "numpy"):
+            raise ValueError("engine must be 'pandas' or 'numpy'")
+        if self.cache is None or error_metric is not None:
+            return self._cycle(config, error_metric, engine)
+        param = config_param_hash(config)
+        if engine == "numpy" and self.backend.name != "pandas":
+            param += "|" + self.backend.name
+        key = (self.fingerprint, param)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return self._finish(hit["coherence_map"], hit["active_set"], hit["trace_report"], hit["error_budget"], config)
+        artifacts = self._cycle(config, None, engine)
+        self.cache.put(key, artifacts)
+        return artifacts
+
+    def _cycle(
+        self,
+        config: HUFConfig,
+        error_metric: Optional[Callable[[pd.DataFrame], Dict[str, Any]]],
+        engine: str
+    ) -> Dict[str, Any]:
+        if engine == "numpy":
+            return self._cycle_numpy(config, error_metric)
+
+        # Shallow working copy: the derived columns below are new columns, so the
+        # held element arrays are shared rather than duplicated on every cycle.
+        df = self.elements.copy(deep=False)
+        if df["value"].dtype != np.float64:
+            df["value"] = df["value"].astype(np.float64)  # float32 (compact schema) accumulates in float64
 
         # Normalize globally (pre)
         df["rho_global_pre"] = normalize_series(df["value"])
 
         # Local unity (pre)
-        df["regime_total"] = df.groupby("regime_id")["value"].transform("sum")
+        df["regime_total"] = df.groupby("regime_id", observed=True)["value"].transform("sum")
         df["rho_local_pre"] = np.where(df["regime_total"] > 0, df["value"] / df["regime_total"], 0.0)
 
         # Propagate (core = identity). Aggregate (core = identity).
 
         # Exclusion
-        if config.exclusion == "global":
-            df["excluded"] = df["rho_global_pre"] < config.tau
-        elif config.exclusion == "local":
-            df["excluded"] = df["rho_local_pre"] < config.tau
-        elif config.exclusion == "dual":
-            if config.tau_local is None:
-                raise ValueError("dual exclusion requires tau_local")
-            df["excluded"] = (df["rho_global_pre"] < config.tau) & (df["rho_local_pre"] < float(config.tau_local))
-        else:
-            raise ValueError("exclusion must be 'global', 'local', or 'dual'")
+        df["excluded"] = _engine.exclusion_mask(config, df["rho_global_pre"], df["rho_local_pre"])
 
         discarded_value = float(df.loc[df["excluded"], "value"].sum())
         total_value = float(df["value"].sum())
@@ -135,15 +273,72 @@ class HUFCore:
         kept["rho_global_post"] = normalize_series(kept["value"])
 
         # Renormalize kept set locally if requested
-        kept["regime_kept_total"] = kept.groupby("regime_id")["value"].transform("sum")
+        kept["regime_kept_total"] = kept.groupby("regime_id", observed=True)["value"].transform("sum")
         kept["rho_local_post"] = np.where(kept["regime_kept_total"] > 0, kept["value"] / kept["regime_kept_total"], 0.0)
 
         # Build artifacts
         coherence_map = self._artifact_coherence_map(df, kept, discarded_budget_global, config)
-        active_set = self._artifact_active_set(kept, config)
-        trace_report = self._artifact_trace(kept, discarded_budget_global, config)
+        ranked = kept.sort_values("rho_global_post", ascending=False)  # one shared rank order
+        active_set = self._artifact_active_set(ranked, config)
+        trace_report = self._artifact_trace(ranked, discarded_budget_global, config)
         error_budget = self._artifact_error_budget(discarded_budget_global, config, error_metric, kept)
 
+        return self._finish(coherence_map, active_set, trace_report, error_budget, config)
+
+    def _cycle_numpy(
+        self,
+        config: HUFConfig,
+        error_metric: Optional[Callable[[pd.DataFrame], Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        frame = self.columnar
+        cyc = _engine.run_columnar_cycle(frame, config)
+        return self._columnar_artifacts(cyc, config, error_metric)
+
+    def cycle_hierarchy(
+        self,
+        config: HUFConfig,
+        level: int = -1,
+        error_metric: Optional[Callable[[pd.DataFrame], Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        One cycle over the regime hierarchy in the trace paths (see RegimeTree).
+
+        Local unity and local / dual exclusion use the nodes at `level` as regimes
+        (default -1: the deepest level; 0 is the root-most). The usual artifacts
+        are built at that level, and "coherence_hierarchy" adds the coherence map
+        of every level (rows tagged with level and parent_id), rolled up from the
+        deepest level through the parent pointers in one bottom-up pass.
+        """
+        tree = self.regime_tree
+        frame = level_frame(self.columnar, tree, level)
+        cyc = _engine.run_columnar_cycle(frame, config)
+        artifacts = self._columnar_artifacts(cyc, config, error_metric, frame)
+        artifacts["coherence_hierarchy"] = hierarchy_coherence_map(frame, tree, cyc)
+        return artifacts
+
+    def _columnar_artifacts(
+        self,
+        cyc: _engine.ColumnarCycle,
+        config: HUFConfig,
+        error_metric: Optional[Callable[[pd.DataFrame], Dict[str, Any]]],
+        frame: Optional[_engine.ColumnarFrame] = None
+    ) -> Dict[str, Any]:
+        frame = self.columnar if frame is None else frame
+        coherence_map = _engine.coherence_map(frame, cyc)
+        active_set = _engine.active_set_table(self.elements, frame, cyc, config)
+        trace_report = _engine.trace_table(self.elements, cyc)
+        kept = _engine.kept_frame(self.elements, frame, cyc) if error_metric is not None else None
+        error_budget = self._artifact_error_budget(cyc.discarded_budget_global, config, error_metric, kept)
+        return self._finish(coherence_map, active_set, trace_report, error_budget, config)
+
+    def _finish(
+        self,
+        coherence_map: pd.DataFrame,
+        active_set: ActiveSetTable,
+        trace_report: TraceTable,
+        error_budget: Dict[str, Any],
+        config: HUFConfig
+    ) -> Dict[str, Any]:
         stamp = make_run_stamp(self.dataset_id, config, self.code_fingerprint)
 
         artifacts = {
@@ -157,11 +352,32 @@ class HUFCore:
         self._validate_artifacts(artifacts)
         return artifacts
 
+    def cycle_many(
+        self,
+        configs: Iterable[HUFConfig],
+        error_metric: Optional[Callable[[pd.DataFrame], Dict[str, Any]]] = None,
+        lazy: bool = False
+    ) -> Sequence[Dict[str, Any]]:
+        """
+        Run many configs over the same elements.
+        The pre-frame and regime totals are computed once; every distinct
+        (exclusion, tau, tau_local) mask is evaluated as one row of a 2-D boolean
+        matrix, so each config only pays for renormalization + artifact building.
+        Artifacts match cycle(config, engine="numpy").
+
+        lazy=True returns a CycleBatch that builds each artifact dict on access.
+        """
+        batch = CycleBatch(self, list(configs), error_metric)
+        return batch if lazy else list(batch)
+
     def stability_packet(
         self,
         base_config: HUFConfig,
         tau_values: List[float],
-        topk_regimes: int = 25
+        topk_regimes: int = 25,
+        engine: str = "cycle",
+        executor: str = "serial",
+        max_workers: Optional[int] = None
     ) -> pd.DataFrame:
         """
         Minimum stability packet:
@@ -169,119 +385,276 @@ class HUFCore:
           - Active-set Jaccard vs baseline
           - Spearman rank correlation of top regime contributions vs baseline
           - Near-threshold band size (|rho - tau| <= 0.1*tau) on the relevant frame
+
+        engine:
+          - "cycle": one full cycle() per tau
+          - "sweep": sort the frame once, then prefix sums + searchsorted per tau
+                     (O(n log n + T log n)); same columns, no per-tau artifacts
+
+        executor ("cycle" engine only):
+          - "serial": one tau after another in this process
+          - "thread" / "process": taus fan out over a pool of max_workers
+            (default: all cores); the process pool reads the element arrays
+            from shared memory instead of pickling them per task
         """
         if len(tau_values) < 3:
             raise ValueError("Provide at least 3 tau values")
-        base = self.cycle(HUFConfig(**{**base_config.__dict__, "tau": tau_values[0]}))
-        base_active = [r["item_id"] for r in base["active_set"]]
-        base_reg = base["coherence_map"].set_index("regime_id")["rho_global_pre"].sort_values(ascending=False).head(topk_regimes)
+        if engine == "sweep":
+            return self._stability_packet_sweep(base_config, tau_values, topk_regimes)
+        if engine != "cycle":
+            raise ValueError("engine must be 'cycle' or 'sweep'")
+
+        configs = [HUFConfig(**{**base_config.__dict__, "tau": tau}) for tau in tau_values]
+        near_counts = near_threshold_counts(self._near_threshold_frame(base_config), tau_values)
+        # active-set item ids are str(element_id); factorize them once so each point's
+        # active set is a bitset over item codes
+        item_codes, items = pd.factorize(_as_str(self.elements["element_id"]))
+        if executor != "serial":
+            from .parallel import packet_rows
+
+            rows = packet_rows(self.columnar, item_codes, len(items), configs, executor=executor, max_workers=max_workers)
+        else:
+            items = pd.Index(items)
+            rows = []
+            for i, cfg in enumerate(configs):
+                try:
+                    art = self.cycle(cfg)
+                except ValueError:
+                    if i == 0:
+                        raise  # the baseline itself must be a valid run
+                    # Threshold too aggressive (removed all). Record as invalid point.
+                    rows.append(None)
+                    continue
+                present = np.zeros(len(items), dtype=bool)
+                present[items.get_indexer(art["active_set"].frame["item_id"])] = True
+                cm = art["coherence_map"].sort_values("regime_id")
+                rows.append({
+                    "active_count": len(art["active_set"]),
+                    "discarded_budget_global": art["error_budget"]["discarded_budget_global"],
+                    "active_bits": as_bitsets(present)[0],
+                    "regime_rho": cm["rho_global_pre"].to_numpy(dtype=np.float64),
+                })
+        if rows[0] is None:
+            raise ValueError("Exclusion removed all elements; invalid run")
+        return _packet_frame(tau_values, near_counts, rows, topk_regimes)
 
-        rows = []
-        for tau in tau_values:
-            cfg = HUFConfig(**{**base_config.__dict__, "tau": tau})
-            try:
-                art = self.cycle(cfg)
-                active = [r["item_id"] for r in art["active_set"]]
-                jac = jaccard(base_active, active)
-
-                reg = art["coherence_map"].set_index("regime_id")["rho_global_pre"].sort_values(ascending=False).head(topk_regimes)
-                # align
-                reg_aligned = reg.reindex(base_reg.index).fillna(0.0)
-                rho_corr = spearman_rank_corr(base_reg, reg_aligned)
-
-                discarded = art["error_budget"]["discarded_budget_global"]
-                active_count = len(active)
-                invalid = False
-            except ValueError:
-                # Threshold too aggressive (removed all). Record as invalid point.
-                active = []
-                jac = 0.0
-                rho_corr = 0.0
-                discarded = 1.0
-                active_count = 0
-                invalid = True
-
-            frame = "rho_global_pre" if cfg.exclusion in ("global","dual") else "rho_local_pre"
-            df = self.elements.copy()
-            df["rho_global_pre"] = normalize_series(df["value"])
-            df["regime_total"] = df.groupby("regime_id")["value"].transform("sum")
-            df["rho_local_pre"] = np.where(df["regime_total"] > 0, df["value"] / df["regime_total"], 0.0)
-            near = df[(df[frame] >= 0.9 * tau) & (df[frame] <= 1.1 * tau)].shape[0]
-
-            rows.append({
-                "tau": tau,
-                "active_count": active_count,
-                "discarded_budget_global": discarded,
-                "jaccard_vs_baseline": jac,
-                "spearman_regime_rho_vs_baseline": rho_corr,
-                "near_threshold_count": int(near),
-                "invalid": bool(invalid)
-            })
-        return pd.DataFrame(rows)
+    def sweep_similarity(self, base_config: HUFConfig, tau_values: List[float]) -> Dict[str, pd.DataFrame]:
+        """
+        All pairwise similarities between the sweep points, over the full sets.
+
+        Every tau's exclusion mask is one row of a 2-D matrix (exclusion_matrix);
+        each table (tau x tau) then comes from one kernel call in huf_core.similarity:
+          - "jaccard":  active sets, as bitsets over element codes
+          - "spearman" / "kendall": rank correlation (Kendall tau-b) of rho_global_post
+                        over all regimes (a regime with nothing kept counts as 0.0)
+        An invalid point (nothing kept) has NaN similarities.
+        """
+        frame = self.columnar
+        configs = [HUFConfig(**{**base_config.__dict__, "tau": tau}) for tau in tau_values]
+        kept = ~_engine.exclusion_matrix(frame, configs)
+        kept_total = kept @ frame.value
+        valid = kept_total > 0
+        regime_post = np.zeros((len(configs), frame.n_regimes))
+        for i in np.flatnonzero(valid):
+            regime_post[i] = frame.backend.segment_sum(frame.codes, np.where(kept[i], frame.value, 0.0), frame.n_regimes) / kept_total[i]
+
+        index = pd.Index(list(tau_values), name="tau")
+        out = {}
+        for name, mat in (
+            ("jaccard", jaccard_matrix(kept)),
+            ("spearman", spearman_matrix(regime_post)),
+            ("kendall", kendall_matrix(regime_post)),
+        ):
+            mat[~valid, :] = np.nan
+            mat[:, ~valid] = np.nan
+            out[name] = pd.DataFrame(mat, index=index, columns=index)
+        return out
+
+    def bootstrap_stability(
+        self,
+        config: HUFConfig,
+        n_samples: int = 200,
+        noise_model: NoiseModel = "poisson",
+        seed: Optional[int] = None,
+        scale: float = 0.1,
+        ci: float = 0.95,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Stability of the active set under noise in `value` (tau held fixed).
+
+        Draws n_samples resampled value vectors (see huf_core.bootstrap.draw_values:
+        "poisson" for counts, "jitter" for scores with lognormal sigma=scale, or a
+        callable) as (samples x n) matrices in chunks, and runs normalization +
+        exclusion on each chunk at once. seed defaults to config.seed.
+
+        Returns:
+          - "inclusion_probability": one row per element (element_id, regime_id,
+            value, rho_global_pre, baseline_active, inclusion_probability = share
+            of valid samples keeping it), most stable first
+          - "discarded_budget": baseline, mean, std and the central `ci` interval
+            of discarded_budget_global over valid samples, plus sample counts
+        """
+        if not 0 < ci < 1:
+            raise ValueError("ci must be in (0, 1)")
+        frame = self.columnar
+        seed = config.seed if seed is None else seed
+        res = bootstrap_frame(frame, config, n_samples, noise_model, seed, scale=scale, chunk_size=chunk_size)
+        baseline = ~np.asarray(_engine.exclusion_mask(config, frame.rho_global_pre, frame.rho_local_pre), dtype=bool)
+
+        inclusion = pd.DataFrame({
+            "element_id": _as_str(self.elements["element_id"]),
+            "regime_id": _as_str(self.elements["regime_id"]),
+            "value": frame.value,
+            "rho_global_pre": frame.rho_global_pre,
+            "baseline_active": baseline,
+            "inclusion_probability": res.kept_count / res.n_valid if res.n_valid else np.zeros(frame.value.size),
+        })
+        inclusion = inclusion.sort_values(["inclusion_probability", "rho_global_pre"], ascending=False, kind="stable")
+
+        disc = res.discarded[~np.isnan(res.discarded)]
+        lo, hi = np.quantile(disc, [(1 - ci) / 2, (1 + ci) / 2]) if disc.size else (np.nan, np.nan)
+        summary = {
+            "noise_model": noise_model if isinstance(noise_model, str) else getattr(noise_model, "__name__", "callable"),
+            "scale": float(scale),
+            "seed": int(seed),
+            "n_samples": int(n_samples),
+            "n_valid": res.n_valid,
+            "baseline": float(frame.value[~baseline].sum() / frame.total),
+            "mean": float(disc.mean()) if disc.size else float("nan"),
+            "std": float(disc.std(ddof=1)) if disc.size > 1 else float("nan"),
+            "ci_level": float(ci),
+            "ci_low": float(lo),
+            "ci_high": float(hi),
+        }
+        return {"inclusion_probability": inclusion.reset_index(drop=True), "discarded_budget": summary}
+
+    def stability_curve(self, config: HUFConfig) -> pd.DataFrame:
+        """
+        Exact stability curve over every tau breakpoint (one sorted pass, no cycle() calls).
+
+        The swept threshold is config.tau's frame: rho_global_pre for global and dual
+        (tau_local held fixed), rho_local_pre for local; config.tau itself is ignored.
+        Each row is constant for tau in (tau_from, tau_to]:
+          active_count, discarded_budget_global, invalid (cycle() would raise ValueError).
+        The largest safe tau is the tau_to of the last row with invalid == False.
+        """
+        sweep = ThresholdSweep(self.columnar, config.exclusion, config.tau_local)
+        return sweep.curve()
+
+    def tau_for_retained_target(
+        self,
+        target: Any,
+        frame: str = "global",
+        tau_local: Optional[float] = None
+    ) -> Any:
+        """
+        Threshold that retains at least `target` of the global mass.
+
+        frame picks the exclusion rule the tau is meant for ("global", "local" or
+        "dual"; dual needs tau_local, and its always-kept elements count towards
+        the target). The result is the smallest swept rho among the kept set, so
+        cycling with it keeps every element at or above it; at least one element
+        is always kept.
+
+        target may be a float (returns a float) or a sequence of targets (returns
+        an array in the same order). Uses median selection + bisection, not a
+        full sort.
+        """
+        scalar = np.ndim(target) == 0
+        targets = np.atleast_1d(np.asarray(target, dtype=np.float64))
+        if not np.all((targets > 0) & (targets <= 1)):
+            raise ValueError("retained target must be in (0, 1]")
+        cols = self.columnar
+        x, always = threshold_frame(cols, frame, tau_local)
+        cand = ~always
+        if not cand.any():
+            taus = np.zeros(targets.shape)  # nothing can be excluded
+        else:
+            need = targets - float(cols.rho_global_pre[always].sum())
+            taus = retained_target_thresholds(x[cand], cols.rho_global_pre[cand], need)
+        return float(taus[0]) if scalar else taus
+
+    def _near_threshold_frame(self, config: HUFConfig) -> np.ndarray:
+        # Sorted pre-exclusion frame the near-threshold band is measured on
+        frame = self.columnar
+        values = frame.rho_global_pre if config.exclusion in ("global", "dual") else frame.rho_local_pre
+        return np.sort(values)
+
+    def _stability_packet_sweep(self, base_config: HUFConfig, tau_values: List[float], topk_regimes: int) -> pd.DataFrame:
+        frame = self.columnar
+        stats = ThresholdSweep(frame, base_config.exclusion, base_config.tau_local).evaluate(tau_values)
+        if stats["invalid"][0]:
+            raise ValueError("Exclusion removed all elements; invalid run")
+
+        # Coherence-map rho_global_pre is a PRE-frame quantity, so every valid tau
+        # ranks the regimes exactly like the baseline.
+        base_reg = frame.backend.segment_sum(frame.codes, frame.rho_global_pre, frame.n_regimes)
+        rho_corr = topk_rank_corr(np.vstack([base_reg, base_reg]), topk_regimes)[1]
+
+        invalid = stats["invalid"]
+        return pd.DataFrame({
+            "tau": list(tau_values),
+            "active_count": np.where(invalid, 0, stats["active_count"]),
+            "discarded_budget_global": np.where(invalid, 1.0, stats["discarded_budget_global"]),
+            "jaccard_vs_baseline": np.where(invalid, 0.0, nested_jaccard(stats["active_count"][0], stats["active_count"])),
+            "spearman_regime_rho_vs_baseline": np.where(invalid, 0.0, rho_corr),
+            "near_threshold_count": stats["near_threshold_count"],
+            "invalid": invalid,
+        })
 
     def _artifact_coherence_map(self, df_all: pd.DataFrame, kept: pd.DataFrame, discarded_budget_global: float, config: HUFConfig) -> pd.DataFrame:
         # Global regime shares are computed on PRE frame for interpretability
-        reg_pre = df_all.groupby("regime_id")["rho_global_pre"].sum().rename("rho_global_pre")
+        # All four columns are plain segment sums (no per-regime Python); regimes with no
+        # kept / excluded rows drop out of their groupby and are filled with 0.0 below.
+        # groupby sums are compensated, so values can differ in the last ulp from the
+        # older per-regime Series.sum() output (pinned in tests/test_core_artifacts.py).
+        reg_pre = df_all.groupby("regime_id", observed=True)["rho_global_pre"].sum().rename("rho_global_pre")
         # Local unity checks (post)
-        reg_post = kept.groupby("regime_id").apply(lambda g: float(g["rho_local_post"].sum())).rename("local_unity_post")
-        reg_kept_share = kept.groupby("regime_id")["rho_global_post"].sum().rename("rho_global_post")
-        reg_discard = df_all.groupby("regime_id").apply(lambda g: float(g.loc[g["excluded"], "rho_global_pre"].sum())).rename("rho_discarded_pre")
-        out = pd.concat([reg_pre, reg_kept_share, reg_discard, reg_post], axis=1).fillna(0.0).reset_index()
+        reg_post = kept.groupby("regime_id", observed=True)["rho_local_post"].sum().rename("local_unity_post")
+        reg_kept_share = kept.groupby("regime_id", observed=True)["rho_global_post"].sum().rename("rho_global_post")
+        excluded = df_all.loc[df_all["excluded"]]
+        reg_discard = excluded.groupby("regime_id", observed=True)["rho_global_pre"].sum().rename("rho_discarded_pre")
+        out = pd.concat([reg_pre, reg_kept_share, reg_discard, reg_post], axis=1).reindex(reg_pre.index).fillna(0.0).reset_index()
+        out["regime_id"] = plain_values(out["regime_id"])
         out["local_unity_ok_post"] = (out["local_unity_post"].abs() - 1.0).abs() < 1e-9
         out["global_discarded_budget"] = discarded_budget_global
         return out.sort_values("rho_global_pre", ascending=False).reset_index(drop=True)
 
-    def _artifact_active_set(self, kept: pd.DataFrame, config: HUFConfig) -> List[Dict[str, Any]]:
-        out = kept.sort_values("rho_global_post", ascending=False).copy()
-        records = []
-        for rank, row in enumerate(out.itertuples(index=False), start=1):
-            records.append({
-                "rank": rank,
-                "item_id": str(row.element_id),
-                "regime_id": str(row.regime_id),
-                "rho_global_post": float(row.rho_global_post),
-                "rho_global_pre": float(row.rho_global_pre),
-                "rho_local_pre": float(row.rho_local_pre),
-                "rho_local_post": float(row.rho_local_post),
-                "value": float(row.value),
-                "tau": float(config.tau),
-                "exclusion": config.exclusion
-            })
-        return records
-
-    def _artifact_trace(self, kept: pd.DataFrame, discarded_budget_global: float, config: HUFConfig) -> List[Dict[str, Any]]:
+    def _artifact_active_set(self, ranked: pd.DataFrame, config: HUFConfig) -> ActiveSetTable:
+        return ActiveSetTable.from_columns(
+            item_id=ranked["element_id"],
+            regime_id=ranked["regime_id"],
+            rho_global_post=ranked["rho_global_post"],
+            rho_global_pre=ranked["rho_global_pre"],
+            rho_local_pre=ranked["rho_local_pre"],
+            rho_local_post=ranked["rho_local_post"],
+            value=ranked["value"],
+            tau=config.tau,
+            exclusion=config.exclusion,
+        )
+
+    def _artifact_trace(self, ranked: pd.DataFrame, discarded_budget_global: float, config: HUFConfig) -> TraceTable:
         # Minimal 6-field trace schema (+ optional extras)
-        out = kept.sort_values("rho_global_post", ascending=False).copy()
-        traces = []
-        for row in out.itertuples(index=False):
-            path = None
-            if hasattr(row, "trace_path") and isinstance(row.trace_path, str) and row.trace_path.strip():
-                try:
-                    path = json.loads(row.trace_path)
-                except Exception:
-                    path = [str(row.regime_id), str(row.element_id)]
-            else:
-                path = [str(row.regime_id), str(row.element_id)]
-
-            inputs_ref = getattr(row, "inputs_ref", "") if hasattr(row, "inputs_ref") else ""
-            method_ref = getattr(row, "method_ref", "") if hasattr(row, "method_ref") else ""
-
-            traces.append({
-                "item_id": str(row.element_id),
-                "regime_path": path,
-                "rho_global_post": float(row.rho_global_post),
-                "inputs_ref": str(inputs_ref),
-                "method_ref": str(method_ref),
-                "discarded_budget_global": float(discarded_budget_global)
-            })
-        return traces
+        def col(name: str) -> Optional[pd.Series]:
+            return ranked[name] if name in ranked.columns else None
+
+        return TraceTable.from_columns(
+            item_id=ranked["element_id"],
+            regime_id=ranked["regime_id"],
+            trace_path=col("trace_path"),
+            rho_global_post=ranked["rho_global_post"],
+            inputs_ref=col("inputs_ref"),
+            method_ref=col("method_ref"),
+            discarded_budget_global=discarded_budget_global,
+        )
 
     def _artifact_error_budget(
         self,
         discarded_budget_global: float,
         config: HUFConfig,
         error_metric: Optional[Callable[[pd.DataFrame], Dict[str, Any]]],
-        kept: pd.DataFrame
+        kept: Optional[pd.DataFrame]
     ) -> Dict[str, Any]:
         out: Dict[str, Any] = {
             "budget_type": config.budget_type,
@@ -296,14 +669,66 @@ class HUFCore:
         return out
 
     def _validate_artifacts(self, artifacts: Dict[str, Any]) -> None:
-        for key in ("coherence_map", "active_set", "trace_report", "error_budget", "run_stamp"):
-            if key not in artifacts:
-                raise ValueError(f"Missing required artifact: {key}")
-        # trace schema
-        for rec in artifacts["trace_report"]:
-            for f in REQUIRED_TRACE_FIELDS:
-                if f not in rec:
-                    raise ValueError(f"Trace record missing field: {f}")
+        validate_artifacts(artifacts, self.validation)
+
+
+def _packet_frame(
+    tau_values: List[float],
+    near_counts: np.ndarray,
+    rows: List[Optional[Dict[str, Any]]],
+    topk_regimes: int
+) -> pd.DataFrame:
+    # Stability-packet table from per-point results (None = invalid point); all
+    # similarities against the baseline (row 0) come from one kernel call each.
+    valid = np.array([r is not None for r in rows])
+    base = rows[0]
+    bits = np.vstack([(r or base)["active_bits"] for r in rows])
+    regs = np.vstack([(r or base)["regime_rho"] for r in rows])
+    return pd.DataFrame({
+        "tau": list(tau_values),
+        "active_count": [r["active_count"] if r else 0 for r in rows],
+        "discarded_budget_global": [r["discarded_budget_global"] if r else 1.0 for r in rows],
+        "jaccard_vs_baseline": np.where(valid, jaccard_matrix(bits)[0], 0.0),
+        "spearman_regime_rho_vs_baseline": np.where(valid, topk_rank_corr(regs, topk_regimes), 0.0),
+        "near_threshold_count": np.asarray(near_counts, dtype=np.int64),
+        "invalid": ~valid,
+    })
+
+
+class CycleBatch(Sequence):
+    """Lazy view over HUFCore.cycle_many results (artifacts built per index on access)."""
+
+    def __init__(
+        self,
+        core: HUFCore,
+        configs: List[HUFConfig],
+        error_metric: Optional[Callable[[pd.DataFrame], Dict[str, Any]]] = None
+    ):
+        self.core = core
+        self.configs = configs
+        self.error_metric = error_metric
+        keys = [(c.exclusion, c.tau, c.tau_local if c.exclusion == "dual" else None) for c in configs]
+        self._mask_row: Dict[Tuple[Any, ...], int] = {}
+        unique: List[HUFConfig] = []
+        for key, cfg in zip(keys, configs):
+            if key not in self._mask_row:
+                self._mask_row[key] = len(unique)
+                unique.append(cfg)
+        self._keys = keys
+        self.masks = _engine.exclusion_matrix(core.columnar, unique)
+        self._cycles: Dict[int, _engine.ColumnarCycle] = {}
+
+    def __len__(self) -> int:
+        return len(self.configs)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        config = self.configs[i]
+        row = self._mask_row[self._keys[i]]
+        if row not in self._cycles:
+            self._cycles[row] = _engine.run_columnar_cycle(self.core.columnar, config, excluded=self.masks[row])
+        return self.core._columnar_artifacts(self._cycles[row], config, self.error_metric)
 
 
 class HUFRun:
@@ -347,8 +772,8 @@ class HUFRun:
         art["meta"] = self.meta
         return art
 
-    def write_artifacts(self, out_dir: Path, artifacts: Dict[str, Any]) -> None:
+    def write_artifacts(self, out_dir: Path, artifacts: Dict[str, Any], format: str = "csv") -> None:
         from .io import write_artifacts
         out_dir = Path(out_dir)
         out_dir.mkdir(parents=True, exist_ok=True)
-        write_artifacts(out_dir, artifacts)
+        write_artifacts(out_dir, artifacts, format=format)
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+import functools
+import hashlib
+import importlib.metadata
+import json
+import os
+import pickle
+import tempfile
+import time
+
+import pandas as pd
+
+from .adapters import _file_fingerprint
+
+# Bump when the pickled layout (or anything an adapter emits) changes incompatibly
+STORE_FORMAT = "huf_disk_cache_v1"
+KINDS = ("elements", "cycles")
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    """
+    huf_core package version + digest of the package sources, part of every disk
+    cache key: entries written by other code (an upgrade, or an edited editable
+    install that keeps its version) are never returned.
+    """
+    try:
+        version = importlib.metadata.version("huf-core")
+    except importlib.metadata.PackageNotFoundError:
+        version = "0+unknown"
+    h = hashlib.sha256()
+    for src in sorted(Path(__file__).parent.glob("*.py")):
+        h.update(src.name.encode("utf-8"))
+        h.update(src.read_bytes())
+    return f"{version}+{h.hexdigest()[:12]}"
+
+
+def elements_key(adapter: str, path: Path, params: Dict[str, Any], code_fingerprint: str = "huf_core_v1") -> str:
+    """
+    Cache key for an adapter's element table: input file fingerprint (name, size,
+    mtime; the same string the adapter records as inputs_ref) + adapter name and
+    the parameters that determine its method_ref, under the store format, code
+    version and code_fingerprint. Needs only a stat() of the input.
+    """
+    payload = json.dumps(
+        [STORE_FORMAT, code_version(), code_fingerprint, adapter, _file_fingerprint(Path(path)), params],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class DiskCache:
+    """
+    Opt-in, content-addressed cache directory shared across processes / CLI runs.
+
+    Layout: <root>/elements/<key>.pkl holds (elements, meta) from an adapter;
+    <root>/cycles/<key>.pkl holds cycle artifacts (no run stamp) keyed like
+    CycleCache, i.e. (elements fingerprint, param_hash). Every key also carries
+    code_version() and code_fingerprint, so a cache directory outlives upgrades
+    without serving artifacts of older code (stale entries age out via LRU).
+
+    A file's mtime is its last use; once the directory exceeds max_bytes the least
+    recently used files are deleted. The directory is not rescanned on every
+    store: prune runs on the first store of a process, every prune_every stores,
+    and as soon as the bytes this process added could cross max_bytes. Writes go
+    through a temp file + os.replace, so concurrent runs never see a partial entry.
+
+    Entries are pickles: only point this at a directory you trust.
+    get/put follow the CycleCache protocol, so a DiskCache can back one
+    (CycleCache(backing=DiskCache(...))).
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: Optional[int] = 2**30,
+        code_fingerprint: str = "huf_core_v1",
+        prune_every: int = 32
+    ):
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1 (or None)")
+        if prune_every < 1:
+            raise ValueError("prune_every must be >= 1")
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.code_fingerprint = code_fingerprint
+        self.prune_every = prune_every
+        self._scanned_bytes: Optional[int] = None  # directory total at the last prune
+        self._stores = 0  # stores / bytes added since then
+        self._added = 0
+        for kind in KINDS:
+            (self.root / kind).mkdir(parents=True, exist_ok=True)
+
+    # -- element tables -------------------------------------------------------
+
+    def load_elements(self, key: str) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        return self._load("elements", key)
+
+    def store_elements(self, key: str, elements: pd.DataFrame, meta: Dict[str, Any]) -> None:
+        self._store("elements", key, (elements, meta))
+
+    # -- cycle artifacts (CycleCache protocol) --------------------------------
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        return self._load("cycles", self._cycle_digest(key))
+
+    def put(self, key: Hashable, artifacts: Dict[str, Any]) -> None:
+        self._store("cycles", self._cycle_digest(key), {k: v for k, v in artifacts.items() if k != "run_stamp"})
+
+    # -- inspection / maintenance --------------------------------------------
+
+    def entries(self) -> pd.DataFrame:
+        """One row per entry (kind, key, bytes, last_used_utc), most recently used first."""
+        rows = [
+            {"kind": kind, "key": path.stem, "bytes": st.st_size,
+             "last_used_utc": pd.Timestamp(st.st_mtime, unit="s", tz="UTC")}
+            for kind, path, st in self._files()
+        ]
+        out = pd.DataFrame(rows, columns=["kind", "key", "bytes", "last_used_utc"])
+        return out.sort_values("last_used_utc", ascending=False, kind="stable").reset_index(drop=True)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(st.st_size for _, _, st in self._files())
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """Delete least recently used entries until the total is <= max_bytes (default: self.max_bytes)."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        if limit is None:
+            return 0
+        files = sorted(self._files(), key=lambda f: f[2].st_mtime)
+        total = sum(st.st_size for _, _, st in files)
+        removed = 0
+        for _, path, st in files:
+            if total <= limit:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:  # pruned concurrently
+                pass
+            total -= st.st_size
+            removed += 1
+        self._scanned_bytes, self._stores, self._added = total, 0, 0
+        return removed
+
+    def clear(self) -> int:
+        return self.prune(max_bytes=0)
+
+    # -- internals ------------------------------------------------------------
+
+    def _cycle_digest(self, key: Hashable) -> str:
+        payload = json.dumps(
+            [STORE_FORMAT, code_version(), self.code_fingerprint, list(key) if isinstance(key, tuple) else key],
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, kind: str, key: str) -> Path:
+        return self.root / kind / f"{key}.pkl"
+
+    def _files(self) -> Iterator[Tuple[str, Path, os.stat_result]]:
+        for kind in KINDS:
+            for path in (self.root / kind).glob("*.pkl"):
+                try:
+                    yield kind, path, path.stat()
+                except FileNotFoundError:
+                    continue
+
+    def _load(self, kind: str, key: str) -> Any:
+        path = self._path(kind, key)
+        try:
+            with path.open("rb") as f:
+                obj = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # unreadable / truncated / written by an incompatible version: treat as a miss
+            path.unlink(missing_ok=True)
+            return None
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except FileNotFoundError:
+            pass
+        return obj
+
+    def _store(self, kind: str, key: str, obj: Any) -> None:
+        path = self._path(kind, key)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._stores += 1
+        self._added += size
+        if self.max_bytes is None:
+            return
+        if (
+            self._scanned_bytes is None
+            or self._stores >= self.prune_every
+            or self._scanned_bytes + self._added > self.max_bytes
+        ):
+            self.prune()
+
+
+def cached_elements(
+    cache: Optional[DiskCache],
+    adapter: str,
+    path: Path,
+    build: Callable[[], Tuple[pd.DataFrame, Dict[str, Any]]],
+    **params: Any
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    (elements, meta) for adapter(path, **params): from the cache when the input
+    file is unchanged (no parsing at all), otherwise build() and store.
+    """
+    if cache is None:
+        return build()
+    key = elements_key(adapter, path, params, cache.code_fingerprint)
+    hit = cache.load_elements(key)
+    if hit is not None:
+        return hit
+    elements, meta = build()
+    cache.store_elements(key, elements, meta)
+    return elements, meta
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import ActiveSetTable, TraceTable
+from .backend import PandasBackend, get_backend
+from .schema import is_categorical, take_values
+
+
+@dataclass(frozen=True)
+class ColumnarFrame:
+    """
+    Pre-exclusion frame held as contiguous arrays.
+    regime_id is factorized once into integer codes (sorted regime order), so every
+    later reduction is a segment sum over codes instead of a string groupby. A
+    compact (categorical) regime_id already carries those codes and is used as is.
+    `backend` supplies the array primitives (see huf_core.backend) for every cycle
+    run on the frame.
+    """
+    codes: np.ndarray            # intp regime code per element
+    regimes: pd.Index            # sorted unique regime ids (code -> regime_id)
+    value: np.ndarray            # float64 element values
+    total: float                 # global value total
+    regime_total: np.ndarray     # value total per regime (indexed by code)
+    rho_global_pre: np.ndarray
+    rho_local_pre: np.ndarray
+    backend: PandasBackend = field(default=get_backend("pandas"), compare=False)
+
+    @property
+    def n_regimes(self) -> int:
+        return len(self.regimes)
+
+    @classmethod
+    def from_elements(cls, elements: pd.DataFrame, backend: Any = "pandas") -> "ColumnarFrame":
+        backend = get_backend(backend)
+        regime_col = elements["regime_id"]
+        if is_categorical(regime_col):
+            # canonical categorical (HUFCore): sorted, all observed -> same codes as factorize
+            codes = regime_col.cat.codes.to_numpy().astype(np.intp)
+            regimes = regime_col.cat.categories
+        else:
+            codes, regimes = backend.factorize(regime_col.to_numpy())
+        if codes.size and codes.min() < 0:
+            # code -1 (missing) would index the last regime's total
+            raise ValueError("regime_id must not be null")
+        regimes = pd.Index(regimes, name="regime_id")
+        value = np.ascontiguousarray(elements["value"].to_numpy(dtype=np.float64))
+        total = float(value.sum())
+        if total <= 0:
+            raise ValueError("Cannot normalize: sum <= 0")
+        regime_total = backend.segment_sum(codes, value, len(regimes))
+        return cls(
+            codes=codes,
+            regimes=regimes,
+            value=value,
+            total=total,
+            regime_total=regime_total,
+            rho_global_pre=value / total,
+            rho_local_pre=_safe_ratio(value, regime_total[codes]),
+            backend=backend,
+        )
+
+
+@dataclass(frozen=True)
+class ColumnarCycle:
+    """Result of exclusion + renormalization on a ColumnarFrame (kept rows in input order)."""
+    excluded: np.ndarray          # bool mask over all elements
+    kept_index: np.ndarray        # positions of kept elements
+    rho_global_post: np.ndarray   # over kept elements
+    regime_kept_total: np.ndarray # per kept element
+    rho_local_post: np.ndarray    # over kept elements
+    discarded_budget_global: float
+    order: np.ndarray             # rank order of kept elements (descending rho_global_post)
+
+
+_REFERENCE = get_backend("pandas")
+
+
+def segment_sum(codes: np.ndarray, weights: np.ndarray, n_segments: int) -> np.ndarray:
+    """
+    Sum weights per integer segment code (reference pandas backend).
+
+    Uses pandas' compensated group-sum on the pre-factorized codes (no rehashing), so
+    totals match `groupby(...).sum()` / `transform("sum")` bit-for-bit. np.bincount is
+    faster still but sums sequentially and drifts in the last ulp on non-integer data.
+    """
+    return _REFERENCE.segment_sum(codes, weights, n_segments)
+
+
+def _safe_ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    out = np.zeros(num.shape, dtype=np.float64)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def descending_order(x: np.ndarray) -> np.ndarray:
+    """Argsort descending, with the same tie order as `DataFrame.sort_values(ascending=False)`."""
+    return _REFERENCE.sort_desc(x)
+
+
+def exclusion_mask(config: Any, rho_global: Any, rho_local: Any) -> Any:
+    """Exclusion predicate shared by every engine (works on Series or ndarrays)."""
+    if config.exclusion == "global":
+        return rho_global < config.tau
+    if config.exclusion == "local":
+        return rho_local < config.tau
+    if config.exclusion == "dual":
+        if config.tau_local is None:
+            raise ValueError("dual exclusion requires tau_local")
+        return (rho_global < config.tau) & (rho_local < float(config.tau_local))
+    raise ValueError("exclusion must be 'global', 'local', or 'dual'")
+
+
+def exclusion_matrix(frame: ColumnarFrame, configs: Sequence[Any]) -> np.ndarray:
+    """Exclusion masks for many configs as one (n_configs x n_elements) boolean matrix."""
+    for config in configs:
+        if config.exclusion not in ("global", "local", "dual"):
+            raise ValueError("exclusion must be 'global', 'local', or 'dual'")
+        if config.exclusion == "dual" and config.tau_local is None:
+            raise ValueError("dual exclusion requires tau_local")
+    kind = np.array([config.exclusion for config in configs], dtype=object)
+    tau = np.array([float(config.tau) for config in configs], dtype=np.float64)[:, None]
+    out = np.empty((len(configs), frame.value.size), dtype=bool)
+
+    rows = kind == "global"
+    if rows.any():
+        out[rows] = frame.rho_global_pre[None, :] < tau[rows]
+    rows = kind == "local"
+    if rows.any():
+        out[rows] = frame.rho_local_pre[None, :] < tau[rows]
+    rows = kind == "dual"
+    if rows.any():
+        tau_local = np.array([float(c.tau_local) for c in configs if c.exclusion == "dual"], dtype=np.float64)[:, None]
+        out[rows] = (frame.rho_global_pre[None, :] < tau[rows]) & (frame.rho_local_pre[None, :] < tau_local)
+    return out
+
+
+def run_columnar_cycle(frame: ColumnarFrame, config: Any, excluded: Optional[np.ndarray] = None) -> ColumnarCycle:
+    """
+    Exclusion -> Renormalize on arrays. Raises ValueError when nothing is kept.
+    A precomputed exclusion mask (e.g. a row of exclusion_matrix) skips the predicate.
+    """
+    if excluded is None:
+        excluded = np.asarray(exclusion_mask(config, frame.rho_global_pre, frame.rho_local_pre), dtype=bool)
+
+    discarded_value = float(frame.value[excluded].sum())
+    discarded_budget_global = (discarded_value / frame.total) if frame.total > 0 else 0.0
+
+    be = frame.backend
+    kept_index = be.filter(~excluded)
+    if kept_index.size == 0:
+        raise ValueError("Exclusion removed all elements; invalid run")
+    kept_value = frame.value[kept_index]
+    kept_total = float(kept_value.sum())
+    if kept_total <= 0:
+        raise ValueError("Cannot normalize: sum <= 0")
+    rho_global_post = kept_value / kept_total
+
+    kept_codes = frame.codes[kept_index]
+    regime_kept_total = be.segment_sum(kept_codes, kept_value, frame.n_regimes)[kept_codes]
+    rho_local_post = _safe_ratio(kept_value, regime_kept_total)
+
+    return ColumnarCycle(
+        excluded=excluded,
+        kept_index=kept_index,
+        rho_global_post=rho_global_post,
+        regime_kept_total=regime_kept_total,
+        rho_local_post=rho_local_post,
+        discarded_budget_global=discarded_budget_global,
+        order=be.sort_desc(rho_global_post),
+    )
+
+
+def coherence_map(frame: ColumnarFrame, cyc: ColumnarCycle) -> pd.DataFrame:
+    """Artifact 1 from segment sums over regime codes."""
+    n = frame.n_regimes
+    segment_sum = frame.backend.segment_sum
+    kept_codes = frame.codes[cyc.kept_index]
+    excl_codes = frame.codes[cyc.excluded]
+    out = pd.DataFrame({
+        "regime_id": frame.regimes,
+        "rho_global_pre": segment_sum(frame.codes, frame.rho_global_pre, n),
+        "rho_global_post": segment_sum(kept_codes, cyc.rho_global_post, n),
+        "rho_discarded_pre": segment_sum(excl_codes, frame.rho_global_pre[cyc.excluded], n),
+        "local_unity_post": segment_sum(kept_codes, cyc.rho_local_post, n),
+    })
+    out["local_unity_ok_post"] = (out["local_unity_post"].abs() - 1.0).abs() < 1e-9
+    out["global_discarded_budget"] = cyc.discarded_budget_global
+    return out.sort_values("rho_global_pre", ascending=False).reset_index(drop=True)
+
+
+def kept_frame(elements: pd.DataFrame, frame: ColumnarFrame, cyc: ColumnarCycle) -> pd.DataFrame:
+    """Materialize the kept DataFrame (same columns as the pandas engine) for error-metric callbacks."""
+    kept = elements.iloc[cyc.kept_index].copy()
+    kept["value"] = frame.value[cyc.kept_index]  # float64 even for a float32 (compact) input
+    kept["rho_global_pre"] = frame.rho_global_pre[cyc.kept_index]
+    kept["regime_total"] = frame.regime_total[frame.codes[cyc.kept_index]]
+    kept["rho_local_pre"] = frame.rho_local_pre[cyc.kept_index]
+    kept["excluded"] = False
+    kept["rho_global_post"] = cyc.rho_global_post
+    kept["regime_kept_total"] = cyc.regime_kept_total
+    kept["rho_local_post"] = cyc.rho_local_post
+    return kept
+
+
+def _ranked_column(elements: pd.DataFrame, name: str, rows: np.ndarray) -> Optional[np.ndarray]:
+    if name not in elements.columns:
+        return None
+    return take_values(elements[name], rows)
+
+
+def active_set_table(elements: pd.DataFrame, frame: ColumnarFrame, cyc: ColumnarCycle, config: Any) -> ActiveSetTable:
+    rows = cyc.kept_index[cyc.order]
+    return ActiveSetTable.from_columns(
+        item_id=_ranked_column(elements, "element_id", rows),
+        regime_id=_ranked_column(elements, "regime_id", rows),
+        rho_global_post=cyc.rho_global_post[cyc.order],
+        rho_global_pre=frame.rho_global_pre[rows],
+        rho_local_pre=frame.rho_local_pre[rows],
+        rho_local_post=cyc.rho_local_post[cyc.order],
+        value=frame.value[rows],
+        tau=config.tau,
+        exclusion=config.exclusion,
+    )
+
+
+def trace_table(elements: pd.DataFrame, cyc: ColumnarCycle) -> TraceTable:
+    rows = cyc.kept_index[cyc.order]
+    return TraceTable.from_columns(
+        item_id=_ranked_column(elements, "element_id", rows),
+        regime_id=_ranked_column(elements, "regime_id", rows),
+        trace_path=_ranked_column(elements, "trace_path", rows),
+        rho_global_post=cyc.rho_global_post[cyc.order],
+        inputs_ref=_ranked_column(elements, "inputs_ref", rows),
+        method_ref=_ranked_column(elements, "method_ref", rows),
+        discarded_budget_global=cyc.discarded_budget_global,
+    )
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import trace_path_list
+from .engine import ColumnarCycle, ColumnarFrame, _safe_ratio, segment_sum
+
+
+def _node_label(parts: tuple) -> str:
+    # a one-component prefix is the component itself (the flat regime_id); longer
+    # prefixes escape "\" and "/" inside components, so distinct paths never share a label
+    if len(parts) == 1:
+        return parts[0]
+    return "/".join(p.replace("\\", "\\\\").replace("/", "\\/") for p in parts)
+
+
+@dataclass(frozen=True)
+class RegimeTree:
+    """
+    Regime hierarchy from each element's regime_path, as parent-pointer arrays.
+
+    An element's regime nodes are the prefixes of its trace_path minus the last
+    component (the element itself); a missing / unparsable path falls back to
+    [regime_id, element_id], i.e. one level = regime_id. A trace_path that parses
+    to anything but a JSON list is rejected (ValueError). Nodes are keyed by the
+    tuple of path components. Level 0 is the root-most level. A path shorter than
+    the tree stays at its deepest node on lower levels.
+
+      labels[k]:  node ids at level k, sorted by path: the component itself at
+                  level 0, else the "/"-joined prefix with "\\" and "/" inside
+                  components escaped by a backslash
+      parent[k]:  node code at level k-1 for each node at level k (parent[0] is empty)
+      leaf_codes: node code at the deepest level for each element
+    """
+    labels: List[pd.Index]
+    parent: List[np.ndarray]
+    leaf_codes: np.ndarray
+
+    @property
+    def depth(self) -> int:
+        return len(self.labels)
+
+    def level_index(self, level: int) -> int:
+        k = level + self.depth if level < 0 else level
+        if not 0 <= k < self.depth:
+            raise ValueError(f"level must be in [{-self.depth}, {self.depth - 1}]")
+        return k
+
+    def element_codes(self, level: int) -> np.ndarray:
+        """Node code at `level` for every element (parent pointers composed upwards)."""
+        k = self.level_index(level)
+        codes = self.leaf_codes
+        for j in range(self.depth - 1, k, -1):
+            codes = self.parent[j][codes]
+        return codes
+
+    def rollup(self, leaf_sums: np.ndarray) -> List[np.ndarray]:
+        """Per-node sums at every level from deepest-level sums (one bottom-up pass)."""
+        sums = [leaf_sums]
+        for k in range(self.depth - 1, 0, -1):
+            sums.append(segment_sum(self.parent[k], sums[-1], len(self.labels[k - 1])))
+        return sums[::-1]
+
+    @classmethod
+    def from_elements(cls, elements: pd.DataFrame) -> "RegimeTree":
+        raw = elements["trace_path"].tolist() if "trace_path" in elements.columns else [None] * len(elements)
+        regimes: List[tuple] = []
+        for path, rid, eid in zip(raw, elements["regime_id"].tolist(), elements["element_id"].tolist()):
+            parts = trace_path_list(path, rid, eid)
+            if not isinstance(parts, list):
+                raise ValueError(f"trace_path of element {eid!r} is not a JSON list: {path!r}")
+            regimes.append(tuple(str(p) for p in parts[:-1]) or (str(rid),))
+        depth = max(map(len, regimes), default=1)
+
+        labels: List[pd.Index] = []
+        parent: List[np.ndarray] = []
+        prev: Optional[np.ndarray] = None
+        for k in range(depth):
+            keys = np.empty(len(regimes), dtype=object)
+            keys[:] = [p[:k + 1] for p in regimes]
+            codes, uniques = pd.factorize(keys, sort=True)
+            labels.append(pd.Index([_node_label(u) for u in uniques], name="regime_id"))
+            up = np.zeros(len(uniques), dtype=np.intp)
+            if prev is not None:
+                up[codes] = prev
+            parent.append(up)
+            prev = codes
+        return cls(labels=labels, parent=parent, leaf_codes=prev)
+
+
+def level_frame(frame: ColumnarFrame, tree: RegimeTree, level: int) -> ColumnarFrame:
+    """The columnar frame with `level`'s nodes as regimes (local unity / exclusion at that level)."""
+    k = tree.level_index(level)
+    codes = tree.element_codes(k)
+    regime_total = tree.rollup(frame.backend.segment_sum(tree.leaf_codes, frame.value, len(tree.labels[-1])))[k]
+    return ColumnarFrame(
+        codes=codes,
+        regimes=tree.labels[k],
+        value=frame.value,
+        total=frame.total,
+        regime_total=regime_total,
+        rho_global_pre=frame.rho_global_pre,
+        rho_local_pre=_safe_ratio(frame.value, regime_total[codes]),
+        backend=frame.backend,
+    )
+
+
+def hierarchy_coherence_map(frame: ColumnarFrame, tree: RegimeTree, cyc: ColumnarCycle) -> pd.DataFrame:
+    """
+    Coherence map for every level of the tree (long format, one row per node).
+
+    Element data is reduced once, at the deepest level; every other level is a
+    segment sum of its children through the parent pointers. Columns match the
+    flat coherence map, plus level / parent_id and discarded_budget_local (the
+    node's discarded share of its own pre-exclusion mass).
+    """
+    n_leaf = len(tree.labels[-1])
+    leaf = tree.leaf_codes
+    kept_leaf = leaf[cyc.kept_index]
+    segment_sum = frame.backend.segment_sum
+    value_pre = tree.rollup(segment_sum(leaf, frame.value, n_leaf))
+    value_discarded = tree.rollup(segment_sum(leaf[cyc.excluded], frame.value[cyc.excluded], n_leaf))
+    value_kept = tree.rollup(segment_sum(kept_leaf, frame.value[cyc.kept_index], n_leaf))
+    rho_pre = tree.rollup(segment_sum(leaf, frame.rho_global_pre, n_leaf))
+    rho_post = tree.rollup(segment_sum(kept_leaf, cyc.rho_global_post, n_leaf))
+    rho_discarded = tree.rollup(segment_sum(leaf[cyc.excluded], frame.rho_global_pre[cyc.excluded], n_leaf))
+
+    out = []
+    for k in range(tree.depth):
+        # local unity of each node over its children (kept elements at the deepest level)
+        if k == tree.depth - 1:
+            unity = segment_sum(kept_leaf, _safe_ratio(frame.value[cyc.kept_index], value_kept[k][kept_leaf]), n_leaf)
+        else:
+            up = tree.parent[k + 1]
+            unity = segment_sum(up, _safe_ratio(value_kept[k + 1], value_kept[k][up]), len(tree.labels[k]))
+        level = pd.DataFrame({
+            "level": k,
+            "regime_id": tree.labels[k],
+            "parent_id": tree.labels[k - 1].to_numpy()[tree.parent[k]] if k else "",
+            "rho_global_pre": rho_pre[k],
+            "rho_global_post": rho_post[k],
+            "rho_discarded_pre": rho_discarded[k],
+            "local_unity_post": unity,
+            "discarded_budget_local": _safe_ratio(value_discarded[k], value_pre[k]),
+        })
+        out.append(level.sort_values("rho_global_pre", ascending=False))
+    res = pd.concat(out, ignore_index=True)
+    res["local_unity_ok_post"] = (res["local_unity_post"].abs() - 1.0).abs() < 1e-9
+    res["global_discarded_budget"] = cyc.discarded_budget_global
+    return res
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+import math
+
+import pandas as pd
+
+from .core import HUFConfig, HUFCore
+
+Records = Union[pd.DataFrame, Iterable[Mapping[str, Any]]]
+
+
+class _Bucket:
+    """Values sorted ascending; the first n_excluded entries are the excluded prefix."""
+
+    __slots__ = ("keys", "n_excluded")
+
+    def __init__(self, keys: List[Tuple[float, str]]):
+        self.keys = sorted(keys)
+        self.n_excluded = 0
+
+    def boundary(self, excluded: Callable[[float], bool]) -> int:
+        # Exclusion is monotone in value inside a bucket, so it holds on a prefix.
+        lo, hi = 0, len(self.keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if excluded(self.keys[mid][0]):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+class IncrementalHUFCore:
+    """
+    Incremental HUF cycle for element tables that change a few rows at a time.
+
+    Keeps running global and per-regime totals plus value-sorted buckets (one global
+    bucket for global exclusion, one per regime for local/dual). Since exclusion is a
+    monotone threshold on value inside a bucket, the excluded set is a prefix of each
+    bucket; apply_delta only moves prefix boundaries, so the excluded set and
+    discarded_budget_global refresh in time proportional to the delta plus the number
+    of elements crossing tau (dual exclusion also revisits each regime's boundary,
+    O(log m) apiece, when the global total moves). rho_global_post / rho_local_post
+    are O(1) lookups against the running kept totals.
+
+    Totals are running float sums; use to_core() for a from-scratch audited cycle.
+    """
+
+    def __init__(
+        self,
+        elements: pd.DataFrame,
+        config: HUFConfig,
+        dataset_id: str = "incremental",
+        code_fingerprint: str = "huf_core_v1"
+    ):
+        required = {"element_id", "regime_id", "value"}
+        missing = required - set(elements.columns)
+        if missing:
+            raise ValueError(f"elements missing columns: {sorted(missing)}")
+        if config.exclusion not in ("global", "local", "dual"):
+            raise ValueError("exclusion must be 'global', 'local', or 'dual'")
+        if config.exclusion == "dual" and config.tau_local is None:
+            raise ValueError("dual exclusion requires tau_local")
+
+        self.config = config
+        self.dataset_id = dataset_id
+        self.code_fingerprint = code_fingerprint
+        self._rows: Dict[str, Tuple[str, float]] = {}
+        for eid, rid, v in zip(elements["element_id"], elements["regime_id"], elements["value"]):
+            self._check_insert(str(eid), float(v))
+            self._rows[str(eid)] = (str(rid), float(v))
+
+        self.total = math.fsum(v for _, v in self._rows.values())
+        self._regime_total: Dict[str, float] = {}
+        self._regime_excluded: Dict[str, float] = {}
+        groups: Dict[Optional[str], List[Tuple[float, str]]] = {}
+        for eid, (rid, v) in self._rows.items():
+            self._regime_total[rid] = self._regime_total.get(rid, 0.0) + v
+            self._regime_excluded.setdefault(rid, 0.0)
+            groups.setdefault(self._bucket_key(rid), []).append((v, eid))
+        self._buckets: Dict[Optional[str], _Bucket] = {k: _Bucket(keys) for k, keys in groups.items()}
+        self._excluded: Set[str] = set()
+        self.excluded_value = 0.0
+        for key in self._buckets:
+            self._refresh_bucket(key, [], [])
+
+    # ---- state -----------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def kept_total(self) -> float:
+        return self.total - self.excluded_value
+
+    @property
+    def kept_count(self) -> int:
+        return len(self._rows) - len(self._excluded)
+
+    @property
+    def discarded_budget_global(self) -> float:
+        return (self.excluded_value / self.total) if self.total > 0 else 0.0
+
+    @property
+    def excluded(self) -> Set[str]:
+        """Excluded element ids (live view; copy before mutating)."""
+        return self._excluded
+
+    def rho_global_post(self, element_id: str) -> float:
+        rid, v = self._rows[element_id]
+        if element_id in self._excluded or self.kept_total <= 0:
+            return 0.0
+        return v / self.kept_total
+
+    def rho_local_post(self, element_id: str) -> float:
+        rid, v = self._rows[element_id]
+        kept = self._regime_total[rid] - self._regime_excluded[rid]
+        if element_id in self._excluded or kept <= 0:
+            return 0.0
+        return v / kept
+
+    def to_elements(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [(eid, rid, v) for eid, (rid, v) in self._rows.items()],
+            columns=["element_id", "regime_id", "value"],
+        )
+
+    def to_core(self) -> HUFCore:
+        """Materialize the current table as a HUFCore (O(n)) for a full, audited cycle."""
+        return HUFCore(self.to_elements(), dataset_id=self.dataset_id, code_fingerprint=self.code_fingerprint, copy=False)
+
+    # ---- deltas ----------------------------------------------------------------
+
+    def apply_delta(
+        self,
+        inserts: Optional[Records] = None,
+        updates: Optional[Union[Records, Mapping[str, float]]] = None,
+        deletes: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Apply deletes, then updates, then inserts, and refresh the excluded set.
+
+        inserts: records with element_id, regime_id, value
+        updates: {element_id: value} or records with element_id, value (+ optional regime_id)
+        deletes: element ids
+        Returns the elements whose exclusion status flipped and the new discarded budget.
+        The whole delta is validated before anything is applied: a bad record raises
+        and leaves the tracker unchanged.
+        """
+        deletes, updates, inserts = self._checked_delta(inserts, updates, deletes)
+        before_total = self.total
+        touched: Set[Optional[str]] = set()
+
+        for eid in deletes:
+            touched.add(self._remove(eid))
+
+        was_excluded: Dict[str, bool] = {}
+        for eid, rid, value in updates:
+            was_excluded.setdefault(eid, eid in self._excluded)
+            rid = self._rows[eid][0] if rid is None else rid
+            touched.add(self._remove(eid))
+            touched.add(self._insert(eid, rid, value))
+
+        inserted: List[str] = []
+        for eid, rid, value in inserts:
+            touched.add(self._insert(eid, rid, value))
+            inserted.append(eid)
+
+        if self.config.exclusion != "local" and self.total != before_total:
+            touched = set(self._buckets)
+
+        crossed_in: List[str] = []
+        crossed_out: List[str] = []
+        for key in touched:
+            if key in self._buckets:
+                self._refresh_bucket(key, crossed_in, crossed_out)
+
+        changed = set(was_excluded) | set(inserted)
+        return {
+            "newly_excluded": [e for e in crossed_in if e not in changed]
+            + [e for e, was in was_excluded.items() if not was and e in self._excluded]
+            + [e for e in inserted if e in self._excluded],
+            "newly_kept": [e for e in crossed_out if e not in changed]
+            + [e for e, was in was_excluded.items() if was and e not in self._excluded],
+            "discarded_budget_global": self.discarded_budget_global,
+            "kept_count": self.kept_count,
+        }
+
+    # ---- internals -------------------------------------------------------------
+
+    def _checked_delta(
+        self,
+        inserts: Optional[Records],
+        updates: Optional[Union[Records, Mapping[str, float]]],
+        deletes: Optional[Iterable[str]]
+    ) -> Tuple[List[str], List[Tuple[str, Optional[str], float]], List[Tuple[str, str, float]]]:
+        """Normalize a delta and check it against the ids it would see, in apply order."""
+        removed: Set[str] = set()
+        added: Set[str] = set()
+
+        def present(eid: str) -> bool:
+            return eid in added or (eid in self._rows and eid not in removed)
+
+        delete_ids: List[str] = []
+        for eid in deletes or ():
+            eid = str(eid)
+            if not present(eid):
+                raise KeyError(f"unknown element_id: {eid}")
+            removed.add(eid)
+            delete_ids.append(eid)
+
+        if isinstance(updates, Mapping):
+            updates = [{"element_id": k, "value": v} for k, v in updates.items()]
+        update_rows: List[Tuple[str, Optional[str], float]] = []
+        for rec in _records(updates):
+            eid = str(rec["element_id"])
+            if not present(eid):
+                raise KeyError(f"unknown element_id: {eid}")
+            value = float(rec["value"])
+            if not value >= 0:
+                raise ValueError("value must be nonnegative")
+            rid = rec.get("regime_id")
+            update_rows.append((eid, None if rid is None else str(rid), value))
+
+        insert_rows: List[Tuple[str, str, float]] = []
+        for rec in _records(inserts):
+            eid, rid, value = str(rec["element_id"]), str(rec["regime_id"]), float(rec["value"])
+            if not value >= 0:
+                raise ValueError("value must be nonnegative")
+            if present(eid):
+                raise ValueError(f"element_id already present: {eid}")
+            added.add(eid)
+            insert_rows.append((eid, rid, value))
+        return delete_ids, update_rows, insert_rows
+
+    def _bucket_key(self, regime_id: str) -> Optional[str]:
+        return None if self.config.exclusion == "global" else regime_id
+
+    def _check_insert(self, eid: str, value: float) -> None:
+        if not value >= 0:
+            raise ValueError("value must be nonnegative")
+        if eid in self._rows:
+            raise ValueError(f"element_id already present: {eid}")
+
+    def _insert(self, eid: str, rid: str, value: float) -> Optional[str]:
+        self._check_insert(eid, value)
+        self._rows[eid] = (rid, value)
+        self.total += value
+        self._regime_total[rid] = self._regime_total.get(rid, 0.0) + value
+        self._regime_excluded.setdefault(rid, 0.0)
+        key = self._bucket_key(rid)
+        bucket = self._buckets.setdefault(key, _Bucket([]))
+        entry = (value, eid)
+        pos = bisect_left(bucket.keys, entry)
+        bucket.keys.insert(pos, entry)
+        if pos < bucket.n_excluded:
+            # landed inside the excluded prefix; the boundary refresh re-checks it
+            bucket.n_excluded += 1
+            self._mark_excluded(eid, rid, value)
+        return key
+
+    def _remove(self, eid: str) -> Optional[str]:
+        rid, value = self._rows.pop(eid)
+        self.total -= value
+        self._regime_total[rid] -= value
+        key = self._bucket_key(rid)
+        bucket = self._buckets[key]
+        pos = bisect_left(bucket.keys, (value, eid))
+        del bucket.keys[pos]
+        if pos < bucket.n_excluded:
+            bucket.n_excluded -= 1
+            self._excluded.discard(eid)
+            self.excluded_value -= value
+            self._regime_excluded[rid] -= value
+        if not bucket.keys:
+            del self._buckets[key]
+        return key
+
+    def _mark_excluded(self, eid: str, rid: str, value: float) -> None:
+        self._excluded.add(eid)
+        self.excluded_value += value
+        self._regime_excluded[rid] += value
+
+    def _predicate(self, key: Optional[str]) -> Callable[[float], bool]:
+        cfg = self.config
+        total = self.total
+        tau = cfg.tau
+
+        def rho_global(v: float) -> float:
+            return v / total if total > 0 else 0.0
+
+        if cfg.exclusion == "global":
+            return lambda v: rho_global(v) < tau
+        regime_total = self._regime_total[key]
+
+        def rho_local(v: float) -> float:
+            return v / regime_total if regime_total > 0 else 0.0
+
+        if cfg.exclusion == "local":
+            return lambda v: rho_local(v) < tau
+        tau_local = float(cfg.tau_local)
+        return lambda v: rho_global(v) < tau and rho_local(v) < tau_local
+
+    def _refresh_bucket(self, key: Optional[str], newly_excluded: List[str], newly_kept: List[str]) -> None:
+        bucket = self._buckets[key]
+        old = bucket.n_excluded
+        new = bucket.boundary(self._predicate(key))
+        for v, eid in bucket.keys[old:new]:
+            self._mark_excluded(eid, self._rows[eid][0], v)
+            newly_excluded.append(eid)
+        for v, eid in bucket.keys[new:old]:
+            rid = self._rows[eid][0]
+            self._excluded.discard(eid)
+            self.excluded_value -= v
+            self._regime_excluded[rid] -= v
+            newly_kept.append(eid)
+        bucket.n_excluded = new
+
+
+def _records(x: Optional[Records]) -> Iterable[Mapping[str, Any]]:
+    if x is None:
+        return ()
+    if isinstance(x, pd.DataFrame):
+        return x.to_dict("records")
+    return x
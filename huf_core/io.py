@@ -1,42 +1,583 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from json.encoder import encode_basestring
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import asyncio
+import functools
+import hashlib
 import json
+import math
+import os
+import shutil
+import uuid
+import numpy as np
 import pandas as pd
 
-def write_jsonl(path: Path, records: List[Dict[str, Any]]) -> None:
-    with path.open("w", encoding="utf-8") as f:
+from .artifacts import TRACE_FIELDS, RecordTable, TraceTable, trace_path_list
+from .adapters import _file_fingerprint
+from .compression import CODEC_SUFFIX, MANIFEST_NAME, codec_for, compressed_name, open_text, resolve_artifact
+from .core import _hash_text, config_param_hash
+
+ARTIFACT_FORMATS = ("csv", "parquet", "arrow")
+TRACE_ENCODERS = ("json", "orjson")
+TRACE_BLOCK_ROWS = 65536
+_SUFFIX = {"parquet": ".parquet", "arrow": ".arrow"}
+_TABLE_STEMS = ("artifact_1_coherence_map", "artifact_1_coherence_hierarchy", "artifact_2_active_set", "artifact_3_trace_report")
+_Job = Callable[[Path], Optional[int]]  # writes one file, returns its row count (None for JSON)
+
+@dataclass(frozen=True)
+class SerializedTable:
+    """
+    A table already written to `path` in write_artifacts' CSV / JSONL layout
+    (compressed as its suffix says), e.g. by the out-of-core stream_cycle.
+    write_artifacts moves it into place instead of serializing it.
+    inputs_ref lists the distinct inputs_ref values of a trace report.
+    """
+    path: Path
+    rows: int
+    inputs_ref: Tuple[str, ...] = ()
+
+def write_jsonl(path: Path, records: Iterable[Dict[str, Any]], block_rows: int = TRACE_BLOCK_ROWS, compress_threads: int = 0) -> None:
+    """JSONL, one json.dumps line per record (compressed by extension: .jsonl.gz / .jsonl.zst)."""
+    with open_text(path, "w", threads=compress_threads) as f:
+        block: List[str] = []
         for r in records:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            block.append(json.dumps(r, ensure_ascii=False) + "\n")
+            if len(block) >= block_rows:
+                f.write("".join(block))
+                block = []
+        f.write("".join(block))
 
-def write_artifacts(out_dir: Path, artifacts: Dict[str, Any]) -> None:
-    out_dir.mkdir(parents=True, exist_ok=True)
+def write_trace_jsonl(
+    path: Path,
+    trace: Any,
+    block_rows: int = TRACE_BLOCK_ROWS,
+    workers: Optional[int] = None,
+    encoder: str = "json",
+    compress_threads: int = 0
+) -> None:
+    """
+    Trace report as JSONL, formatted from the TraceTable columns a block at a time.
 
-    # Coherence map
-    cm = artifacts["coherence_map"]
-    if isinstance(cm, pd.DataFrame):
-        cm.to_csv(out_dir / "artifact_1_coherence_map.csv", index=False)
-    else:
-        pd.DataFrame(cm).to_csv(out_dir / "artifact_1_coherence_map.csv", index=False)
+    Each fixed-schema line is filled into one template: strings are escaped with
+    the json module's own encoder (repeated inputs_ref / method_ref /
+    discarded_budget_global values once per distinct value), floats use the same
+    repr as json.dumps, so the bytes match write_jsonl exactly. Only regime_path
+    is parsed and re-encoded per row.
+
+    workers > 1 formats blocks on a thread pool while the calling thread writes
+    finished blocks in order. encoder="orjson" (optional dependency) encodes
+    whole records with orjson instead: fastest, compact separators, same JSON
+    values. Plain list-of-dict traces fall back to write_jsonl. The codec follows
+    the extension (see huf_core.compression.open_text).
+    """
+    if encoder not in TRACE_ENCODERS:
+        raise ValueError(f"encoder must be one of {TRACE_ENCODERS}")
+    if encoder == "orjson":
+        _require_orjson("encoder='orjson'")
+    if not isinstance(trace, TraceTable):
+        write_jsonl(path, trace, block_rows, compress_threads)
+        return
+    frame = trace.frame
+    fmt = _orjson_trace_block if encoder == "orjson" else _trace_block
+    blocks = (frame.iloc[lo:lo + block_rows] for lo in range(0, len(frame), max(1, block_rows)))
+    with open_text(path, "w", threads=compress_threads) as f:
+        if workers and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for text in _ordered(pool, fmt, blocks, workers):
+                    f.write(text)
+        else:
+            for block in blocks:
+                f.write(fmt(block))
 
-    # Active set
-    pd.DataFrame(artifacts["active_set"]).to_csv(out_dir / "artifact_2_active_set.csv", index=False)
+def _ordered(pool: ThreadPoolExecutor, fn: Any, items: Iterator[Any], ahead: int) -> Iterator[Any]:
+    # pool.map without submitting everything up front: at most `ahead` blocks in flight
+    pending: List[Any] = []
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) > ahead:
+            yield pending.pop(0).result()
+    for fut in pending:
+        yield fut.result()
 
-    # Trace report
-    write_jsonl(out_dir / "artifact_3_trace_report.jsonl", artifacts["trace_report"])
+def _json_float(x: float) -> str:
+    if x != x:
+        return "NaN"
+    if math.isinf(x):
+        return "Infinity" if x > 0 else "-Infinity"
+    return float.__repr__(x)
 
-    # Error/budget
-    (out_dir / "artifact_4_error_budget.json").write_text(
-        json.dumps(artifacts["error_budget"], indent=2, ensure_ascii=False),
-        encoding="utf-8"
+def _float_column(col: pd.Series) -> List[str]:
+    values = col.to_numpy(dtype=float)
+    if np.isfinite(values).all():
+        return list(map(float.__repr__, values.tolist()))
+    return [_json_float(x) for x in values.tolist()]
+
+def _encoded_column(col: pd.Series, encode: Any) -> List[str]:
+    # encode each distinct value once (refs repeat on every row)
+    codes, uniques = pd.factorize(col, use_na_sentinel=False)
+    enc = [encode(v) for v in uniques.tolist()]
+    return [enc[c] for c in codes.tolist()]
+
+def _regime_path_json(raw: Any, regime_id: Any, element_id: Any) -> str:
+    # A trace_path cell written by json.dumps(list of str) is already the exact
+    # encoding: reuse it when it has no escapes, no control characters and no
+    # quote inside an item; anything else is parsed and re-encoded.
+    if (
+        isinstance(raw, str) and len(raw) >= 4 and raw.startswith('["') and raw.endswith('"]')
+        and "\\" not in raw and raw.isprintable() and '"' not in raw[2:-2].replace('", "', "")
+    ):
+        return raw
+    path = trace_path_list(raw, regime_id, element_id)
+    if isinstance(path, list) and all(isinstance(p, str) for p in path):
+        return "[" + ", ".join(map(encode_basestring, path)) + "]"
+    return json.dumps(path, ensure_ascii=False)
+
+def _trace_block(frame: pd.DataFrame) -> str:
+    item_id = frame["item_id"].tolist()
+    cols = zip(
+        map(encode_basestring, item_id),
+        map(_regime_path_json, frame["trace_path"].tolist(), frame["regime_id"].tolist(), item_id),
+        _float_column(frame["rho_global_post"]),
+        _encoded_column(frame["inputs_ref"], encode_basestring),
+        _encoded_column(frame["method_ref"], encode_basestring),
+        _encoded_column(frame["discarded_budget_global"], _json_float),
     )
+    return "".join([
+        f'{{"item_id": {a}, "regime_path": {b}, "rho_global_post": {c}, '
+        f'"inputs_ref": {d}, "method_ref": {e}, "discarded_budget_global": {g}}}\n'
+        for a, b, c, d, e, g in cols
+    ])
+
+def _require_orjson(what: str) -> None:
+    try:
+        import orjson  # noqa: F401
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError(f"orjson is required for {what}") from e
+
+def _orjson_path(orjson: Any, raw: Any, regime_id: Any, element_id: Any) -> Any:
+    if isinstance(raw, str) and raw.strip():
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return [str(regime_id), str(element_id)]
 
-    # Run stamp
-    (out_dir / "run_stamp.json").write_text(
-        json.dumps(artifacts["run_stamp"], indent=2, ensure_ascii=False),
-        encoding="utf-8"
+def _orjson_trace_block(frame: pd.DataFrame) -> str:
+    import orjson
+
+    item_id = frame["item_id"].tolist()
+    rows = zip(
+        item_id,
+        map(functools.partial(_orjson_path, orjson), frame["trace_path"].tolist(), frame["regime_id"].tolist(), item_id),
+        frame["rho_global_post"].tolist(),
+        frame["inputs_ref"].tolist(),
+        frame["method_ref"].tolist(),
+        frame["discarded_budget_global"].tolist(),
     )
+    dumps, opt = orjson.dumps, orjson.OPT_APPEND_NEWLINE
+    return b"".join([dumps(dict(zip(TRACE_FIELDS, r)), option=opt) for r in rows]).decode("utf-8")
+
+def write_artifacts(
+    out_dir: Path,
+    artifacts: Dict[str, Any],
+    format: str = "csv",
+    compression: Optional[str] = None,
+    compress_threads: int = 0,
+    extras: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+    trace_encoder: str = "json",
+    trace_workers: Optional[int] = None,
+) -> None:
+    """
+    Persist a cycle's artifacts under out_dir.
+
+    format:
+      - "csv" (default): coherence map / active set as CSV, trace report as JSONL
+      - "parquet" / "arrow": the three tables as Parquet or Arrow IPC (Feather v2)
+        files with dictionary-encoded string columns; the trace report is one row
+        per record with regime_path as a list<string> column (needs pyarrow)
+    compression ("gzip" / "zstd", zstd needs zstandard) compresses the tables:
+    CSV/JSONL get a .gz / .zst suffix and are compressed on compress_threads
+    threads; Parquet uses the codec for its pages, Arrow IPC supports zstd only.
+    The error budget and run stamp are plain JSON in every format.
+    trace_encoder / trace_workers select the JSONL trace writer's encoder and
+    block-formatting threads (see write_trace_jsonl; CSV format only).
+
+    extras maps further file names to content written alongside (a DataFrame as
+    CSV, a str as is, anything else as JSON), e.g. the CLI's stability_packet.csv
+    and meta.json.
+
+    The files are serialized concurrently on `workers` threads (default: one per
+    file) into hidden temp files, fsync'ed, and renamed into place only once all
+    of them succeeded (run_stamp.json, then manifest.json last), so a failed or
+    interrupted write never leaves a partially written artifact under its final
+    name. Files another format / compression left for the same tables are
+    removed in the same step. A file whose bytes did not change is left untouched (its mtime
+    survives), so downstream tools can skip unchanged artifacts.
+
+    manifest.json records bytes, rows and sha256 per file plus the producing
+    dataset_id, param_hash, code_hash and inputs_ref (see is_up_to_date).
+    """
+    if format not in ARTIFACT_FORMATS:
+        raise ValueError(f"format must be one of {ARTIFACT_FORMATS}")
+    compressed_name("", compression)  # validates the codec
+    if format == "arrow" and compression == "gzip":
+        raise ValueError("Arrow IPC supports compression='zstd' only")
+    if format != "csv" and any(isinstance(artifacts[k], SerializedTable) for k in ("active_set", "trace_report")):
+        raise ValueError("pre-serialized (streamed) tables can only be written with format='csv'")
+    if trace_encoder not in TRACE_ENCODERS:
+        raise ValueError(f"trace_encoder must be one of {TRACE_ENCODERS}")
+    if trace_encoder == "orjson":
+        _require_orjson("trace_encoder='orjson'")
+    if format == "csv":
+        jobs = _text_table_jobs(artifacts, compression, compress_threads, trace_encoder, trace_workers)
+    else:
+        jobs = _columnar_table_jobs(artifacts, format, compression)
+    for name, content in (extras or {}).items():
+        jobs[name] = _extra_job(content)
+    jobs["artifact_4_error_budget.json"] = _json_job(artifacts["error_budget"])
+    jobs["run_stamp.json"] = _json_job(artifacts["run_stamp"])
+    stamp = artifacts["run_stamp"]
+    head = {
+        "dataset_id": stamp.get("dataset_id"),
+        "param_hash": stamp.get("param_hash"),
+        "code_hash": stamp.get("code_hash"),
+        "inputs_ref": _inputs_refs(artifacts["trace_report"]),
+    }
+    out_dir.mkdir(parents=True, exist_ok=True)
+    _write_atomically(out_dir, jobs, workers, head)
+
+async def write_artifacts_async(out_dir: Path, artifacts: Dict[str, Any], **kwargs: Any) -> None:
+    """write_artifacts for use inside an event loop (runs in the loop's default executor)."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, functools.partial(write_artifacts, out_dir, artifacts, **kwargs))
+
+def _write_atomically(out_dir: Path, jobs: Dict[str, _Job], workers: Optional[int], head: Dict[str, Any]) -> None:
+    # temp names keep the extension (codec / format detection) and start with "."
+    # so nothing that looks for an artifact name ever picks them up
+    token = f".tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}."
+    temps = {name: out_dir / (token + name) for name in list(jobs) + [MANIFEST_NAME]}
+    entries: Dict[str, Dict[str, Any]] = {}
+    unchanged = set()
+
+    def run(name: str) -> None:
+        rows = jobs[name](temps[name])
+        _fsync(temps[name])
+        entries[name] = {"bytes": temps[name].stat().st_size, "rows": rows, "sha256": _sha256(temps[name])}
+        if _same_file(out_dir / name, entries[name]):
+            unchanged.add(name)
+
+    try:
+        n = len(jobs) if workers is None else max(1, int(workers))
+        if n == 1:
+            for name in jobs:
+                run(name)
+        else:
+            with ThreadPoolExecutor(max_workers=n) as pool:
+                for fut in [pool.submit(run, name) for name in jobs]:
+                    fut.result()
+        manifest = {**head, "artifacts": {name: entries[name] for name in sorted(entries)}}
+        temps[MANIFEST_NAME].write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+        _fsync(temps[MANIFEST_NAME])
+        if (out_dir / MANIFEST_NAME).is_file() and (out_dir / MANIFEST_NAME).read_bytes() == temps[MANIFEST_NAME].read_bytes():
+            unchanged.add(MANIFEST_NAME)
+    except BaseException:
+        for tmp in temps.values():
+            tmp.unlink(missing_ok=True)
+        raise
+    for name in sorted(temps, key=lambda name: (name == MANIFEST_NAME, name == "run_stamp.json")):
+        if name in unchanged:
+            temps[name].unlink()
+        else:
+            os.replace(temps[name], out_dir / name)
+    _fsync_dir(out_dir)
+    # only once the new manifest is in place: a crash before this point leaves
+    # extra files the manifest does not list, never a manifest without its files
+    _remove_stale_variants(out_dir, jobs)
+    _fsync_dir(out_dir)
+
+def _remove_stale_variants(out_dir: Path, jobs: Dict[str, _Job]) -> None:
+    # tables of an earlier run in another format / codec would otherwise shadow
+    # (or be mistaken for) this run's files
+    for stem in _TABLE_STEMS:
+        for stale in _table_variants(stem):
+            if stale not in jobs:
+                (out_dir / stale).unlink(missing_ok=True)
+
+def _table_variants(stem: str) -> List[str]:
+    """Every file name write_artifacts may use for one table (all formats and codecs)."""
+    text = stem + (".jsonl" if stem == "artifact_3_trace_report" else ".csv")
+    return [stem + suffix for suffix in _SUFFIX.values()] + [text + suffix for suffix in ("",) + tuple(CODEC_SUFFIX.values())]
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _same_file(path: Path, entry: Dict[str, Any]) -> bool:
+    # size first: only same-size files are hashed
+    return path.is_file() and path.stat().st_size == entry["bytes"] and _sha256(path) == entry["sha256"]
+
+def _inputs_refs(trace: Any) -> List[str]:
+    if isinstance(trace, SerializedTable):
+        return sorted(set(trace.inputs_ref))
+    values = trace.frame["inputs_ref"].unique() if isinstance(trace, TraceTable) else [r.get("inputs_ref") for r in trace]
+    return sorted({str(v) for v in values if v})
+
+def read_manifest(out_dir: Path) -> Optional[Dict[str, Any]]:
+    """out_dir/manifest.json as written by write_artifacts, or None when missing or unreadable."""
+    try:
+        return json.loads((Path(out_dir) / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def is_up_to_date(out_dir: Path, inputs: Any, config: Any, code_fingerprint: str = "huf_core_v1") -> bool:
+    """
+    True when out_dir holds a complete run for these input files and config.
 
+    Cheap (no cycle, no hashing of the artifacts): compares the manifest's
+    param_hash / code_hash with config and code_fingerprint (as HUFCore stamps
+    them), its inputs_ref with the adapters' fingerprint (name|size|mtime) of
+    `inputs` (one path or several), and checks every listed file is present with
+    its recorded size. Settings that only reach the elements (e.g. an adapter
+    filter) are not in param_hash; runners varying those need separate out_dirs.
+    """
+    manifest = read_manifest(out_dir)
+    if not manifest or "artifacts" not in manifest:
+        return False
+    if manifest.get("param_hash") != config_param_hash(config) or manifest.get("code_hash") != _hash_text(code_fingerprint):
+        return False
+    paths = [inputs] if isinstance(inputs, (str, os.PathLike)) else list(inputs)
+    try:
+        refs = sorted({_file_fingerprint(Path(p)) for p in paths})
+    except OSError:
+        return False
+    if manifest.get("inputs_ref") != refs:
+        return False
+    for name, entry in manifest["artifacts"].items():
+        path = Path(out_dir) / name
+        if not path.is_file() or path.stat().st_size != entry.get("bytes"):
+            return False
+    return True
+
+def _fsync(path: Path) -> None:
+    with open(path, "rb+") as f:
+        os.fsync(f.fileno())
+
+def _fsync_dir(path: Path) -> None:
+    # makes the renames durable; directories cannot be opened on Windows
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _json_job(obj: Any) -> _Job:
+    def write(path: Path) -> None:
+        path.write_text(json.dumps(obj, indent=2, ensure_ascii=False), encoding="utf-8")
+    return write
+
+def _csv_job(df: pd.DataFrame, threads: int = 0) -> _Job:
+    def write(path: Path) -> int:
+        _write_csv(path, df, threads)
+        return len(df)
+    return write
+
+def _extra_job(content: Any) -> _Job:
+    if isinstance(content, pd.DataFrame):
+        return _csv_job(content)
+    if not isinstance(content, str):
+        return _json_job(content)
+
+    def write(path: Path) -> None:
+        path.write_text(content, encoding="utf-8")
+    return write
+
+def _write_csv(path: Path, df: pd.DataFrame, threads: int) -> None:
+    with open_text(path, "w", threads=threads) as f:
+        df.to_csv(f, index=False)
+
+def _active_frame(artifacts: Dict[str, Any]) -> pd.DataFrame:
+    # columnar tables are serialized straight from their columns
+    active = artifacts["active_set"]
+    return active.frame if isinstance(active, RecordTable) else pd.DataFrame(active)
+
+def _moved_job(table: SerializedTable, name: str) -> _Job:
+    if codec_for(table.path) != codec_for(Path(name)):
+        raise ValueError(f"{table.path.name} does not match the requested compression for {name}")
+
+    def write(path: Path) -> int:
+        shutil.move(str(table.path), str(path))
+        return table.rows
+    return write
+
+def _text_table_jobs(
+    artifacts: Dict[str, Any],
+    compression: Optional[str],
+    threads: int,
+    trace_encoder: str = "json",
+    trace_workers: Optional[int] = None
+) -> Dict[str, _Job]:
+    jobs = {compressed_name("artifact_1_coherence_map.csv", compression): _csv_job(pd.DataFrame(artifacts["coherence_map"]), threads)}
+    # Per-level coherence maps (hierarchy cycles only)
+    if "coherence_hierarchy" in artifacts:
+        jobs[compressed_name("artifact_1_coherence_hierarchy.csv", compression)] = _csv_job(pd.DataFrame(artifacts["coherence_hierarchy"]), threads)
+    name = compressed_name("artifact_2_active_set.csv", compression)
+    active = artifacts["active_set"]
+    jobs[name] = _moved_job(active, name) if isinstance(active, SerializedTable) else _csv_job(_active_frame(artifacts), threads)
+    name = compressed_name("artifact_3_trace_report.jsonl", compression)
+    trace = artifacts["trace_report"]
+
+    def write_trace(path: Path) -> int:
+        write_trace_jsonl(path, trace, workers=trace_workers, encoder=trace_encoder, compress_threads=threads)
+        return len(trace)
+
+    jobs[name] = _moved_job(trace, name) if isinstance(trace, SerializedTable) else write_trace
+    return jobs
+
+def _require_pyarrow(format: str) -> None:
+    # pyarrow is optional and heavy: imported only on the Parquet / Arrow paths
+    try:
+        import pyarrow  # noqa: F401
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError(f"pyarrow is required for format={format!r}") from e
+
+def _columnar_table_jobs(artifacts: Dict[str, Any], format: str, compression: Optional[str] = None) -> Dict[str, _Job]:
+    _require_pyarrow(format)
+    suffix = _SUFFIX[format]
+    tables = {
+        "artifact_1_coherence_map": lambda: _arrow_table(pd.DataFrame(artifacts["coherence_map"])),
+        "artifact_2_active_set": lambda: _arrow_table(_active_frame(artifacts)),
+        "artifact_3_trace_report": lambda: _trace_arrow_table(artifacts["trace_report"]),
+    }
+    if "coherence_hierarchy" in artifacts:
+        tables["artifact_1_coherence_hierarchy"] = lambda: _arrow_table(pd.DataFrame(artifacts["coherence_hierarchy"]))
+
+    def job(build: Callable[[], Any]) -> _Job:
+        # the Arrow conversion runs on the worker thread too
+        def write(path: Path) -> int:
+            table = build()
+            write_table(path, table, format, compression)
+            return table.num_rows
+        return write
+
+    return {name + suffix: job(build) for name, build in tables.items()}
+
+def write_table(path: Path, table: Any, format: str, compression: Optional[str] = None) -> None:
+    """Write one Arrow table as Parquet or Arrow IPC (dictionary columns are kept as such)."""
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path, compression=compression or "snappy")
+    elif format == "arrow":
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, path, compression=compression or "uncompressed")
+    else:
+        raise ValueError(f"format must be one of {ARTIFACT_FORMATS[1:]}")
+
+def _dictionary_strings(table: Any) -> Any:
+    # ids / regimes / refs repeat heavily: store each distinct string once
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    for i, field in enumerate(table.schema):
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            table = table.set_column(i, field.name, pc.dictionary_encode(table.column(i)))
+    return table
+
+def _arrow_table(df: pd.DataFrame) -> Any:
+    import pyarrow as pa
+
+    return _dictionary_strings(pa.Table.from_pandas(df, preserve_index=False))
+
+def _trace_arrow_table(trace: Any) -> Any:
+    import pyarrow as pa
+
+    if isinstance(trace, TraceTable):
+        f = trace.frame
+        item_id = f["item_id"].tolist()
+        regime_path = [trace_path_list(p, r, e) for p, r, e in zip(f["trace_path"].tolist(), f["regime_id"].tolist(), item_id)]
+        cols = {
+            "item_id": item_id,
+            "regime_path": regime_path,
+            "rho_global_post": f["rho_global_post"].to_numpy(),
+            "inputs_ref": f["inputs_ref"].tolist(),
+            "method_ref": f["method_ref"].tolist(),
+            "discarded_budget_global": f["discarded_budget_global"].to_numpy(),
+        }
+    else:
+        records = list(trace)
+        cols = {k: [r.get(k) for r in records] for k in TRACE_FIELDS}
+    table = pa.table({
+        k: pa.array(v, type=pa.list_(pa.string())) if k == "regime_path" else v
+        for k, v in cols.items()
+    })
+    return _dictionary_strings(table)
+
+def read_table(path: Path) -> pd.DataFrame:
+    """
+    Read one artifact table written by write_artifacts (.csv, .jsonl, .parquet or
+    .arrow; CSV/JSONL optionally .gz / .zst, stream-decompressed). Dictionary
+    columns come back as plain strings and the trace regime_path as Python
+    lists, so every format yields the same frame.
+    """
+    path = Path(path)
+    kind = Path(path.stem).suffix if codec_for(path) else path.suffix
+    if kind == ".csv":
+        with open_text(path) as f:
+            return pd.read_csv(f)
+    if kind == ".jsonl":
+        with open_text(path) as f:
+            return pd.DataFrame([json.loads(line) for line in f if line.strip()])
+    if kind not in _SUFFIX.values() or codec_for(path):
+        raise ValueError(f"Unsupported artifact table: {path.name}")
+    _require_pyarrow(path.suffix[1:])
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path) if path.suffix == ".parquet" else feather.read_table(path)
+    out = {}
+    for name, col in zip(table.column_names, table.columns):
+        if pa.types.is_dictionary(col.type):
+            col = col.cast(col.type.value_type)
+        out[name] = col.to_pylist() if pa.types.is_list(col.type) else col.to_pandas()
+    return pd.DataFrame(out)
+
+def read_artifacts(out_dir: Path) -> Dict[str, Any]:
+    """
+    Load a run folder in whichever format / compression it was written: tables
+    as DataFrames (coherence_map, coherence_hierarchy if present, active_set,
+    trace_report), error_budget and run_stamp as dicts.
+
+    Each table is the file named in manifest.json; a folder without a manifest
+    must hold a single variant per table (ValueError otherwise).
+    """
+    out_dir = Path(out_dir)
+    stems = {
+        "coherence_map": "artifact_1_coherence_map",
+        "coherence_hierarchy": "artifact_1_coherence_hierarchy",
+        "active_set": "artifact_2_active_set",
+        "trace_report": "artifact_3_trace_report",
+    }
+    out: Dict[str, Any] = {}
+    for key, stem in stems.items():
+        path = resolve_artifact(out_dir, _table_variants(stem))
+        if path is not None:
+            out[key] = read_table(path)
+        elif key != "coherence_hierarchy":
+            raise FileNotFoundError(out_dir / f"{stem}.*")
+    out["error_budget"] = json.loads((out_dir / "artifact_4_error_budget.json").read_text(encoding="utf-8"))
+    out["run_stamp"] = json.loads((out_dir / "run_stamp.json").read_text(encoding="utf-8"))
+    return out
 
 def validate_trace_line_min(obj: dict) -> None:
     """Minimal runtime validation for required trace fields.
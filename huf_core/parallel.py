@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import os
+
+import numpy as np
+import pandas as pd
+
+from .core import HUFConfig
+from .engine import ColumnarFrame, run_columnar_cycle
+from .similarity import as_bitsets
+
+EXECUTORS = ("serial", "thread", "process")
+
+_ALIGN = 64
+_ArraySpec = Tuple[str, str, Tuple[int, ...], int]  # (key, dtype.str, shape, byte offset)
+
+
+class SharedArrays:
+    """
+    Named numpy arrays packed into one multiprocessing.shared_memory block.
+
+    The parent copies the arrays in once; process-pool workers attach by name
+    (see `attach`) and get zero-copy views, so per-task payloads stay tiny.
+    The creator must call close() (also unlinks); use it as a context manager.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        layout: List[_ArraySpec] = []
+        offset = 0
+        for key, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            layout.append((key, arr.dtype.str, arr.shape, offset))
+            offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self.spec: Tuple[str, List[_ArraySpec]] = (self._shm.name, layout)
+        for (key, _, _, _), view in zip(layout, self._views(self._shm, layout)):
+            view[...] = arrays[key]
+
+    @staticmethod
+    def _views(shm: shared_memory.SharedMemory, layout: List[_ArraySpec]) -> List[np.ndarray]:
+        return [np.ndarray(shape, dtype=np.dtype(dt), buffer=shm.buf, offset=off) for _, dt, shape, off in layout]
+
+    @classmethod
+    def attach(cls, spec: Tuple[str, List[_ArraySpec]]) -> Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]:
+        name, layout = spec
+        shm = shared_memory.SharedMemory(name=name)
+        return shm, {key: view for (key, _, _, _), view in zip(layout, cls._views(shm, layout))}
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class _PacketState:
+    """Everything one stability-packet point needs; shared by all tasks of a sweep."""
+
+    def __init__(self, frame: ColumnarFrame, item_codes: np.ndarray, n_items: int):
+        self.frame = frame
+        self.item_codes = item_codes
+        self.n_items = n_items
+
+    def row(self, config: HUFConfig) -> Optional[Dict[str, Any]]:
+        # Raw per-point results (None = invalid); HUFCore.stability_packet turns
+        # them into similarities in one kernel call, exactly as for the serial loop.
+        try:
+            cyc = run_columnar_cycle(self.frame, config)
+        except ValueError:
+            return None
+        present = np.zeros(self.n_items, dtype=bool)
+        present[self.item_codes[cyc.kept_index]] = True
+        return {
+            "active_count": int(cyc.kept_index.size),
+            "discarded_budget_global": cyc.discarded_budget_global,
+            "active_bits": as_bitsets(present)[0],  # 1 bit per item back to the parent
+            "regime_rho": self.frame.backend.segment_sum(self.frame.codes, self.frame.rho_global_pre, self.frame.n_regimes),
+        }
+
+
+_WORKER_STATE: Optional[_PacketState] = None
+_WORKER_SHM: Optional[shared_memory.SharedMemory] = None
+
+
+def _init_process_worker(spec: Tuple[str, List[_ArraySpec]], total: float, regimes: pd.Index, n_items: int, backend: Any) -> None:
+    global _WORKER_STATE, _WORKER_SHM
+    _WORKER_SHM, arrays = SharedArrays.attach(spec)
+    frame = ColumnarFrame(
+        codes=arrays["codes"],
+        regimes=regimes,
+        value=arrays["value"],
+        total=total,
+        regime_total=arrays["regime_total"],
+        rho_global_pre=arrays["rho_global_pre"],
+        rho_local_pre=arrays["rho_local_pre"],
+        backend=backend,
+    )
+    _WORKER_STATE = _PacketState(frame, arrays["item_codes"], n_items)
+
+
+def _process_row(config: HUFConfig) -> Optional[Dict[str, Any]]:
+    assert _WORKER_STATE is not None, "worker was not initialized"
+    return _WORKER_STATE.row(config)
+
+
+def _check_executor(executor: str) -> None:
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {EXECUTORS}")
+
+
+def packet_rows(
+    frame: ColumnarFrame,
+    item_codes: np.ndarray,
+    n_items: int,
+    configs: Sequence[HUFConfig],
+    executor: str = "serial",
+    max_workers: Optional[int] = None
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Evaluate stability-packet points for many configs on a serial loop, a thread
+    pool, or a process pool (rows come back in config order, None = invalid).
+
+    item_codes factorizes element ids into [0, n_items), so each point's active
+    set comes back as a bitset over ids (exact set Jaccard on ids). For "process"
+    the element arrays go to shared memory once; each task pickles only its config.
+    """
+    _check_executor(executor)
+    configs = list(configs)
+    if executor == "serial" or len(configs) <= 1:
+        state = _PacketState(frame, item_codes, n_items)
+        return [state.row(c) for c in configs]
+
+    workers = min(len(configs), max_workers or os.cpu_count() or 1)
+    if executor == "thread":
+        state = _PacketState(frame, item_codes, n_items)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(state.row, configs))
+
+    arrays = {
+        "codes": frame.codes,
+        "value": frame.value,
+        "regime_total": frame.regime_total,
+        "rho_global_pre": frame.rho_global_pre,
+        "rho_local_pre": frame.rho_local_pre,
+        "item_codes": item_codes,
+    }
+    with SharedArrays(arrays) as shared:
+        pool: Executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_process_worker,
+            initargs=(shared.spec, frame.total, frame.regimes, n_items, frame.backend),
+        )
+        with pool:
+            return list(pool.map(_process_row, configs))
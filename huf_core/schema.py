@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Columns with few distinct values per table (repeated on every row by the adapters)
+COMPACT_CATEGORICAL_COLUMNS: Tuple[str, ...] = ("regime_id", "inputs_ref", "method_ref")
+
+
+def compact_elements(elements: pd.DataFrame, float32: bool = False) -> pd.DataFrame:
+    """
+    Compact element schema: regime_id / inputs_ref / method_ref become categoricals
+    (dictionary-encoded: one small integer code per row plus the distinct strings),
+    and value optionally float32.
+
+    HUFCore accepts the result natively and produces the same artifacts as for the
+    plain table; float32 values are upcast and every reduction accumulates in
+    float64. element_id and trace_path are unique per row and stay as they are.
+    """
+    out = elements.copy(deep=False)
+    for col in COMPACT_CATEGORICAL_COLUMNS:
+        if col in out.columns:
+            out[col] = canonical_categorical(out[col])
+    if float32:
+        out["value"] = out["value"].astype(np.float32)
+    return out
+
+
+def canonical_categorical(col: pd.Series) -> pd.Series:
+    """
+    Categorical with sorted, all-observed categories. Grouping and factorizing a
+    canonical categorical gives the same order as the plain string column, which
+    keeps artifact row order identical across schemas.
+    """
+    if not isinstance(col.dtype, pd.CategoricalDtype):
+        # sorted categories and no unused ones by construction
+        return col.astype("category")
+    cat = col.cat.remove_unused_categories()
+    cats = cat.cat.categories
+    if not cats.is_monotonic_increasing:
+        cat = cat.cat.reorder_categories(cats.sort_values())
+    return cat.cat.as_unordered()
+
+
+def is_categorical(col: Any) -> bool:
+    return isinstance(getattr(col, "dtype", None), pd.CategoricalDtype)
+
+
+def plain_values(col: pd.Series) -> pd.Series:
+    """Decode a categorical column back to its category dtype (no-op otherwise)."""
+    if is_categorical(col):
+        return col.astype(col.cat.categories.dtype)
+    return col
+
+
+def take_values(col: pd.Series, rows: np.ndarray) -> np.ndarray:
+    """
+    col.to_numpy()[rows] without decoding the whole column: a categorical gathers
+    its codes first and only looks up the selected rows' categories.
+    """
+    if is_categorical(col):
+        return col.cat.categories.to_numpy()[col.cat.codes.to_numpy()[rows]]
+    return col.to_numpy()[rows]
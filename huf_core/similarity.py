@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .engine import descending_order
+
+# popcount of every byte value (np.bitwise_count needs numpy >= 2)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+_BLOCK = 1 << 22  # elements per chunk of the pairwise kernels (bounds the S x S x block temporaries)
+
+
+def as_bitsets(masks: np.ndarray) -> np.ndarray:
+    """(S x N) boolean membership matrix -> (S x ceil(N/8)) packed uint8 bitsets."""
+    masks = np.atleast_2d(np.asarray(masks, dtype=bool))
+    return np.packbits(masks, axis=1)
+
+
+def jaccard_matrix(sets: np.ndarray) -> np.ndarray:
+    """
+    Pairwise Jaccard of S sets in one call.
+
+    sets is an (S x N) boolean membership matrix over the same element codes, or
+    its packed form from as_bitsets. Counts are exact integers (popcount of
+    AND / OR), so the result does not depend on chunking. Two empty sets -> 1.0.
+    """
+    bits = np.atleast_2d(sets)
+    if bits.dtype == bool:
+        bits = as_bitsets(bits)
+    s = bits.shape[0]
+    inter = np.zeros((s, s), dtype=np.int64)
+    union = np.zeros((s, s), dtype=np.int64)
+    step = max(1, _BLOCK // max(1, s * s))
+    for lo in range(0, bits.shape[1], step):
+        blk = bits[:, lo:lo + step]
+        inter += _POPCOUNT[blk[:, None, :] & blk[None, :, :]].sum(axis=2)
+        union += _POPCOUNT[blk[:, None, :] | blk[None, :, :]].sum(axis=2)
+    out = np.ones((s, s), dtype=np.float64)
+    np.divide(inter, union, out=out, where=union > 0)
+    return out
+
+
+def jaccard_codes(a: np.ndarray, b: np.ndarray) -> float:
+    """Jaccard of two sorted arrays of unique integer element codes (merge, no hashing)."""
+    if a.size == 0 and b.size == 0:
+        return 1.0
+    inter = np.intersect1d(a, b, assume_unique=True).size
+    return inter / (a.size + b.size - inter)
+
+
+def rank_rows(x: np.ndarray) -> np.ndarray:
+    """Average ranks (1-based, ties share their mean rank) within each row of x."""
+    x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+    return pd.DataFrame(x).rank(axis=1, method="average").to_numpy(dtype=np.float64)
+
+
+def spearman_matrix(x: np.ndarray) -> np.ndarray:
+    """
+    Pairwise Spearman rank correlation between the rows of x (S x M): Pearson of
+    the row ranks. A row with constant values correlates 0.0 with everything
+    (as spearman_rank_corr does); identical rows give exactly 1.0.
+    """
+    r = rank_rows(x)
+    r = r - r.mean(axis=1, keepdims=True)
+    cov = r @ r.T
+    var = np.diag(cov)
+    den = np.sqrt(np.outer(var, var))
+    out = np.zeros_like(cov)
+    np.divide(cov, den, out=out, where=den > 0)
+    return np.clip(out, -1.0, 1.0)
+
+
+def _tied_pairs(counts: np.ndarray) -> int:
+    return int((counts * (counts - 1) // 2).sum())
+
+
+def _run_lengths(change: np.ndarray) -> np.ndarray:
+    """Lengths of the runs in a sorted sequence, given where neighbours differ."""
+    bounds = np.concatenate(([0], np.flatnonzero(change) + 1, [change.size + 1]))
+    return np.diff(bounds)
+
+
+def _inversions(r: np.ndarray) -> int:
+    """Pairs i < j with r[i] > r[j] for integer codes r (bottom-up merge sort, one vectorized pass per level)."""
+    r = np.asarray(r, dtype=np.int64)
+    n = r.size
+    k = int(r.max()) + 1 if n else 1
+    pos = np.arange(n, dtype=np.int64)
+    inv = 0
+    width = 1
+    while width < n:
+        pair = pos // (2 * width)
+        right = (pos // width) % 2 == 1
+        keys = pair * k + r
+        left = keys[~right]  # sorted: each left block is sorted, blocks in pair order
+        end = np.searchsorted(left, (pair[right] + 1) * k, side="left")
+        inv += int((end - np.searchsorted(left, keys[right], side="right")).sum())
+        r = np.sort(keys) - pair * k  # pair blocks stay in place
+        width *= 2
+    return inv
+
+
+def kendall_matrix(x: np.ndarray) -> np.ndarray:
+    """
+    Pairwise Kendall tau-b between the rows of x (S x M), over all M(M-1)/2
+    column pairs. Each pair of rows uses Knight's O(M log M) method: sort by
+    (row i, row j), count the discordant pairs as inversions of row j, and correct
+    for ties from the tie-group sizes, so memory stays O(M) however many columns.
+    """
+    x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+    s, m = x.shape
+    n0 = m * (m - 1) // 2
+    codes = []
+    untied = np.zeros(s, dtype=np.int64)
+    for i in range(s):
+        _, inverse, counts = np.unique(x[i], return_inverse=True, return_counts=True)
+        codes.append(inverse.reshape(-1).astype(np.int64))
+        untied[i] = n0 - _tied_pairs(counts)
+    out = np.diag((untied > 0).astype(np.float64))
+    for i in range(s):
+        for j in range(i + 1, s):
+            if untied[i] == 0 or untied[j] == 0:
+                continue
+            order = np.lexsort((codes[j], codes[i]))
+            ci, cj = codes[i][order], codes[j][order]
+            joint = _tied_pairs(_run_lengths((np.diff(ci) != 0) | (np.diff(cj) != 0)))
+            num = untied[i] + untied[j] - n0 + joint - 2 * _inversions(cj)
+            out[i, j] = out[j, i] = num / np.sqrt(float(untied[i]) * float(untied[j]))
+    return np.clip(out, -1.0, 1.0)
+
+
+def topk_rank_corr(x: np.ndarray, k: int) -> np.ndarray:
+    """
+    Stability-packet regime correlation of every row of x (S x M) against row 0.
+
+    Row 0's top-k columns form the comparison set; each row keeps only its own
+    top-k values there (the rest count as 0.0), then Spearman against row 0.
+    """
+    x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+    k = min(int(k), x.shape[1])
+    order = np.argsort(-x, axis=1, kind="stable")[:, :k]
+    own = np.zeros(x.shape, dtype=bool)
+    np.put_along_axis(own, order, True, axis=1)
+    cols = descending_order(x[0])[:k]
+    sub = np.where(own, x, 0.0)[:, cols]
+    return spearman_matrix(sub)[0]
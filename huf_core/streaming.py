@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+import csv
+import heapq
+import json
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .core import HUFConfig, make_run_stamp
+from .artifacts import ACTIVE_SET_FIELDS, trace_path_list
+from .compression import compressed_name, open_text
+from .engine import exclusion_mask
+from .io import SerializedTable, write_artifacts
+
+ChunkSource = Union[str, Path, Callable[[], Iterable[pd.DataFrame]], Iterable[pd.DataFrame]]
+
+_STRING_COLUMNS = ("element_id", "regime_id", "trace_path", "inputs_ref", "method_ref")
+_SPILL_COLUMNS = (
+    "element_id", "regime_id", "value", "rho_global_pre", "rho_local_pre",
+    "trace_path", "inputs_ref", "method_ref",
+)
+
+
+def iter_element_chunks(source: ChunkSource, chunksize: int = 1_000_000) -> Iterator[pd.DataFrame]:
+    """
+    Yield element chunks from:
+      - a .csv / .tsv / .jsonl path (pandas chunked readers)
+      - a .parquet path (row batches; requires pyarrow)
+      - a zero-argument callable returning a fresh iterable of DataFrames
+      - a re-iterable collection of DataFrames (list, tuple, ...)
+    The streaming cycle reads its source twice, so one-shot iterators are rejected.
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        suffix = path.suffix.lower()
+        if suffix in (".csv", ".tsv"):
+            yield from pd.read_csv(
+                path,
+                sep="\t" if suffix == ".tsv" else ",",
+                chunksize=chunksize,
+                dtype={c: str for c in _STRING_COLUMNS},
+            )
+        elif suffix == ".jsonl":
+            yield from pd.read_json(path, lines=True, chunksize=chunksize, dtype={c: str for c in _STRING_COLUMNS})
+        elif suffix == ".parquet":
+            try:
+                import pyarrow.parquet as pq
+            except Exception as e:  # pragma: no cover
+                raise RuntimeError("pyarrow is required to stream Parquet element tables") from e
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+        else:
+            raise ValueError("Supported element files: .csv, .tsv, .jsonl, .parquet")
+        return
+    if callable(source):
+        yield from source()
+        return
+    if iter(source) is source:
+        raise TypeError("streaming needs two passes: pass a path, a list of chunks, or a callable returning a fresh iterator")
+    yield from source
+
+
+def _checked(chunk: pd.DataFrame) -> pd.DataFrame:
+    required = {"element_id", "regime_id", "value"}
+    missing = required - set(chunk.columns)
+    if missing:
+        raise ValueError(f"elements missing columns: {sorted(missing)}")
+    if (chunk["value"] < 0).any():
+        raise ValueError("value must be nonnegative")
+    if chunk["regime_id"].isna().any():
+        raise ValueError("regime_id must not be null")
+    # regime keys as str from the start: the spill runs are re-read as str, so
+    # int regimes (in-memory chunks, Parquet) must key the totals the same way
+    return chunk.assign(regime_id=chunk["regime_id"].astype(str))
+
+
+def _accumulate(acc: Dict[Any, float], keys: pd.Series, weights: Any) -> None:
+    sums = pd.Series(np.asarray(weights, dtype=np.float64), index=keys.to_numpy()).groupby(level=0, sort=False).sum()
+    for k, v in sums.items():
+        acc[k] = acc.get(k, 0.0) + float(v)
+
+
+def _spill_rows(path: Path, buffer_rows: int) -> Iterator[tuple]:
+    for part in pd.read_csv(
+        path,
+        chunksize=buffer_rows,
+        dtype={c: str for c in _STRING_COLUMNS},
+        keep_default_na=False,
+        float_precision="round_trip",
+    ):
+        yield from part.itertuples(index=False, name=None)
+
+
+def _merged_runs(runs: List[Path], buffer_rows: int, fan_in: int) -> Iterator[tuple]:
+    """
+    Rows of all spill runs, value descending. At most fan_in runs are open at once
+    and they share buffer_rows between them; more runs are first merged group by
+    group into intermediate runs (ties keep run order, as in a single merge).
+    """
+    per_run = max(1, buffer_rows // max(1, min(len(runs), fan_in)))
+    level = 0
+    while len(runs) > fan_in:
+        merged: List[Path] = []
+        for start in range(0, len(runs), fan_in):
+            group = runs[start:start + fan_in]
+            out = group[0].with_name(f"merge_{level}_{len(merged):05d}.csv")
+            with out.open("w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(_SPILL_COLUMNS)
+                writer.writerows(heapq.merge(*(_spill_rows(r, per_run) for r in group), key=lambda row: -row[2]))
+            for r in group:
+                r.unlink()
+            merged.append(out)
+        runs = merged
+        level += 1
+    return heapq.merge(*(_spill_rows(r, per_run) for r in runs), key=lambda row: -row[2])
+
+
+def stream_cycle(
+    source: ChunkSource,
+    config: HUFConfig,
+    out_dir: Path,
+    dataset_id: str,
+    chunksize: int = 1_000_000,
+    code_fingerprint: str = "huf_core_v1",
+    spill_dir: Optional[Path] = None,
+    buffer_rows: int = 50_000,
+    compression: Optional[str] = None,
+    compress_threads: int = 0,
+    merge_fan_in: int = 64
+) -> Dict[str, Any]:
+    """
+    Out-of-core HUF cycle that writes the standard artifact files as it goes.
+
+    Pass 1 over the source gathers the global and per-regime totals.
+    Pass 2 applies exclusion (which only needs those totals), accumulates kept and
+    discarded totals per regime, and spills each chunk's kept rows, sorted by value,
+    to a temporary run file. A k-way merge of the runs then emits the ranked
+    active set and trace report with rho_global_post = value / kept_total.
+    The merge opens at most merge_fan_in runs at once, which share a read buffer
+    of buffer_rows rows; with more runs (about n_elements / chunksize) it first
+    merges them in rounds into larger intermediate runs.
+
+    Peak memory is O(chunksize + n_regimes + buffer_rows); the element count only
+    adds merge rounds (disk I/O), not memory. Rank order matches cycle() except among exactly tied values.
+    regime_id is read as str (int regimes become "0", "1", ...).
+    The merged tables are staged in the spill directory and handed to
+    io.write_artifacts (CSV layout, optional compression), so the run folder gets
+    the same atomic commit and manifest.json as an in-memory cycle.
+    Returns the in-memory artifacts that are small (coherence_map, error_budget,
+    run_stamp) plus the kept/excluded counts.
+    """
+    out_dir = Path(out_dir)
+    compressed_name("", compression)  # validates the codec before two passes
+    if merge_fan_in < 2:
+        raise ValueError("merge_fan_in must be >= 2")
+
+    # Pass 1: totals
+    total = 0.0
+    regime_total: Dict[Any, float] = {}
+    n_elements = 0
+    for chunk in iter_element_chunks(source, chunksize):
+        chunk = _checked(chunk)
+        value = chunk["value"].to_numpy(dtype=np.float64)
+        total += float(value.sum())
+        _accumulate(regime_total, chunk["regime_id"], value)
+        n_elements += len(chunk)
+    if total <= 0:
+        raise ValueError("Cannot normalize: sum <= 0")
+
+    # Pass 2: exclusion + per-regime accounting, spill sorted kept runs
+    rho_pre: Dict[Any, float] = {}
+    rho_discarded: Dict[Any, float] = {}
+    kept_value: Dict[Any, float] = {}
+    discarded_value = 0.0
+    kept_total = 0.0
+    n_kept = 0
+
+    with tempfile.TemporaryDirectory(prefix="huf_stream_", dir=spill_dir) as tmp:
+        runs: List[Path] = []
+        for chunk in iter_element_chunks(source, chunksize):
+            chunk = _checked(chunk)
+            value = chunk["value"].to_numpy(dtype=np.float64)
+            rtot = chunk["regime_id"].map(regime_total).to_numpy(dtype=np.float64)
+            rho_g = value / total
+            rho_l = np.zeros(value.shape, dtype=np.float64)
+            np.divide(value, rtot, out=rho_l, where=rtot > 0)
+            excluded = np.asarray(exclusion_mask(config, rho_g, rho_l), dtype=bool)
+
+            _accumulate(rho_pre, chunk["regime_id"], rho_g)
+            _accumulate(rho_discarded, chunk["regime_id"], np.where(excluded, rho_g, 0.0))
+            _accumulate(kept_value, chunk["regime_id"], np.where(excluded, 0.0, value))
+            discarded_value += float(value[excluded].sum())
+            kept_total += float(value[~excluded].sum())
+
+            keep = ~excluded
+            if not keep.any():
+                continue
+            n_kept += int(keep.sum())
+            spill = pd.DataFrame({
+                "element_id": chunk["element_id"].to_numpy()[keep],
+                "regime_id": chunk["regime_id"].to_numpy()[keep],
+                "value": value[keep],
+                "rho_global_pre": rho_g[keep],
+                "rho_local_pre": rho_l[keep],
+            })
+            for col in ("trace_path", "inputs_ref", "method_ref"):
+                spill[col] = chunk[col].to_numpy()[keep] if col in chunk.columns else ""
+            spill = spill.iloc[np.argsort(-spill["value"].to_numpy(), kind="stable")]
+            run = Path(tmp) / f"run_{len(runs):05d}.csv"
+            spill.to_csv(run, index=False, columns=list(_SPILL_COLUMNS))
+            runs.append(run)
+
+        if n_kept == 0:
+            raise ValueError("Exclusion removed all elements; invalid run")
+        if kept_total <= 0:
+            raise ValueError("Cannot normalize: sum <= 0")
+        discarded_budget_global = discarded_value / total
+
+        # Merge: ranked active set + trace report
+        local_unity: Dict[Any, float] = {}
+        tau = float(config.tau)
+        inputs_refs = set()
+        active_path = Path(tmp) / compressed_name("artifact_2_active_set.csv", compression)
+        trace_path = Path(tmp) / compressed_name("artifact_3_trace_report.jsonl", compression)
+        merged = _merged_runs(runs, buffer_rows, merge_fan_in)
+        with open_text(active_path, "w", threads=compress_threads) as active_f, \
+                open_text(trace_path, "w", threads=compress_threads) as trace_f:
+            block: List[tuple] = []
+            rank = 0
+            header = True
+            for eid, rid, v, g_pre, l_pre, tpath, iref, mref in merged:
+                rank += 1
+                g_post = v / kept_total
+                rkept = kept_value[rid]
+                l_post = v / rkept if rkept > 0 else 0.0
+                local_unity[rid] = local_unity.get(rid, 0.0) + l_post
+                if iref:
+                    inputs_refs.add(str(iref))
+                block.append((rank, str(eid), str(rid), g_post, g_pre, l_pre, l_post, v, tau, config.exclusion))
+                trace_f.write(json.dumps({
+                    "item_id": str(eid),
+                    "regime_path": trace_path_list(tpath, rid, eid),
+                    "rho_global_post": g_post,
+                    "inputs_ref": str(iref),
+                    "method_ref": str(mref),
+                    "discarded_budget_global": discarded_budget_global,
+                }, ensure_ascii=False) + "\n")
+                if len(block) >= buffer_rows:
+                    pd.DataFrame(block, columns=list(ACTIVE_SET_FIELDS)).to_csv(active_f, header=header, index=False)
+                    header = False
+                    block = []
+            if block or header:
+                pd.DataFrame(block, columns=list(ACTIVE_SET_FIELDS)).to_csv(active_f, header=header, index=False)
+
+        regimes = sorted(regime_total)
+        coherence_map = pd.DataFrame({
+            "regime_id": regimes,
+            "rho_global_pre": [rho_pre[r] for r in regimes],
+            "rho_global_post": [kept_value[r] / kept_total for r in regimes],
+            "rho_discarded_pre": [rho_discarded[r] for r in regimes],
+            "local_unity_post": [local_unity.get(r, 0.0) for r in regimes],
+        })
+        coherence_map["local_unity_ok_post"] = (coherence_map["local_unity_post"].abs() - 1.0).abs() < 1e-9
+        coherence_map["global_discarded_budget"] = discarded_budget_global
+        coherence_map = coherence_map.sort_values("rho_global_pre", ascending=False).reset_index(drop=True)
+
+        error_budget = {
+            "budget_type": config.budget_type,
+            "discarded_budget_global": float(discarded_budget_global),
+            "frame": "energy" if config.budget_type == "energy" else "mass",
+            "measured_error": None,
+            "measured_error_note": "No error metric callback provided (empirical error is domain-specific).",
+        }
+        stamp = make_run_stamp(dataset_id, config, code_fingerprint).__dict__
+        write_artifacts(
+            out_dir,
+            {
+                "coherence_map": coherence_map,
+                "active_set": SerializedTable(active_path, rows=n_kept),
+                "trace_report": SerializedTable(trace_path, rows=n_kept, inputs_ref=tuple(sorted(inputs_refs))),
+                "error_budget": error_budget,
+                "run_stamp": stamp,
+            },
+            compression=compression,
+            compress_threads=compress_threads,
+        )
+
+    return {
+        "coherence_map": coherence_map,
+        "error_budget": error_budget,
+        "run_stamp": stamp,
+        "elements": n_elements,
+        "kept": n_kept,
+    }
+
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .engine import ColumnarFrame
+
+
+class ThresholdSweep:
+    """
+    Sort-once threshold sweep.
+
+    Exclusion is a monotone threshold on one frame (rho_global_pre for global/dual,
+    rho_local_pre for local), so the active set at tau is
+        always_kept  U  {candidates with rho >= tau}
+    where always_kept is empty except for dual exclusion (rho_local_pre >= tau_local).
+    Sorting the candidates once turns every tau into a searchsorted lookup:
+    O(n log n) to build, O(log n) per tau.
+    """
+
+    def __init__(self, frame: ColumnarFrame, exclusion: str, tau_local: Optional[float] = None):
+        x, always = threshold_frame(frame, exclusion, tau_local)
+
+        self.exclusion = exclusion
+        self.n = int(x.size)
+        self.total = frame.total
+        self.frame_sorted = np.sort(x)  # near-threshold band is counted over every element
+
+        cand = ~always
+        order = np.argsort(x[cand], kind="stable")
+        self.cand_x = x[cand][order]
+        self.cand_cum_value = np.concatenate([[0.0], np.cumsum(frame.value[cand][order])])
+        positive = frame.value[cand][order] > 0
+        self.cand_positive_x = self.cand_x[positive]
+        self.n_always = int(always.sum())
+        self.n_always_positive = int((always & (frame.value > 0)).sum())
+
+    def evaluate(self, tau_values: Sequence[float]) -> Dict[str, np.ndarray]:
+        """Vectorized exclusion statistics for every tau (rho < tau is excluded)."""
+        tau = np.asarray(tau_values, dtype=np.float64)
+        k = np.searchsorted(self.cand_x, tau, side="left")
+        active_count = self.n - k
+        positive_kept = self.n_always_positive + (
+            self.cand_positive_x.size - np.searchsorted(self.cand_positive_x, tau, side="left")
+        )
+        discarded = self.cand_cum_value[k] / self.total if self.total > 0 else np.zeros(tau.shape)
+        near = near_threshold_counts(self.frame_sorted, tau)
+        return {
+            "tau": tau,
+            "active_count": active_count.astype(np.int64),
+            "discarded_budget_global": discarded,
+            "near_threshold_count": near.astype(np.int64),
+            # cycle() raises when nothing is kept or the kept mass cannot be normalized
+            "invalid": (active_count == 0) | (positive_kept == 0),
+        }
+
+    def curve(self) -> pd.DataFrame:
+        """
+        Exact piecewise-constant stability curve.
+
+        Every distinct candidate rho is a breakpoint. Row i covers taus in the half-open
+        interval (tau_from, tau_to]; the first row starts at -inf and the last row, which
+        excludes every candidate, runs to +inf.
+        """
+        breaks = np.unique(self.cand_x)
+        lower = np.concatenate([[-np.inf], breaks])
+        upper = np.concatenate([breaks, [np.inf]])
+        # taus in (lower, upper] exclude exactly the candidates with rho <= lower
+        k = np.searchsorted(self.cand_x, lower, side="right")
+        active_count = self.n - k
+        positive_kept = self.n_always_positive + (
+            self.cand_positive_x.size - np.searchsorted(self.cand_positive_x, lower, side="right")
+        )
+        discarded = self.cand_cum_value[k] / self.total if self.total > 0 else np.zeros(k.shape)
+        return pd.DataFrame({
+            "tau_from": lower,
+            "tau_to": upper,
+            "active_count": active_count.astype(np.int64),
+            "discarded_budget_global": discarded,
+            "invalid": (active_count == 0) | (positive_kept == 0),
+        })
+
+
+def nested_jaccard(base_count: int, counts: np.ndarray) -> np.ndarray:
+    """Jaccard between nested active sets is |smaller| / |larger|."""
+    counts = np.asarray(counts, dtype=np.float64)
+    hi = np.maximum(counts, base_count)
+    lo = np.minimum(counts, base_count)
+    return np.where(hi > 0, lo / np.maximum(hi, 1), 1.0)
+
+
+def near_threshold_counts(frame_values: np.ndarray, tau_values: Sequence[float]) -> np.ndarray:
+    """Count elements with 0.9*tau <= rho <= 1.1*tau for each tau (frame_values sorted ascending)."""
+    tau = np.asarray(tau_values, dtype=np.float64)
+    return (
+        np.searchsorted(frame_values, 1.1 * tau, side="right")
+        - np.searchsorted(frame_values, 0.9 * tau, side="left")
+    )
+
+
+def threshold_frame(frame: ColumnarFrame, exclusion: str, tau_local: Optional[float] = None):
+    """(swept rho, always-kept mask) for an exclusion mode; see ThresholdSweep."""
+    if exclusion == "global":
+        return frame.rho_global_pre, np.zeros(frame.value.shape, dtype=bool)
+    if exclusion == "local":
+        return frame.rho_local_pre, np.zeros(frame.value.shape, dtype=bool)
+    if exclusion == "dual":
+        if tau_local is None:
+            raise ValueError("dual exclusion requires tau_local")
+        return frame.rho_global_pre, frame.rho_local_pre >= float(tau_local)
+    raise ValueError("exclusion must be 'global', 'local', or 'dual'")
+
+
+_SELECT_LEAF = 4096
+_SELECT_RADIX_BITS = 12
+
+
+def retained_target_thresholds(x: np.ndarray, weight: np.ndarray, need: np.ndarray) -> np.ndarray:
+    """
+    For each required mass, the largest x-value t with sum(weight[x >= t]) >= need.
+
+    Equivalent to sorting x descending, cumsumming weight and taking the x at the
+    first position where the cumsum reaches need (the smallest x when no position
+    does), without the full sort: each pass buckets x by its leading float bits,
+    sums weight per bucket (bincount), brackets every target to one bucket from
+    the cumulative bucket mass and recurses into that bucket only. Expected O(n);
+    targets that land in the same bucket share the work.
+
+    Bucket sums round differently from the sequential sorted cumsum, so a target
+    within rounding distance of a cumsum breakpoint (e.g. 1.0 against a total
+    that sums to 1 +- ulps) is flagged and resolved by the exact sort + cumsum
+    rule; the result is always the one that rule gives.
+    """
+    need = np.asarray(need, dtype=np.float64)
+    if x.size == 0:
+        raise ValueError("no elements in the swept frame")
+    out = np.empty(need.shape, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64) + 0.0  # also folds -0.0 into +0.0 for the bit buckets
+    if (x < 0).any():
+        raise ValueError("swept values must be nonnegative")
+    w = np.asarray(weight, dtype=np.float64)
+    # error bound of either summation order, with margin
+    tol = 4.0 * x.size * np.finfo(np.float64).eps * max(float(np.abs(w).sum()), float(np.abs(need).max(initial=0.0)))
+    exact = np.zeros(need.shape, dtype=bool)
+    _select(x, w, 0.0, need, np.arange(need.size), out, tol, exact)
+    if exact.any():
+        order = np.argsort(-x, kind="stable")
+        cum = np.cumsum(w[order])
+        k = np.searchsorted(cum, need[exact], side="left")
+        out[exact] = x[order][np.minimum(k, x.size - 1)]
+    return out
+
+
+def _near(bounds: np.ndarray, need: np.ndarray, tol: float) -> np.ndarray:
+    # targets within tol of any of the (sorted) cumulative bounds
+    k = np.searchsorted(bounds, need)
+    lo = np.abs(need - bounds[np.maximum(k - 1, 0)])
+    hi = np.abs(bounds[np.minimum(k, bounds.size - 1)] - need)
+    return np.minimum(lo, hi) <= tol
+
+
+def _select(
+    x: np.ndarray,
+    w: np.ndarray,
+    above: float,
+    need: np.ndarray,
+    idx: np.ndarray,
+    out: np.ndarray,
+    tol: float,
+    exact: np.ndarray
+) -> None:
+    # `above` is the mass of every element larger than all of x (already retained);
+    # targets near a breakpoint are marked in `exact` for the sorted-cumsum rule
+    if x.size <= _SELECT_LEAF:
+        order = np.argsort(-x, kind="stable")
+        cum = above + np.cumsum(w[order])
+        k = np.searchsorted(cum, need[idx], side="left")
+        out[idx] = x[order][np.minimum(k, x.size - 1)]
+        exact[idx] |= _near(np.concatenate(([above], cum)), need[idx], tol)
+        return
+    # For nonnegative floats the IEEE-754 bit pattern orders like the value, so
+    # its leading bits are a monotone bucket index (one radix step, no comparisons).
+    bits = x.view(np.int64)
+    base, top = int(bits.min()), int(bits.max())
+    if base == top:
+        out[idx] = x[0]  # one tied block: it is kept whole
+        exact[idx] |= _near(np.array([above, above + float(w.sum())]), need[idx], tol)
+        return
+    shift = max(0, (top - base).bit_length() - _SELECT_RADIX_BITS)
+    bins = (bits - base) >> shift
+
+    counts = np.bincount(bins, minlength=1)
+    mass = np.bincount(bins, weights=w, minlength=1)
+    nonempty = np.flatnonzero(counts)[::-1]  # descending x
+    cum = above + np.cumsum(mass[nonempty])
+    j = np.minimum(np.searchsorted(cum, need[idx], side="left"), nonempty.size - 1)
+    hit = np.unique(j)
+    wanted = np.zeros(counts.size, dtype=bool)
+    wanted[nonempty[hit]] = True
+    pick = np.flatnonzero(wanted[bins])  # one gather pass for every bracketed bucket
+    pick_bins = bins[pick]
+    for jj in hit:
+        sel = pick[pick_bins == nonempty[jj]]
+        _select(x[sel], w[sel], above if jj == 0 else float(cum[jj - 1]), need, idx[j == jj], out, tol, exact)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping
+
+import numpy as np
+import pandas as pd
+
+from .engine import _safe_ratio
+
+
+@dataclass(frozen=True)
+class CycleSeries:
+    """
+    Successive reporting cycles of one element universe, as an aligned matrix.
+
+    Elements are keyed by (regime_id, element_id) across all cycles; values[t, j]
+    is element j's value in cycle t (0.0 where it did not report). Storage is one
+    dense (cycles x elements) matrix in `dtype` (float32 halves it; shares are
+    always computed in float64), plus per-cycle and per-regime totals.
+    """
+    cycles: pd.Index             # sorted cycle labels (row order)
+    element_id: np.ndarray       # per column
+    regime_id: np.ndarray        # per column
+    regime_codes: np.ndarray     # per column, into regimes
+    regimes: pd.Index            # sorted regime ids
+    values: np.ndarray           # (cycles x elements)
+    total: np.ndarray            # value total per cycle (float64)
+    regime_total: np.ndarray     # (cycles x regimes) value totals (float64)
+
+    @classmethod
+    def from_frame(cls, elements: pd.DataFrame, cycle_col: str = "cycle", dtype: Any = np.float64) -> "CycleSeries":
+        """
+        Build from one long table with columns cycle, element_id, regime_id, value.
+        Duplicate (cycle, regime_id, element_id) rows are summed (in float64, per
+        cycle) straight into a preallocated `dtype` matrix, so peak memory is the
+        stored matrix plus one float64 row.
+        """
+        required = {cycle_col, "element_id", "regime_id", "value"}
+        missing = required - set(elements.columns)
+        if missing:
+            raise ValueError(f"elements missing columns: {sorted(missing)}")
+        value = elements["value"].to_numpy(dtype=np.float64)
+        if (value < 0).any():
+            raise ValueError("value must be nonnegative")
+
+        c_codes, cycles = pd.factorize(elements[cycle_col], sort=True)
+        keys = pd.MultiIndex.from_arrays([elements["regime_id"], elements["element_id"]])
+        k_codes, uniq = pd.factorize(keys, sort=True)
+        uniq = pd.MultiIndex.from_tuples(uniq, names=["regime_id", "element_id"]) if not isinstance(uniq, pd.MultiIndex) else uniq
+        regime_ids = uniq.get_level_values(0)
+        r_codes, regimes = pd.factorize(regime_ids, sort=True)
+
+        t, n, r = len(cycles), len(uniq), len(regimes)
+        # one cycle at a time into the preallocated matrix: the float64 sums never
+        # exist as a full (t x n) temporary, so float32 storage halves peak memory
+        values = np.zeros((t, n), dtype=dtype)
+        total = np.zeros(t, dtype=np.float64)
+        order = np.argsort(c_codes, kind="stable")
+        bounds = np.searchsorted(c_codes[order], np.arange(t + 1))
+        for i in range(t):
+            rows = order[bounds[i]:bounds[i + 1]]
+            row = np.bincount(k_codes[rows], weights=value[rows], minlength=n)
+            values[i] = row
+            total[i] = row.sum()
+        regime_total = np.bincount(c_codes * r + r_codes[k_codes], weights=value, minlength=t * r).reshape(t, r)
+        return cls(
+            cycles=pd.Index(cycles, name=cycle_col),
+            element_id=uniq.get_level_values(1).to_numpy(dtype=object),
+            regime_id=regime_ids.to_numpy(dtype=object),
+            regime_codes=r_codes,
+            regimes=pd.Index(regimes, name="regime_id"),
+            values=values,
+            total=total,
+            regime_total=regime_total,
+        )
+
+    @classmethod
+    def from_tables(cls, tables: Mapping[Any, pd.DataFrame], dtype: Any = np.float64) -> "CycleSeries":
+        """Build from {cycle label: element table} (e.g. one adapter run per reporting cycle)."""
+        frames = [t[["element_id", "regime_id", "value"]].assign(cycle=c) for c, t in tables.items()]
+        return cls.from_frame(pd.concat(frames, ignore_index=True), dtype=dtype)
+
+    @property
+    def n_cycles(self) -> int:
+        return len(self.cycles)
+
+    def rho(self, t: int) -> np.ndarray:
+        """Global shares of cycle t (float64)."""
+        v = self.values[t].astype(np.float64)
+        return v / self.total[t] if self.total[t] > 0 else np.zeros_like(v)
+
+    def regime_rho(self) -> np.ndarray:
+        """(cycles x regimes) global regime shares."""
+        return _safe_ratio(self.regime_total, np.broadcast_to(self.total[:, None], self.regime_total.shape))
+
+    def element_drift(self, threshold: float) -> pd.DataFrame:
+        """
+        Element share shifts between consecutive cycles with |delta| >= threshold.
+
+        Only flagged rows are materialized (one vectorized pass per cycle pair), so
+        the output stays proportional to the drift, not to cycles x elements.
+        """
+        parts: List[Dict[str, Any]] = []
+        prev = self.rho(0) if self.n_cycles else None
+        for t in range(1, self.n_cycles):
+            cur = self.rho(t)
+            delta = cur - prev
+            idx = np.flatnonzero(np.abs(delta) >= threshold)
+            parts.append({
+                "cycle_from": np.full(idx.size, self.cycles[t - 1], dtype=object),
+                "cycle_to": np.full(idx.size, self.cycles[t], dtype=object),
+                "element_id": self.element_id[idx],
+                "regime_id": self.regime_id[idx],
+                "rho_from": prev[idx],
+                "rho_to": cur[idx],
+                "delta": delta[idx],
+            })
+            prev = cur
+        cols = ["cycle_from", "cycle_to", "element_id", "regime_id", "rho_from", "rho_to", "delta"]
+        if not parts:
+            return pd.DataFrame(columns=cols)
+        out = pd.concat([pd.DataFrame(p, columns=cols) for p in parts], ignore_index=True)
+        out["direction"] = np.where(out["delta"] > 0, "up", "down")
+        return out
+
+    def regime_drift(self, threshold: float) -> pd.DataFrame:
+        """Every regime's share shift between consecutive cycles, flagged where |delta| >= threshold."""
+        rho = self.regime_rho()
+        delta = np.diff(rho, axis=0)
+        t, r = delta.shape
+        out = pd.DataFrame({
+            "cycle_from": np.repeat(self.cycles[:-1].to_numpy(dtype=object), r),
+            "cycle_to": np.repeat(self.cycles[1:].to_numpy(dtype=object), r),
+            "regime_id": np.tile(self.regimes.to_numpy(dtype=object), t),
+            "rho_from": rho[:-1].ravel(),
+            "rho_to": rho[1:].ravel(),
+            "delta": delta.ravel(),
+        })
+        out["flagged"] = out["delta"].abs() >= threshold
+        return out
+
+
+def drift_log(elements: pd.DataFrame, threshold: float = 0.01, cycle_col: str = "cycle") -> Dict[str, pd.DataFrame]:
+    """
+    Drift artifacts for element tables keyed by (cycle, element_id, regime_id):
+      - "regime_drift": all regime share deltas between consecutive cycles (+ flagged)
+      - "element_drift": element share deltas with |delta| >= threshold
+    """
+    series = CycleSeries.from_frame(elements, cycle_col=cycle_col)
+    return {"regime_drift": series.regime_drift(threshold), "element_drift": series.element_drift(threshold)}
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import RecordTable
+
+REQUIRED_TRACE_FIELDS = ("item_id", "regime_path", "rho_global_post", "inputs_ref", "method_ref", "discarded_budget_global")
+REQUIRED_ARTIFACTS = ("coherence_map", "active_set", "trace_report", "error_budget", "run_stamp")
+VALIDATION_MODES = ("strict", "fast", "off")
+UNITY_TOL = 1e-9
+
+# Columns each columnar artifact frame must carry (the trace frame stores
+# trace_path + regime_id and derives regime_path per record)
+_TRACE_COLUMNS = ("item_id", "regime_id", "trace_path", "rho_global_post", "inputs_ref", "method_ref", "discarded_budget_global")
+_NONNEG_ACTIVE = ("rho_global_post", "rho_global_pre", "rho_local_pre", "rho_local_post", "value")
+
+
+def validate_artifacts(artifacts: Dict[str, Any], mode: str = "fast") -> None:
+    """
+    Check a cycle's artifacts; raises ValueError on the first violation.
+
+    mode:
+      - "off":    nothing is checked
+      - "fast":   artifact presence, then one array check per column: required
+                  columns present, rho/value columns float, finite and >= 0,
+                  rho_global_post sums to 1 (active set and trace) and
+                  rho_global_pre to 1 (coherence map) within UNITY_TOL,
+                  discarded_budget_global in [0, 1]
+      - "strict": "fast" plus every trace record built and checked field by field
+                  (regime_path must be a non-empty list)
+
+    Plain list-of-dict trace reports (no columns to check) are checked per record
+    in both "fast" and "strict".
+    """
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"validation must be one of {VALIDATION_MODES}")
+    if mode == "off":
+        return
+    for key in REQUIRED_ARTIFACTS:
+        if key not in artifacts:
+            raise ValueError(f"Missing required artifact: {key}")
+
+    disc = artifacts["error_budget"].get("discarded_budget_global")
+    if disc is not None and not 0.0 <= float(disc) <= 1.0:
+        raise ValueError(f"discarded_budget_global out of [0, 1]: {disc}")
+
+    cm = artifacts["coherence_map"]
+    if isinstance(cm, pd.DataFrame) and "rho_global_pre" in cm.columns:
+        _check_rho(cm, ("rho_global_pre",), "coherence_map")
+        _check_unity(cm["rho_global_pre"], "coherence_map rho_global_pre")
+
+    active = artifacts["active_set"]
+    if isinstance(active, RecordTable):
+        _check_columns(active.frame, active.fields, "active_set")
+        _check_rho(active.frame, _NONNEG_ACTIVE, "active_set")
+        _check_unity(active.frame["rho_global_post"], "active_set rho_global_post")
+
+    trace = artifacts["trace_report"]
+    if isinstance(trace, RecordTable):
+        missing = [f for f in REQUIRED_TRACE_FIELDS if f not in trace.fields]
+        if missing:
+            raise ValueError(f"Trace record missing field: {missing[0]}")
+        _check_columns(trace.frame, _TRACE_COLUMNS, "trace_report")
+        _check_rho(trace.frame, ("rho_global_post",), "trace_report")
+        _check_unity(trace.frame["rho_global_post"], "trace_report rho_global_post")
+        if mode == "strict":
+            _check_records(trace)
+    else:
+        _check_records(trace)
+
+
+def _check_columns(frame: pd.DataFrame, columns: Iterable[str], name: str) -> None:
+    missing = [c for c in columns if c not in frame.columns]
+    if missing:
+        raise ValueError(f"{name} missing columns: {missing}")
+
+
+def _check_rho(frame: pd.DataFrame, columns: Tuple[str, ...], name: str) -> None:
+    for col in columns:
+        x = frame[col].to_numpy()
+        if x.dtype.kind != "f":
+            raise ValueError(f"{name}.{col} must be float, got {x.dtype}")
+        if not np.isfinite(x).all():
+            raise ValueError(f"{name}.{col} has NaN/inf values")
+        if x.size and x.min() < 0:
+            raise ValueError(f"{name}.{col} has negative values")
+
+
+def _check_unity(col: pd.Series, name: str) -> None:
+    if len(col) and abs(float(col.sum()) - 1.0) > UNITY_TOL:
+        raise ValueError(f"{name} does not sum to 1 (sum={float(col.sum())!r})")
+
+
+def _check_records(records: Iterable[Dict[str, Any]]) -> None:
+    for rec in records:
+        for f in REQUIRED_TRACE_FIELDS:
+            if f not in rec:
+                raise ValueError(f"Trace record missing field: {f}")
+        path = rec["regime_path"]
+        if not isinstance(path, list) or not path:
+            raise ValueError(f"Trace record {rec['item_id']!r} has an empty regime_path")
@@ -112,17 +112,18 @@ def vector_db_results_to_elements(
 
     df["_reg"] = regimes
 
-    def make_element_id(r: pd.Series) -> str:
-        rid = str(r[cfg.id_field]).replace(" ", "_")
-        reg = str(r["_reg"]).replace(" ", "_")
-        return f"{reg}/id={rid}"
-
+    # Ids and trace paths are built from column lists in one pass (no per-row Series)
+    ids = df[cfg.id_field].tolist()
+    regs = df["_reg"].astype(str).tolist()
     elements = pd.DataFrame(
         {
-            "element_id": df.apply(make_element_id, axis=1),
-            "regime_id": df["_reg"].astype(str),
+            "element_id": [
+                f"{str(reg).replace(' ', '_')}/id={str(rid).replace(' ', '_')}" for reg, rid in zip(regs, ids)
+            ],
+            "regime_id": regs,
             "value": df["_score_nonneg"].astype(float),
-        }
+        },
+        index=df.index,
     )
 
     # Trace points back to the retrieval record (and optional extra fields)
@@ -133,22 +134,17 @@ def vector_db_results_to_elements(
         if c in df.columns and c not in (cfg.id_field, cfg.score_field)
     ]
 
-    trace: List[str] = []
-    for _, r in df.iterrows():
-        t = [
-            "VectorDBResults",
-            f"query={query_label}",
-            f"id={r[cfg.id_field]}",
-            f"score={float(r[cfg.score_field])}",
-        ]
-        if cfg.regime_field in df.columns:
-            t.append(f"{cfg.regime_field}={r[cfg.regime_field]}")
-        for c in kept_extras:
-            try:
-                t.append(f"{c}={r[c]}")
-            except Exception:
-                pass
-        trace.append(json.dumps(t))
+    tail_cols: List[List[Any]] = []
+    if cfg.regime_field in df.columns:
+        tail_cols.append([f"{cfg.regime_field}={v}" for v in df[cfg.regime_field].tolist()])
+    for c in kept_extras:
+        tail_cols.append([f"{c}={v}" for v in df[c].tolist()])
+    head = ["VectorDBResults", f"query={query_label}"]
+    scores_raw = df[cfg.score_field].astype(float).tolist()
+    trace: List[str] = [
+        json.dumps(head + [f"id={rid}", f"score={score}"] + list(tail))
+        for rid, score, *tail in zip(ids, scores_raw, *tail_cols)
+    ]
     elements["trace_path"] = trace
 
     inputs_ref = _file_fingerprint(path)
@@ -0,0 +1,74 @@
+"""Find and stream-read HUF artifact files, plain or compressed (no pandas required).
+
+`huf ... --compression gzip|zstd` writes artifact_2_active_set.csv.gz /
+artifact_3_trace_report.jsonl.zst etc. The helpers here pick the variant the run
+wrote (manifest.json decides when present) and decompress while reading, one
+row at a time, so the inspection scripts never hold a whole file in memory.
+.zst needs the optional `zstandard` package.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Optional, Set
+
+SUFFIXES = ("", ".gz", ".zst")
+MANIFEST = "manifest.json"
+
+
+def _manifest_names(folder: Path) -> Optional[Set[str]]:
+    try:
+        return set(json.loads((folder / MANIFEST).read_text(encoding="utf-8-sig"))["artifacts"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def find_artifact(base: Path, name: str) -> Optional[Path]:
+    """
+    base/name (or base/artifacts/name), plain or .gz / .zst: the variant listed in
+    that folder's manifest.json, else the only one present. Several variants
+    without a manifest are stale output of an earlier run and stop the script.
+    """
+    for folder in (base, base / "artifacts"):
+        listed = _manifest_names(folder)
+        if listed is not None:
+            hits = [name + s for s in SUFFIXES if name + s in listed]
+        else:
+            hits = [name + s for s in SUFFIXES if (folder / (name + s)).exists()]
+        if len(hits) > 1:
+            raise SystemExit(f"[error] {folder}: several variants of {name} ({', '.join(hits)}) and no manifest.json to pick one")
+        if hits and (folder / hits[0]).exists():
+            return folder / hits[0]
+    return None
+
+
+def open_artifact(path: Path) -> IO[str]:
+    """Text stream over an artifact, decompressing .gz / .zst on the fly (BOM-safe)."""
+    path = Path(path)
+    if path.suffix == ".gz":
+        raw: IO[bytes] = gzip.open(path, "rb")
+    elif path.suffix == ".zst":
+        try:
+            import zstandard
+        except ImportError:
+            raise SystemExit(f"[error] {path.name}: reading .zst artifacts needs `pip install zstandard`")
+        raw = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(path.open("rb"), closefd=True))
+    else:
+        return path.open("r", encoding="utf-8-sig", newline="")
+    return io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+
+
+def csv_header(path: Path) -> List[str]:
+    """Column names (first line only)."""
+    with open_artifact(path) as f:
+        return next(csv.reader(f), [])
+
+
+def iter_csv(path: Path) -> Iterator[Dict[str, str]]:
+    """Rows as dicts, streamed."""
+    with open_artifact(path) as f:
+        yield from csv.DictReader(f)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark the coherence-map build (artifact 1) as the regime count grows.
+
+Compares the old per-regime `groupby.apply(lambda ...)` reductions with the
+segment-sum implementation used by both cycle engines. The element count is
+fixed so the timings isolate the per-regime overhead.
+
+Usage:
+  python scripts/bench_coherence_map.py --elements 200000 --regimes 10 100 1000 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from huf_core import HUFConfig, HUFCore  # noqa: E402
+from huf_core import engine  # noqa: E402
+
+
+def _elements(n: int, regimes: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "element_id": np.arange(n).astype(str),
+        "regime_id": np.char.add("R", rng.integers(0, regimes, n).astype(str)),
+        "value": rng.pareto(1.5, n),
+    })
+
+
+def _legacy_coherence_map(df_all: pd.DataFrame, kept: pd.DataFrame, discarded_budget_global: float) -> pd.DataFrame:
+    reg_pre = df_all.groupby("regime_id")["rho_global_pre"].sum().rename("rho_global_pre")
+    reg_post = kept.groupby("regime_id").apply(lambda g: float(g["rho_local_post"].sum())).rename("local_unity_post")
+    reg_kept_share = kept.groupby("regime_id")["rho_global_post"].sum().rename("rho_global_post")
+    reg_discard = df_all.groupby("regime_id").apply(lambda g: float(g.loc[g["excluded"], "rho_global_pre"].sum())).rename("rho_discarded_pre")
+    out = pd.concat([reg_pre, reg_kept_share, reg_discard, reg_post], axis=1).fillna(0.0).reset_index()
+    out["local_unity_ok_post"] = (out["local_unity_post"].abs() - 1.0).abs() < 1e-9
+    out["global_discarded_budget"] = discarded_budget_global
+    return out.sort_values("rho_global_pre", ascending=False).reset_index(drop=True)
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Coherence-map scaling with regime count")
+    ap.add_argument("--elements", type=int, default=200_000)
+    ap.add_argument("--regimes", type=int, nargs="+", default=[10, 100, 1_000, 10_000])
+    ap.add_argument("--tau", type=float, default=1e-6)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=args.tau)
+    print(f"{'regimes':>8} {'legacy_apply_s':>15} {'pandas_sum_s':>13} {'numpy_sum_s':>12} {'speedup':>8}")
+    for n_regimes in args.regimes:
+        core = HUFCore(_elements(args.elements, n_regimes, args.seed), dataset_id="bench")
+
+        # Rebuild the intermediate frames once so only artifact 1 is timed
+        df = core.elements.copy()
+        df["rho_global_pre"] = df["value"] / df["value"].sum()
+        df["regime_total"] = df.groupby("regime_id")["value"].transform("sum")
+        df["rho_local_pre"] = df["value"] / df["regime_total"]
+        df["excluded"] = df["rho_global_pre"] < cfg.tau
+        kept = df.loc[~df["excluded"]].copy()
+        kept["rho_global_post"] = kept["value"] / kept["value"].sum()
+        kept["rho_local_post"] = kept["value"] / kept.groupby("regime_id")["value"].transform("sum")
+        disc = float(df.loc[df["excluded"], "value"].sum() / df["value"].sum())
+
+        frame = core.columnar
+        cyc = engine.run_columnar_cycle(frame, cfg)
+
+        t_legacy = _best_of(lambda: _legacy_coherence_map(df, kept, disc), args.repeat)
+        t_pandas = _best_of(lambda: core._artifact_coherence_map(df, kept, disc, cfg), args.repeat)
+        t_numpy = _best_of(lambda: engine.coherence_map(frame, cyc), args.repeat)
+        print(f"{n_regimes:>8} {t_legacy:>15.4f} {t_pandas:>13.4f} {t_numpy:>12.4f} {t_legacy / t_pandas:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,20 +10,25 @@ What it prints:
 - Top regimes by rho_global_post (artifact_1_coherence_map.csv)
 - Top retained items (artifact_2_active_set.csv)
 - Discarded budget (artifact_4_error_budget.json), if present
+
+Compressed tables (.csv.gz / .csv.zst) are found and stream-decompressed too.
 """
 
 from __future__ import annotations
 
 import argparse
-import csv
+import heapq
 import json
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, List, Optional
 
+# Make `import scripts.*` work when running: python scripts/inspect_artifact_tables.py
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
 
-def _read_csv(path: Path) -> List[Dict[str, Any]]:
-    with path.open("r", encoding="utf-8-sig", newline="") as f:
-        return list(csv.DictReader(f))
+from scripts.artifact_files import csv_header, find_artifact, iter_csv  # noqa: E402
 
 
 def _to_float(x: Any, default: float = 0.0) -> float:
@@ -38,41 +43,37 @@ def _to_float(x: Any, default: float = 0.0) -> float:
         return default
 
 
-def _col(rows: List[Dict[str, Any]], name: str) -> bool:
-    return bool(rows) and (name in rows[0])
-
-
-def _pick_first(rows: List[Dict[str, Any]], names: List[str]) -> Optional[str]:
+def _pick_first(columns: List[str], names: List[str]) -> Optional[str]:
     for n in names:
-        if _col(rows, n):
+        if n in columns:
             return n
     return None
 
 
 def print_top_regimes(coh_path: Path, top: int) -> None:
-    rows = _read_csv(coh_path)
-    rho_col = _pick_first(rows, ["rho_global_post", "rho_post", "rho"])
-    rid_col = _pick_first(rows, ["regime_id", "regime", "namespace", "collection", "source", "tenant"])
+    columns = csv_header(coh_path)
+    rho_col = _pick_first(columns, ["rho_global_post", "rho_post", "rho"])
+    rid_col = _pick_first(columns, ["regime_id", "regime", "namespace", "collection", "source", "tenant"])
     if not rho_col or not rid_col:
         print(f"[warn] {coh_path.name}: missing expected columns (need regime_id + rho_global_post)")
         return
 
-    rows.sort(key=lambda r: _to_float(r.get(rho_col)), reverse=True)
+    rows = heapq.nlargest(top, iter_csv(coh_path), key=lambda r: _to_float(r.get(rho_col)))
     print("\nTop regimes by rho_global_post:")
-    for i, r in enumerate(rows[:top], start=1):
+    for i, r in enumerate(rows, start=1):
         rid = r.get(rid_col, "")
         rho = _to_float(r.get(rho_col))
         print(f"  {i:2d}. {rid}  rho_post={rho:.6f}")
 
 
 def print_top_items(active_path: Path, top: int) -> None:
-    rows = _read_csv(active_path)
-    rho_g = _pick_first(rows, ["rho_global_post", "rho_post", "rho"])
-    rho_l = _pick_first(rows, ["rho_local_post", "rho_local"])
-    rank = _pick_first(rows, ["rank", "global_rank", "rnk"])
-    rid  = _pick_first(rows, ["regime_id", "regime", "namespace", "collection", "source", "tenant"])
-    iid  = _pick_first(rows, ["item_id", "id", "doc_id", "chunk_id"])
-    val  = _pick_first(rows, ["value", "score", "mass", "w"])
+    columns = csv_header(active_path)
+    rho_g = _pick_first(columns, ["rho_global_post", "rho_post", "rho"])
+    rho_l = _pick_first(columns, ["rho_local_post", "rho_local"])
+    rank = _pick_first(columns, ["rank", "global_rank", "rnk"])
+    rid  = _pick_first(columns, ["regime_id", "regime", "namespace", "collection", "source", "tenant"])
+    iid  = _pick_first(columns, ["item_id", "id", "doc_id", "chunk_id"])
+    val  = _pick_first(columns, ["value", "score", "mass", "w"])
 
     if not rho_g:
         print(f"[warn] {active_path.name}: missing rho_global_post column")
@@ -80,16 +81,16 @@ def print_top_items(active_path: Path, top: int) -> None:
 
     # Prefer explicit rank if present; else sort by rho_global_post desc
     if rank:
-        rows.sort(key=lambda r: int(float(r.get(rank, 1e9) or 1e9)))
+        rows = heapq.nsmallest(top, iter_csv(active_path), key=lambda r: int(float(r.get(rank, 1e9) or 1e9)))
     else:
-        rows.sort(key=lambda r: _to_float(r.get(rho_g)), reverse=True)
+        rows = heapq.nlargest(top, iter_csv(active_path), key=lambda r: _to_float(r.get(rho_g)))
 
     print("\nTop retained items:")
     headers = ["rank", "regime_id", "item_id", "value", "rho_global_post", "rho_local_post"]
     print("  " + " | ".join(headers))
     print("  " + "-|-".join(["-" * len(h) for h in headers]))
 
-    for r in rows[:top]:
+    for r in rows:
         def g(c: Optional[str]) -> str:
             return str(r.get(c, "")) if c else ""
         rg = _to_float(r.get(rho_g))
@@ -140,19 +141,19 @@ def main() -> int:
     out_dir = args.out
     print(f"[out] {out_dir.resolve()}")
 
-    coh = out_dir / "artifact_1_coherence_map.csv"
-    act = out_dir / "artifact_2_active_set.csv"
+    coh = find_artifact(out_dir, "artifact_1_coherence_map.csv")
+    act = find_artifact(out_dir, "artifact_2_active_set.csv")
     err = out_dir / "artifact_4_error_budget.json"
 
-    if coh.exists():
+    if coh is not None:
         print_top_regimes(coh, top=args.top)
     else:
-        print(f"[miss] {coh.name}")
+        print("[miss] artifact_1_coherence_map.csv")
 
-    if act.exists():
+    if act is not None:
         print_top_items(act, top=args.top)
     else:
-        print(f"[miss] {act.name}")
+        print("[miss] artifact_2_active_set.csv")
 
     if err.exists():
         print_discarded_budget(err)
@@ -4,11 +4,18 @@
 from __future__ import annotations
 
 import argparse
-import csv
+import heapq
 import json
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# Make `import scripts.*` work when running: python scripts/inspect_huf_artifacts.py
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.artifact_files import find_artifact, iter_csv  # noqa: E402
 
 COH = "artifact_1_coherence_map.csv"
 ACTIVE = "artifact_2_active_set.csv"
@@ -17,18 +24,8 @@ STAMP = "run_stamp.json"
 
 
 def _find(base: Path, name: str) -> Optional[Path]:
-    p = base / name
-    if p.exists():
-        return p
-    p2 = base / "artifacts" / name
-    if p2.exists():
-        return p2
-    return None
-
-
-def _read_csv(path: Path) -> List[Dict[str, str]]:
-    with path.open("r", encoding="utf-8-sig", newline="") as f:
-        return list(csv.DictReader(f))
+    # plain or compressed (.gz / .zst), directly under base or base/artifacts
+    return find_artifact(base, name)
 
 
 def _f(row: Dict[str, str], key: str, default: float = 0.0) -> float:
@@ -70,9 +67,7 @@ def summarize(out_dir: Path, top_regimes: int = 10) -> Dict[str, object]:
 
     top_regime_rows: List[Tuple[str, float]] = []
     if coh_path:
-        coh = _read_csv(coh_path)
-        coh_sorted = sorted(coh, key=lambda r: _f(r, "rho_global_post"), reverse=True)
-        for r in coh_sorted[:top_regimes]:
+        for r in heapq.nlargest(top_regimes, iter_csv(coh_path), key=lambda r: _f(r, "rho_global_post")):
             rid = r.get("regime_id") or r.get("regime") or ""
             top_regime_rows.append((rid, _f(r, "rho_global_post")))
         res["top_regimes"] = top_regime_rows
@@ -81,11 +76,11 @@ def summarize(out_dir: Path, top_regimes: int = 10) -> Dict[str, object]:
 
     items_to_cover_90 = None
     if act_path:
-        act = _read_csv(act_path)
-        act_sorted = sorted(act, key=lambda r: _f(r, "rho_global_post"), reverse=True)
+        # only the weights are kept, not the rows
+        weights = sorted((_f(r, "rho_global_post") for r in iter_csv(act_path)), reverse=True)
         cum = 0.0
-        for i, r in enumerate(act_sorted, start=1):
-            cum += _f(r, "rho_global_post")
+        for i, w in enumerate(weights, start=1):
+            cum += w
             if cum >= 0.90:
                 items_to_cover_90 = i
                 break
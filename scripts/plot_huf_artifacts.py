@@ -5,6 +5,7 @@ This script is intentionally lightweight and cross-platform.
 Inputs (under --out):
   - artifact_1_coherence_map.csv
   - artifact_2_active_set.csv
+  (or their .gz / .zst variants, stream-decompressed)
 
 Outputs (under <out>/plots by default):
   - coherence_by_regime.png
@@ -25,9 +26,17 @@ If matplotlib isn't installed:
 from __future__ import annotations
 
 import argparse
-import csv
+import heapq
+import sys
 from pathlib import Path
 
+# Make `import scripts.*` work when running: python scripts/plot_huf_artifacts.py
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.artifact_files import csv_header, find_artifact, iter_csv  # noqa: E402
+
 
 def _f(x) -> float:
     try:
@@ -36,14 +45,9 @@ def _f(x) -> float:
         return 0.0
 
 
-def _read_csv(path: Path) -> list[dict[str, str]]:
-    with path.open("r", encoding="utf-8-sig", newline="") as f:
-        return list(csv.DictReader(f))
-
-
-def _pick_first(keys: list[str], row0: dict[str, str]) -> str | None:
+def _pick_first(keys: list[str], columns: list[str]) -> str | None:
     for k in keys:
-        if k in row0:
+        if k in columns:
             return k
     return None
 
@@ -55,32 +59,31 @@ def plot(out_dir: Path, save_dir: Path, top_k: int = 20) -> None:
     matplotlib.use("Agg", force=True)
     import matplotlib.pyplot as plt
 
-    coh_p = out_dir / "artifact_1_coherence_map.csv"
-    act_p = out_dir / "artifact_2_active_set.csv"
+    coh_p = find_artifact(out_dir, "artifact_1_coherence_map.csv")
+    act_p = find_artifact(out_dir, "artifact_2_active_set.csv")
 
-    if not coh_p.exists():
-        raise FileNotFoundError(f"Missing: {coh_p}")
-    if not act_p.exists():
-        raise FileNotFoundError(f"Missing: {act_p}")
+    if coh_p is None:
+        raise FileNotFoundError(f"Missing: {out_dir / 'artifact_1_coherence_map.csv'}")
+    if act_p is None:
+        raise FileNotFoundError(f"Missing: {out_dir / 'artifact_2_active_set.csv'}")
 
-    coh = _read_csv(coh_p)
-    act = _read_csv(act_p)
-
-    if not coh:
+    coh_cols = csv_header(coh_p)
+    if not coh_cols:
         raise RuntimeError(f"Empty file: {coh_p}")
 
-    rho_col = _pick_first(["rho_global_post", "rho_post"], coh[0])
-    reg_col = _pick_first(["regime_id", "namespace", "regime"], coh[0])
+    rho_col = _pick_first(["rho_global_post", "rho_post"], coh_cols)
+    reg_col = _pick_first(["regime_id", "namespace", "regime"], coh_cols)
 
     if not rho_col or not reg_col:
         raise RuntimeError(
             "Could not find expected columns in coherence map. "
-            f"Saw columns: {list(coh[0].keys())}"
+            f"Saw columns: {coh_cols}"
         )
 
     # ---- coherence bar (top-K) ----
-    coh_sorted = sorted(coh, key=lambda r: _f(r.get(rho_col)), reverse=True)
-    coh_top = coh_sorted[:top_k]
+    coh_top = heapq.nlargest(top_k, iter_csv(coh_p), key=lambda r: _f(r.get(rho_col)))
+    if not coh_top:
+        raise RuntimeError(f"Empty file: {coh_p}")
     labels = [r.get(reg_col, "") for r in coh_top]
     values = [_f(r.get(rho_col)) for r in coh_top]
 
@@ -95,18 +98,22 @@ def plot(out_dir: Path, save_dir: Path, top_k: int = 20) -> None:
     plt.close()
 
     # ---- concentration curve (active set) ----
-    if not act:
+    act_cols = csv_header(act_p)
+    if not act_cols:
         raise RuntimeError(f"Empty file: {act_p}")
 
     # Prefer rho columns if present; otherwise fall back to 'value'
-    w_col = _pick_first(["rho_global_post", "rho_post", "value"], act[0])
+    w_col = _pick_first(["rho_global_post", "rho_post", "value"], act_cols)
     if not w_col:
         raise RuntimeError(
             "Could not find a weight column in active set. "
-            f"Saw columns: {list(act[0].keys())}"
+            f"Saw columns: {act_cols}"
         )
 
-    weights = sorted((_f(r.get(w_col)) for r in act), reverse=True)
+    # only the weights are kept, not the rows
+    weights = sorted((_f(r.get(w_col)) for r in iter_csv(act_p)), reverse=True)
+    if not weights:
+        raise RuntimeError(f"Empty file: {act_p}")
     total = sum(weights) or 1.0
     cum = []
     s = 0.0
@@ -6,6 +6,7 @@ Paste-safe way to inspect HUF outputs on Windows.
 Reads:
   artifact_1_coherence_map.csv
   artifact_2_active_set.csv
+(or their .gz / .zst variants, stream-decompressed)
 
 Usage (PowerShell):
   .\.venv\Scripts\python scripts\print_huf_summary.py --out out\planck70
@@ -18,14 +19,18 @@ Optional:
 from __future__ import annotations
 
 import argparse
-import csv
+import heapq
+import itertools
+import sys
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import List, Any
 
-def read_csv(path: Path) -> List[Dict[str, Any]]:
-    # utf-8-sig handles BOM if present
-    with path.open("r", encoding="utf-8-sig", newline="") as f:
-        return list(csv.DictReader(f))
+# Make `import scripts.*` work when running: python scripts/print_huf_summary.py
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.artifact_files import csv_header, find_artifact, iter_csv  # noqa: E402
 
 def fnum(x: Any, default: float = 0.0) -> float:
     try:
@@ -33,9 +38,9 @@ def fnum(x: Any, default: float = 0.0) -> float:
     except Exception:
         return default
 
-def find_first(cols: List[str], row: Dict[str, Any]) -> str | None:
+def find_first(cols: List[str], columns: List[str]) -> str | None:
     for c in cols:
-        if c in row:
+        if c in columns:
             return c
     return None
 
@@ -47,59 +52,58 @@ def main() -> int:
     args = ap.parse_args()
 
     out = Path(args.out)
-    coh_p = out / "artifact_1_coherence_map.csv"
-    act_p = out / "artifact_2_active_set.csv"
+    coh_p = find_artifact(out, "artifact_1_coherence_map.csv")
+    act_p = find_artifact(out, "artifact_2_active_set.csv")
 
-    if not coh_p.exists():
-        raise SystemExit(f"[err] Missing: {coh_p}")
-    if not act_p.exists():
-        raise SystemExit(f"[err] Missing: {act_p}")
+    if coh_p is None:
+        raise SystemExit(f"[err] Missing: {out / 'artifact_1_coherence_map.csv'}")
+    if act_p is None:
+        raise SystemExit(f"[err] Missing: {out / 'artifact_2_active_set.csv'}")
 
-    coh = read_csv(coh_p)
-    act = read_csv(act_p)
+    coh_cols = csv_header(coh_p)
+    rho_col = find_first(["rho_global_post", "rho_post", "rho_global"], coh_cols)
+    reg_col = find_first(["regime_id", "namespace", "collection", "source", "tenant"], coh_cols)
+    disc_col = find_first(["discarded_mass", "discarded_global", "rho_discarded"], coh_cols)
 
-    if not coh:
+    if not coh_cols or next(iter_csv(coh_p), None) is None:
         print("[warn] coherence_map is empty")
+    elif rho_col and reg_col:
+        coh = heapq.nlargest(args.top_regimes, iter_csv(coh_p), key=lambda r: fnum(r.get(rho_col)))
+        print("\nTop regimes by rho_global_post:")
+        for i, r in enumerate(coh, 1):
+            if disc_col:
+                disc = fnum(r.get(disc_col))
+                print(f"  {i:2d}. {r.get(reg_col,'')}  rho_post={fnum(r.get(rho_col)):.6f}  discarded={disc:.6g}")
+            else:
+                print(f"  {i:2d}. {r.get(reg_col,'')}  rho_post={fnum(r.get(rho_col)):.6f}")
     else:
-        rho_col = find_first(["rho_global_post", "rho_post", "rho_global"], coh[0])
-        reg_col = find_first(["regime_id", "namespace", "collection", "source", "tenant"], coh[0])
-        disc_col = find_first(["discarded_mass", "discarded_global", "rho_discarded"], coh[0])
-
-        if rho_col and reg_col:
-            coh.sort(key=lambda r: fnum(r.get(rho_col)), reverse=True)
-            print("\nTop regimes by rho_global_post:")
-            for i, r in enumerate(coh[: args.top_regimes], 1):
-                if disc_col:
-                    disc = fnum(r.get(disc_col))
-                    print(f"  {i:2d}. {r.get(reg_col,'')}  rho_post={fnum(r.get(rho_col)):.6f}  discarded={disc:.6g}")
-                else:
-                    print(f"  {i:2d}. {r.get(reg_col,'')}  rho_post={fnum(r.get(rho_col)):.6f}")
-        else:
-            print("\n[warn] Could not locate regime/rho columns in artifact_1_coherence_map.csv")
+        print("\n[warn] Could not locate regime/rho columns in artifact_1_coherence_map.csv")
 
     # Active set
-    if not act:
-        print("\n[warn] active_set is empty")
-        return 0
-
-    rank_col = find_first(["rank", "global_rank"], act[0])
+    act_cols = csv_header(act_p)
+    rank_col = find_first(["rank", "global_rank"], act_cols)
     if rank_col:
         def rank_key(r):
             try:
                 return int(float(r.get(rank_col) or 10**18))
             except Exception:
                 return 10**18
-        act.sort(key=rank_key)
+        act = heapq.nsmallest(args.top_items, iter_csv(act_p), key=rank_key)
+    else:
+        act = list(itertools.islice(iter_csv(act_p), args.top_items))
+    if not act:
+        print("\n[warn] active_set is empty")
+        return 0
 
     cols = ["rank","regime_id","item_id","value","rho_global_post","rho_local_post"]
-    existing = [c for c in cols if c in act[0]]
+    existing = [c for c in cols if c in act_cols]
     if not existing:
-        existing = list(act[0].keys())[:8]
+        existing = act_cols[:8]
 
-    print(f"\nTop {min(args.top_items, len(act))} retained items:")
+    print(f"\nTop {len(act)} retained items:")
     print("  " + " | ".join(existing))
     print("  " + "-+-".join("-"*len(c) for c in existing))
-    for r in act[: args.top_items]:
+    for r in act:
         print("  " + " | ".join(str(r.get(c,"")) for c in existing))
 
     return 0
@@ -83,6 +83,8 @@ def main(argv: Optional[List[str]] = None) -> int:
     ap.add_argument("--status", action="append", default=["Green Termination"],
                     help="Repeatable PHASE_STATUS_TEXT filter for anomaly.")
     ap.add_argument("--planck-fits", type=str, default="", help="Optional path to Planck LFI 70 FITS.")
+    ap.add_argument("--cache-dir", type=str, default="",
+                    help="Optional on-disk HUF cache (reruns on unchanged inputs skip parsing); sets HUF_CACHE_DIR.")
     args = ap.parse_args(argv)
 
     repo = _repo_root()
@@ -98,6 +100,9 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     _maybe_fetch_inputs(no_fetch=args.no_fetch)
 
+    if args.cache_dir.strip():
+        os.environ["HUF_CACHE_DIR"] = str(Path(args.cache_dir).expanduser().resolve())
+
     from huf_core.cli import main as huf_main
 
     stamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
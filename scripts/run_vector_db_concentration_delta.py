@@ -18,6 +18,8 @@ Windows / PowerShell (repo venv):
     --tau-a 0.005 `
     --tau-b 0.02 `
     --regime-field namespace
+
+Set HUF_CACHE_DIR to let the second run reuse the first run's parsed elements.
 """
 
 from __future__ import annotations
@@ -0,0 +1,286 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from huf_core import HUFCore, HUFConfig
+from huf_core.io import read_artifacts, write_artifacts
+
+
+def _elements(n=300, seed=5):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "element_id": [f"e{i}" for i in range(n)],
+        "regime_id": [f"R{r}" for r in rng.integers(0, 6, n)],
+        "value": rng.random(n) ** 3 * 50,
+        "trace_path": [json.dumps(["Root", f"R{i % 4}", f"e{i}"]) if i % 7 else "" for i in range(n)],
+        "inputs_ref": "unit",
+        "method_ref": "synthetic",
+    })
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_columnar_formats_round_trip(tmp_path, fmt):
+    pytest.importorskip("pyarrow")
+    core = HUFCore(_elements(), dataset_id="fmt_test")
+    art = core.cycle_hierarchy(HUFConfig(budget_type="mass", exclusion="global", tau=0.002), level=1)
+    write_artifacts(tmp_path / fmt, art, format=fmt)
+
+    suffix = ".parquet" if fmt == "parquet" else ".arrow"
+    assert (tmp_path / fmt / f"artifact_3_trace_report{suffix}").exists()
+    assert not (tmp_path / fmt / "artifact_2_active_set.csv").exists()
+
+    got = read_artifacts(tmp_path / fmt)
+    pd.testing.assert_frame_equal(got["coherence_map"], art["coherence_map"], check_exact=True)
+    pd.testing.assert_frame_equal(got["coherence_hierarchy"], art["coherence_hierarchy"], check_exact=True)
+    pd.testing.assert_frame_equal(got["active_set"], art["active_set"].frame, check_exact=True)
+    assert got["trace_report"].to_dict("records") == art["trace_report"].to_list()
+
+    # same trace rows as the default JSONL output
+    write_artifacts(tmp_path / "csv", art)
+    pd.testing.assert_frame_equal(read_artifacts(tmp_path / "csv")["trace_report"], got["trace_report"])
+
+
+def test_columnar_format_stores_dictionary_strings(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    art = HUFCore(_elements(), dataset_id="fmt_test").cycle(HUFConfig(budget_type="mass", exclusion="global", tau=0.002))
+    write_artifacts(tmp_path, art, format="parquet")
+    schema = pq.read_schema(tmp_path / "artifact_3_trace_report.parquet")
+    assert str(schema.field("inputs_ref").type).startswith("dictionary")
+    assert schema.field("regime_path").type.value_type == "string"
+    with pytest.raises(ValueError):
+        write_artifacts(tmp_path, art, format="xlsx")
+
+
+def _odd_trace_cycle():
+    elements = _elements(n=120)
+    odd = [
+        '["a","b"]', '["caf\\u00e9", "x"]', '["café", "tab\\there"]', '["say \\"hi\\"", "x"]',
+        '["]', '[""]', "[]", '{"k": 1}', "not json", '["a", 1, null]', ' ["a", "b"]', '["line\u2028sep"]',
+    ]
+    elements.loc[: len(odd) - 1, "trace_path"] = odd
+    elements.loc[5, "element_id"] = 'quote"id'
+    return HUFCore(elements, dataset_id="fmt_test").cycle(HUFConfig(budget_type="mass", exclusion="global", tau=0.0))
+
+
+def test_trace_jsonl_writer_matches_record_dump(tmp_path):
+    from huf_core.io import write_jsonl, write_trace_jsonl
+
+    art = _odd_trace_cycle()
+    write_jsonl(tmp_path / "ref.jsonl", art["trace_report"])
+    ref = (tmp_path / "ref.jsonl").read_bytes()
+    for kw in ({}, {"block_rows": 7}, {"block_rows": 16, "workers": 3}):
+        write_trace_jsonl(tmp_path / "fast.jsonl", art["trace_report"], **kw)
+        assert (tmp_path / "fast.jsonl").read_bytes() == ref
+
+
+def test_trace_jsonl_writer_orjson_encoder(tmp_path):
+    pytest.importorskip("orjson")
+    from huf_core.io import write_trace_jsonl
+
+    art = _odd_trace_cycle()
+    write_trace_jsonl(tmp_path / "orjson.jsonl", art["trace_report"], encoder="orjson", block_rows=50)
+    lines = (tmp_path / "orjson.jsonl").read_text(encoding="utf-8").split("\n")
+    assert lines[-1] == ""
+    assert [json.loads(line) for line in lines[:-1]] == art["trace_report"].to_list()
+
+    # reachable from write_artifacts (and the CLI's --trace-encoder / --trace-workers)
+    write_artifacts(tmp_path / "json", art)
+    write_artifacts(tmp_path / "fast", art, trace_encoder="orjson", trace_workers=3, compression="gzip")
+    pd.testing.assert_frame_equal(read_artifacts(tmp_path / "fast")["trace_report"], read_artifacts(tmp_path / "json")["trace_report"])
+    with pytest.raises(ValueError):
+        write_artifacts(tmp_path / "bad", art, trace_encoder="simdjson")
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_compressed_artifacts_round_trip(tmp_path, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    art = HUFCore(_elements(), dataset_id="fmt_test").cycle(HUFConfig(budget_type="mass", exclusion="global", tau=0.002))
+    write_artifacts(tmp_path / "plain", art)
+    write_artifacts(tmp_path / "packed", art, compression=compression, compress_threads=2)
+
+    suffix = ".gz" if compression == "gzip" else ".zst"
+    assert (tmp_path / "packed" / f"artifact_2_active_set.csv{suffix}").exists()
+    assert (tmp_path / "packed" / f"artifact_3_trace_report.jsonl{suffix}").exists()
+    assert not (tmp_path / "packed" / "artifact_2_active_set.csv").exists()
+
+    plain, packed = read_artifacts(tmp_path / "plain"), read_artifacts(tmp_path / "packed")
+    for name in ("coherence_map", "active_set", "trace_report"):
+        pd.testing.assert_frame_equal(packed[name], plain[name], check_exact=True)
+
+    from scripts.inspect_huf_artifacts import summarize
+    got, ref = summarize(tmp_path / "packed"), summarize(tmp_path / "plain")
+    assert {k: v for k, v in got.items() if k != "out_dir"} == {k: v for k, v in ref.items() if k != "out_dir"}
+
+
+def test_threaded_gzip_writer_is_deterministic(tmp_path, monkeypatch):
+    import gzip
+
+    from huf_core import compression
+    from huf_core.compression import open_text
+
+    monkeypatch.setattr(compression, "_BLOCK_BYTES", 1000)  # many members
+    text = "".join(f"row{i},café,{i * 0.5}\n" for i in range(2000))
+    for name, threads in (("a.csv.gz", 0), ("b.csv.gz", 3)):
+        with open_text(tmp_path / name, "w", threads=threads) as f:
+            f.write(text)
+    assert (tmp_path / "a.csv.gz").read_bytes() == (tmp_path / "b.csv.gz").read_bytes()
+    assert gzip.decompress((tmp_path / "b.csv.gz").read_bytes()).decode("utf-8") == text
+    with open_text(tmp_path / "b.csv.gz") as f:
+        assert f.read() == text
+    with pytest.raises(ValueError):
+        write_artifacts(tmp_path, {}, compression="lz4")
+
+
+def test_concurrent_write_matches_serial_and_is_atomic(tmp_path):
+    import asyncio
+
+    from huf_core.io import write_artifacts_async
+
+    art = HUFCore(_elements(), dataset_id="fmt_test").cycle_hierarchy(HUFConfig(budget_type="mass", exclusion="global", tau=0.002), level=1)
+    extras = {"stability_packet.csv": pd.DataFrame({"tau": [0.1, 0.2]}), "meta.json": {"dataset_id": "fmt_test"}}
+    write_artifacts(tmp_path / "serial", art, extras=extras, workers=1)
+    write_artifacts(tmp_path / "pooled", art, extras=extras)
+    asyncio.run(write_artifacts_async(tmp_path / "async", art, extras=extras, compression="gzip"))
+
+    names = sorted(p.name for p in (tmp_path / "serial").iterdir())
+    assert "stability_packet.csv" in names and "meta.json" in names
+    assert sorted(p.name for p in (tmp_path / "pooled").iterdir()) == names
+    for name in names:
+        assert (tmp_path / "pooled" / name).read_bytes() == (tmp_path / "serial" / name).read_bytes()
+    pd.testing.assert_frame_equal(read_artifacts(tmp_path / "async")["trace_report"], read_artifacts(tmp_path / "serial")["trace_report"])
+
+    # a failing artifact leaves neither finished files nor temp files behind
+    bad = dict(art, error_budget={"not_json": object()})
+    with pytest.raises(TypeError):
+        write_artifacts(tmp_path / "failed", bad)
+    assert list((tmp_path / "failed").iterdir()) == []
+
+
+def test_manifest_and_unchanged_artifacts_keep_mtime(tmp_path):
+    import hashlib
+    import os
+
+    from huf_core.adapters import _file_fingerprint
+    from huf_core.io import is_up_to_date, read_manifest
+
+    src = tmp_path / "input.csv"
+    src.write_text("raw input\n", encoding="utf-8")
+    elements = _elements().assign(inputs_ref=_file_fingerprint(src))
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=0.002)
+    core = HUFCore(elements, dataset_id="fmt_test")
+    out = tmp_path / "run"
+    assert not is_up_to_date(out, src, cfg)
+
+    art = core.cycle(cfg)
+    write_artifacts(out, art, extras={"meta.json": {"k": 1}})
+    manifest = read_manifest(out)
+    assert manifest["param_hash"] == art["run_stamp"]["param_hash"]
+    assert manifest["inputs_ref"] == [_file_fingerprint(src)]
+    active = manifest["artifacts"]["artifact_2_active_set.csv"]
+    assert active["rows"] == len(art["active_set"])
+    assert active["sha256"] == hashlib.sha256((out / "artifact_2_active_set.csv").read_bytes()).hexdigest()
+    assert manifest["artifacts"]["meta.json"]["rows"] is None
+    assert is_up_to_date(out, [src], cfg)
+    assert not is_up_to_date(out, src, HUFConfig(budget_type="mass", exclusion="global", tau=0.003))
+    assert not is_up_to_date(out, src, cfg, code_fingerprint="huf_core_v2")
+
+    # same inputs/config again: only the run stamp (fresh created_utc) and the manifest change
+    for p in out.iterdir():
+        os.utime(p, ns=(1_000_000_000, 1_000_000_000))
+    write_artifacts(out, core.cycle(cfg), extras={"meta.json": {"k": 1}})
+    touched = sorted(p.name for p in out.iterdir() if p.stat().st_mtime_ns != 1_000_000_000)
+    assert touched == ["manifest.json", "run_stamp.json"]
+
+    # an edited input or a missing artifact invalidates the run
+    (out / "artifact_3_trace_report.jsonl").unlink()
+    assert not is_up_to_date(out, src, cfg)
+    write_artifacts(out, core.cycle(cfg))
+    assert is_up_to_date(out, src, cfg)
+    os.utime(src, (0, 0))
+    assert not is_up_to_date(out, src, cfg)
+
+
+def test_find_artifact_follows_manifest(tmp_path):
+    from huf_core.compression import find_artifact
+    from scripts import artifact_files
+    from scripts.inspect_huf_artifacts import summarize
+
+    art = HUFCore(_elements(), dataset_id="fmt_test").cycle(HUFConfig(budget_type="mass", exclusion="global", tau=0.002))
+    write_artifacts(tmp_path, art, compression="gzip")
+    (tmp_path / "artifact_2_active_set.csv").write_text("item_id,rho_global_post\nstale,1.0\n", encoding="utf-8")
+
+    for find in (find_artifact, artifact_files.find_artifact):
+        assert find(tmp_path, "artifact_2_active_set.csv").name == "artifact_2_active_set.csv.gz"
+    assert summarize(tmp_path)["items_to_cover_90pct"] > 1
+
+    # without a manifest two variants are ambiguous instead of silently picking one
+    (tmp_path / "manifest.json").unlink()
+    with pytest.raises(ValueError):
+        find_artifact(tmp_path, "artifact_2_active_set.csv")
+    with pytest.raises(SystemExit):
+        artifact_files.find_artifact(tmp_path, "artifact_2_active_set.csv")
+    assert find_artifact(tmp_path, "artifact_1_coherence_map.csv").name == "artifact_1_coherence_map.csv.gz"
+
+
+def test_read_artifacts_does_not_guess_by_extension(tmp_path):
+    pytest.importorskip("pyarrow")
+    import shutil
+
+    core = HUFCore(_elements(), dataset_id="fmt_test")
+    loose = core.cycle(HUFConfig(budget_type="mass", exclusion="global", tau=0.002))
+    tight = core.cycle(HUFConfig(budget_type="mass", exclusion="global", tau=0.01))
+    write_artifacts(tmp_path / "old", loose, format="parquet")
+    write_artifacts(tmp_path / "new", tight)
+    shutil.copy(tmp_path / "old" / "artifact_2_active_set.parquet", tmp_path / "new")
+
+    # the manifest names the CSV written last, not the older Parquet file
+    assert len(read_artifacts(tmp_path / "new")["active_set"]) == len(tight["active_set"]) < len(loose["active_set"])
+    (tmp_path / "new" / "manifest.json").unlink()
+    with pytest.raises(ValueError):
+        read_artifacts(tmp_path / "new")
+
+
+def test_format_switch_replaces_previous_variants(tmp_path):
+    pytest.importorskip("pyarrow")
+    core = HUFCore(_elements(), dataset_id="fmt_test")
+    loose = core.cycle_hierarchy(HUFConfig(budget_type="mass", exclusion="global", tau=0.002), level=1)
+    tight = core.cycle(HUFConfig(budget_type="mass", exclusion="global", tau=0.01))
+
+    write_artifacts(tmp_path, loose, format="parquet")
+    write_artifacts(tmp_path, tight)
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert not [n for n in names if n.endswith(".parquet")]
+    assert len(read_artifacts(tmp_path)["active_set"]) == len(tight["active_set"])
+
+    write_artifacts(tmp_path, loose, compression="gzip")
+    assert not (tmp_path / "artifact_2_active_set.csv").exists()
+    got = read_artifacts(tmp_path)
+    assert len(got["active_set"]) == len(loose["active_set"])
+    assert "coherence_hierarchy" in got
+    write_artifacts(tmp_path, tight)
+    assert "coherence_hierarchy" not in read_artifacts(tmp_path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == names
+
+
+def test_crash_before_stale_cleanup_leaves_readable_run(tmp_path, monkeypatch):
+    from huf_core import io as huf_io
+
+    core = HUFCore(_elements(), dataset_id="fmt_test")
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=0.01)
+    write_artifacts(tmp_path, core.cycle(cfg))
+
+    def crash(out_dir, jobs):
+        raise OSError("simulated crash")
+
+    monkeypatch.setattr(huf_io, "_remove_stale_variants", crash)
+    art = core.cycle(cfg)
+    with pytest.raises(OSError):
+        write_artifacts(tmp_path, art, compression="gzip")
+    # the new manifest is already in place and every file it lists exists
+    manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+    assert all((tmp_path / name).exists() for name in manifest["artifacts"])
+    assert (tmp_path / "artifact_2_active_set.csv").exists()
+    assert len(read_artifacts(tmp_path)["active_set"]) == len(art["active_set"])
@@ -0,0 +1,131 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from huf_core import CycleCache, HUFCore, HUFConfig
+from huf_core.backend import get_backend
+from huf_core.engine import ColumnarFrame
+
+CFG = HUFConfig(budget_type="mass", exclusion="dual", tau=0.002, tau_local=0.05)
+
+
+def _elements(n=500, regimes=9, seed=11):
+    rng = np.random.default_rng(seed)
+    value = rng.random(n) ** 4 * 100
+    value[: n // 4] = np.round(value[: n // 4], 1)  # ties
+    return pd.DataFrame({
+        "element_id": [f"e{i}" for i in range(n)],
+        "regime_id": [f"R{r}" for r in rng.integers(0, regimes, n)],
+        "value": value,
+        "trace_path": [json.dumps(["Root", f"R{i % 3}", f"e{i}"]) for i in range(n)],
+        "inputs_ref": "unit",
+        "method_ref": "synthetic",
+    })
+
+
+def _assert_same_artifacts(ref, art):
+    pd.testing.assert_frame_equal(ref["coherence_map"], art["coherence_map"], check_exact=True)
+    pd.testing.assert_frame_equal(ref["active_set"].frame, art["active_set"].frame, check_exact=True)
+    assert [r["item_id"] for r in ref["trace_report"]] == [r["item_id"] for r in art["trace_report"]]
+    assert ref["error_budget"] == art["error_budget"]
+
+
+def test_backend_primitives_agree():
+    values = np.array(["b", "a", "c", "a", "b"], dtype=object)
+    w = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    ref = get_backend("pandas")
+    for name in ("numpy",):
+        be = get_backend(name)
+        codes, uniques = be.factorize(values)
+        ref_codes, ref_uniques = ref.factorize(values)
+        np.testing.assert_array_equal(codes, ref_codes)
+        assert list(uniques) == list(ref_uniques) == ["a", "b", "c"]
+        np.testing.assert_array_equal(be.segment_sum(codes, w, 4), [6.0, 6.0, 3.0, 0.0])
+        np.testing.assert_array_equal(be.filter(w > 2), [2, 3, 4])
+    with pytest.raises(ValueError):
+        get_backend("arrow")
+
+
+@pytest.mark.parametrize("backend", ["numpy", "polars"])
+def test_columnar_artifacts_match_reference_backend(backend):
+    if backend == "polars":
+        pytest.importorskip("polars")
+    elements = _elements()
+    ref = HUFCore(elements, dataset_id="backend_test").cycle(CFG, engine="numpy")
+    core = HUFCore(elements, dataset_id="backend_test", backend=backend)
+    assert core.columnar.backend.name == backend
+    _assert_same_artifacts(ref, core.cycle(CFG, engine="numpy"))
+
+    # the default engine follows the backend, and still matches the pandas reference
+    _assert_same_artifacts(HUFCore(elements, dataset_id="backend_test").cycle(CFG), core.cycle(CFG))
+
+    hier_ref = HUFCore(elements, dataset_id="backend_test").cycle_hierarchy(CFG, level=1)
+    pd.testing.assert_frame_equal(
+        hier_ref["coherence_hierarchy"], core.cycle_hierarchy(CFG, level=1)["coherence_hierarchy"], check_exact=True
+    )
+
+
+def test_process_packet_keeps_backend():
+    core = HUFCore(_elements(), dataset_id="backend_test", backend="numpy")
+    taus = [0.001, 0.002, 0.004]
+    serial = core.stability_packet(CFG, taus)
+    pooled = core.stability_packet(CFG, taus, executor="process", max_workers=2)
+    pd.testing.assert_frame_equal(serial, pooled, check_exact=True)
+
+
+def test_numpy_factorize_falls_back_on_mixed_types():
+    values = np.array(["b", 1, "a", 2, "b"], dtype=object)
+    codes, uniques = get_backend("numpy").factorize(values)
+    ref_codes, ref_uniques = get_backend("pandas").factorize(values)
+    np.testing.assert_array_equal(codes, ref_codes)
+    assert list(uniques) == list(ref_uniques)
+
+    codes, _ = get_backend("numpy").factorize(np.array(["a", None, "b"], dtype=object))
+    assert codes[1] == -1
+    elements = _elements(n=20).astype({"regime_id": object})
+    elements.loc[3, "regime_id"] = None
+    elements.loc[4, "regime_id"] = 7
+    with pytest.raises(ValueError, match="regime_id must not be null"):
+        ColumnarFrame.from_elements(elements, backend="numpy")
+
+
+def test_cache_entries_are_keyed_by_backend():
+    cache = CycleCache()
+    elements = _elements()
+    HUFCore(elements, dataset_id="backend_test", cache=cache).cycle(CFG, engine="numpy")
+    HUFCore(elements, dataset_id="backend_test", cache=cache).cycle(CFG, engine="pandas")
+    assert len(cache) == 1
+    HUFCore(elements, dataset_id="backend_test", cache=cache, backend="numpy").cycle(CFG, engine="numpy")
+    assert len(cache) == 2
+
+
+def test_segment_sums_are_bit_identical_across_backends():
+    rng = np.random.default_rng(3)
+    codes = rng.integers(0, 7, 100_000).astype(np.intp)
+    w = rng.random(100_000) ** 6 * 1e3
+    ref = get_backend("pandas").segment_sum(codes, w, 7)
+    np.testing.assert_array_equal(get_backend("numpy").segment_sum(codes, w, 7), ref)
+    values = np.array([2.0, np.nan, 1.0, 2.0])
+    np.testing.assert_array_equal(get_backend("numpy").factorize(values)[0], get_backend("pandas").factorize(values)[0])
+
+
+@pytest.mark.parametrize("backend", ["numpy", "polars"])
+def test_traffic_adapter_counts_on_backend(tmp_path, backend):
+    if backend == "polars":
+        pytest.importorskip("polars")
+    from huf_core.adapters import traffic_anomaly_elements, traffic_phase_band_elements
+
+    rng = np.random.default_rng(8)
+    csv = tmp_path / "phase.csv"
+    pd.DataFrame({
+        "TCS": rng.integers(0, 30, 2000),
+        "PHASE": rng.integers(1, 13, 2000),
+        "PHASE_STATUS_TEXT": rng.choice(["Green Termination", "Max Out", None], 2000),
+    }).to_csv(csv, index=False)
+    for build in (traffic_phase_band_elements, traffic_anomaly_elements):
+        ref, ref_meta = build(csv)
+        got, meta = build(csv, backend=backend)
+        pd.testing.assert_frame_equal(ref, got, check_exact=True)
+        assert meta == ref_meta
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from huf_core import HUFCore, HUFConfig
+from huf_core.bootstrap import bootstrap_frame, draw_values
+from huf_core.engine import run_columnar_cycle
+
+
+def _elements(n=120, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "element_id": [f"e{i}" for i in range(n)],
+        "regime_id": [f"R{i % 5}" for i in range(n)],
+        "value": np.floor(rng.random(n) ** 3 * 200),
+    })
+
+
+@pytest.mark.parametrize("cfg", [
+    HUFConfig(budget_type="mass", exclusion="global", tau=0.004, seed=7),
+    HUFConfig(budget_type="mass", exclusion="dual", tau=0.01, tau_local=0.03, seed=7),
+])
+def test_bootstrap_matches_per_sample_cycles(cfg):
+    core = HUFCore(_elements(), dataset_id="boot")
+    frame = core.columnar
+    res = bootstrap_frame(frame, cfg, 40, "poisson", seed=cfg.seed, chunk_size=7)
+
+    # replay the same draws one sample at a time through the columnar cycle
+    rng = np.random.default_rng(cfg.seed)
+    draws = np.vstack([draw_values(rng, frame.value, m, "poisson", 0.1) for m in [7] * 5 + [5]])
+    counts = np.zeros(frame.value.size, dtype=np.int64)
+    for i, v in enumerate(draws):
+        sample = HUFCore(_elements().assign(value=v), dataset_id="one")
+        try:
+            cyc = run_columnar_cycle(sample.columnar, cfg)
+        except ValueError:
+            assert np.isnan(res.discarded[i])
+            continue
+        counts[cyc.kept_index] += 1
+        assert res.discarded[i] == pytest.approx(cyc.discarded_budget_global, abs=1e-12)
+    np.testing.assert_array_equal(res.kept_count, counts)
+
+
+def test_bootstrap_stability_artifacts_and_seed():
+    core = HUFCore(_elements(), dataset_id="boot")
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=0.004, seed=3)
+    out = core.bootstrap_stability(cfg, n_samples=64, noise_model="jitter", scale=0.2)
+    again = core.bootstrap_stability(cfg, n_samples=64, noise_model="jitter", scale=0.2, chunk_size=5)
+    pd.testing.assert_frame_equal(out["inclusion_probability"], again["inclusion_probability"])
+
+    inc = out["inclusion_probability"]
+    assert inc["inclusion_probability"].between(0, 1).all()
+    assert inc["inclusion_probability"].is_monotonic_decreasing
+    # elements far above tau are always kept; zero-valued ones never
+    assert (inc.loc[inc["rho_global_pre"] > 0.02, "inclusion_probability"] == 1.0).all()
+    assert (inc.loc[inc["value"] == 0, "inclusion_probability"] == 0.0).all()
+
+    budget = out["discarded_budget"]
+    assert budget["n_valid"] == 64 and budget["seed"] == 3
+    assert budget["ci_low"] <= budget["mean"] <= budget["ci_high"]
+    assert core.bootstrap_stability(cfg, n_samples=64, noise_model="jitter", scale=0.2, seed=4)["discarded_budget"]["mean"] != budget["mean"]
@@ -38,3 +38,63 @@ def test_trace_lines_have_min_fields(tmp_path):
     # Validate emitted trace lines
     for line in artifacts["trace_report"]:
         validate_trace_line_min(line)
+
+
+def test_validation_modes():
+    import pytest
+    from huf_core.validation import validate_artifacts
+
+    elements = pd.DataFrame({
+        "element_id": [f"e{i}" for i in range(6)],
+        "regime_id": ["R1"] * 3 + ["R2"] * 3,
+        "value": [5, 3, 1, 4, 2, 0.1],
+    })
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=0.01)
+    art = HUFCore(elements, dataset_id="validate", validation="strict").cycle(cfg)
+    validate_artifacts(art, "fast")
+
+    broken = dict(art)
+    broken["active_set"] = type(art["active_set"])(art["active_set"].frame.assign(rho_global_post=0.5))
+    with pytest.raises(ValueError, match="sum to 1"):
+        validate_artifacts(broken, "fast")
+    broken["active_set"] = type(art["active_set"])(art["active_set"].frame.assign(value=-1.0))
+    with pytest.raises(ValueError, match="negative"):
+        validate_artifacts(broken, "fast")
+    validate_artifacts(broken, "off")
+    with pytest.raises(ValueError, match="Missing required artifact"):
+        validate_artifacts({k: v for k, v in art.items() if k != "trace_report"}, "fast")
+    with pytest.raises(ValueError):
+        HUFCore(elements, dataset_id="validate", validation="sometimes")
+
+
+def test_null_regime_id_is_rejected_at_input():
+    import numpy as np
+    import pytest
+
+    elements = pd.DataFrame({
+        "element_id": [f"e{i}" for i in range(4)],
+        "regime_id": ["R1", "R1", np.nan, "R2"],
+        "value": [5.0, 3.0, 1.0, 4.0],
+    })
+    with pytest.raises(ValueError, match="regime_id must not be null"):
+        HUFCore(elements, dataset_id="null_regime")
+    with pytest.raises(ValueError, match="regime_id must not be null"):
+        HUFCore(elements.astype({"regime_id": "category"}), dataset_id="null_regime")
+
+def test_coherence_map_segment_sums_are_pinned():
+    # Regime sums are compensated group sums (both engines). The older per-regime
+    # Series.sum() gave local_unity_post 0.9999999999999999 and rho_discarded_pre
+    # 0.016940272441494934 for R0 here; these are the values emitted since.
+    value = [0.15, 0.666, 1.646, 9.393, 0.263, 7.35, 0.266, 1.142, 4.593, 3.801, 9.119, 1.693]
+    elements = pd.DataFrame({
+        "element_id": [f"e{i}" for i in range(12)],
+        "regime_id": [f"R{i % 2}" for i in range(12)],
+        "value": value,
+    })
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=0.02)
+    for engine in ("pandas", "numpy"):
+        cm = HUFCore(elements, dataset_id="pin").cycle(cfg, engine=engine)["coherence_map"].set_index("regime_id")
+        assert cm.loc["R0", "local_unity_post"] == 1.0
+        assert cm.loc["R0", "rho_discarded_pre"] == 0.016940272441494937
+        assert cm.loc["R1", "local_unity_post"] == 0.9999999999999999
+        assert cm.loc["R1", "rho_discarded_pre"] == 0.016615937328476625
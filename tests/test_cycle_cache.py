@@ -0,0 +1,73 @@
+import pandas as pd
+
+from huf_core import CycleCache, HUFCore, HUFConfig
+
+
+def _elements(n=60):
+    return pd.DataFrame({
+        "element_id": [f"e{i}" for i in range(n)],
+        "regime_id": [f"R{i % 4}" for i in range(n)],
+        "value": [float((i * 7) % 13 + 1) for i in range(n)],
+    })
+
+
+def test_repeated_config_hits_cache_with_fresh_stamp():
+    cache = CycleCache()
+    core = HUFCore(_elements(), dataset_id="cache_test", cache=cache)
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=0.01)
+
+    first = core.cycle(cfg)
+    first["error_budget"]["note"] = "caller edit"
+    second = core.cycle(cfg, engine="numpy")
+
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+    assert "note" not in second["error_budget"]
+    assert second["active_set"] == first["active_set"]
+    pd.testing.assert_frame_equal(first["coherence_map"], second["coherence_map"])
+    assert second["run_stamp"]["param_hash"] == first["run_stamp"]["param_hash"]
+    assert second["run_stamp"]["created_utc"] >= first["run_stamp"]["created_utc"]
+
+    # same content in another core shares the entry; different content does not
+    HUFCore(_elements(), dataset_id="other", cache=cache).cycle(cfg)
+    assert cache.hits == 2
+    HUFCore(_elements(61), dataset_id="other", cache=cache).cycle(cfg)
+    assert (cache.misses, len(cache)) == (2, 2)
+
+
+def test_cache_evicts_least_recently_used():
+    elements = _elements()
+    cfgs = [HUFConfig(budget_type="mass", exclusion="global", tau=t) for t in (0.005, 0.01, 0.015)]
+
+    cache = CycleCache(max_entries=2, max_bytes=None)
+    core = HUFCore(elements, dataset_id="lru", cache=cache)
+    core.cycle(cfgs[0])
+    core.cycle(cfgs[1])
+    core.cycle(cfgs[0])  # refresh cfgs[0]
+    core.cycle(cfgs[2])  # evicts cfgs[1]
+    assert len(cache) == 2
+    core.cycle(cfgs[0])
+    assert cache.hits == 2
+    core.cycle(cfgs[1])
+    assert cache.misses == 4
+
+    one = CycleCache(max_entries=None)
+    HUFCore(elements, dataset_id="bytes", cache=one).cycle(cfgs[0])
+    size = one.nbytes
+    capped = CycleCache(max_entries=None, max_bytes=size + size // 2)
+    core = HUFCore(elements, dataset_id="bytes", cache=capped)
+    for cfg in cfgs:
+        core.cycle(cfg)
+    assert len(capped) < len(cfgs) and capped.nbytes <= capped.max_bytes
+
+    tiny = CycleCache(max_bytes=size - 1)
+    HUFCore(elements, dataset_id="bytes", cache=tiny).cycle(cfgs[0])
+    assert len(tiny) == 0 and tiny.nbytes == 0  # larger than the whole budget: not cached
+
+
+def test_error_metric_cycles_bypass_cache():
+    cache = CycleCache()
+    core = HUFCore(_elements(), dataset_id="metric", cache=cache)
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=0.01)
+    art = core.cycle(cfg, error_metric=lambda kept: {"kept_rows": len(kept)})
+    assert art["error_budget"]["kept_rows"] == len(art["active_set"])
+    assert len(cache) == 0 and cache.misses == 0
@@ -0,0 +1,106 @@
+from pathlib import Path
+import os
+import time
+
+import pandas as pd
+
+from huf_core import CycleCache, HUFCore, HUFConfig
+from huf_core import cli
+from huf_core.disk_cache import DiskCache, cached_elements, elements_key
+
+
+def _traffic_csv(path: Path) -> Path:
+    pd.DataFrame({
+        "TCS": [i % 9 for i in range(300)],
+        "PHASE": [(i * 5) % 12 + 1 for i in range(300)],
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_cli_rerun_hits_disk_cache_without_parsing(tmp_path, monkeypatch):
+    csv = _traffic_csv(tmp_path / "phase.csv")
+    cache_dir = tmp_path / "cache"
+    argv = ["traffic", "--csv", str(csv), "--tau-local", "0.2", "--cache-dir", str(cache_dir)]
+
+    assert cli.main(argv + ["--out", str(tmp_path / "a")]) == 0
+    first = DiskCache(cache_dir).entries()
+    assert set(first["kind"]) == {"elements", "cycles"}
+
+    def no_parse(*a, **k):
+        raise AssertionError("adapter re-ran on an unchanged input")
+
+    monkeypatch.setattr(cli, "traffic_phase_band_elements", no_parse)
+    assert cli.main(argv + ["--out", str(tmp_path / "b")]) == 0
+    for name in ("artifact_1_coherence_map.csv", "artifact_2_active_set.csv", "artifact_3_trace_report.jsonl"):
+        assert (tmp_path / "a" / name).read_bytes() == (tmp_path / "b" / name).read_bytes()
+    assert len(DiskCache(cache_dir).entries()) == len(first)
+
+    assert cli.main(["cache", "prune", "--dir", str(cache_dir), "--max-mb", "0"]) == 0
+    assert DiskCache(cache_dir).entries().empty
+
+
+def test_disk_cache_lru_size_cap_and_cycle_backing(tmp_path):
+    csv = _traffic_csv(tmp_path / "phase.csv")
+    store = DiskCache(tmp_path / "cache", max_bytes=None)
+    calls = []
+
+    def build():
+        calls.append(1)
+        from huf_core.adapters import traffic_phase_band_elements
+        return traffic_phase_band_elements(csv)
+
+    elements, meta = cached_elements(store, "traffic", csv, build)
+    again, meta2 = cached_elements(store, "traffic", csv, build)
+    assert len(calls) == 1 and meta2 == meta
+    pd.testing.assert_frame_equal(elements, again)
+    cached_elements(store, "traffic", csv, build, variant=2)  # different params -> different entry
+    assert len(calls) == 2
+
+    cfg = HUFConfig(budget_type="mass", exclusion="local", tau=0.2)
+    art = HUFCore(elements, dataset_id="disk", cache=CycleCache(backing=store)).cycle(cfg)
+    # a fresh process-level cache still hits through the disk level
+    warm = CycleCache(backing=store)
+    hit = HUFCore(elements, dataset_id="disk", cache=warm).cycle(cfg)
+    assert warm.hits == 1 and hit["active_set"] == art["active_set"]
+
+    entries = store.entries()
+    assert len(entries) == 3
+    # make the first element table the most recently used entry
+    path = store.root / "elements" / f"{elements_key('traffic', csv, {})}.pkl"
+    os.utime(path, (time.time() + 60, time.time() + 60))
+    assert store.prune(max_bytes=path.stat().st_size) == 2
+    assert store.entries()["key"].tolist() == [path.stem]
+
+
+def test_disk_cache_keys_carry_code_version(tmp_path, monkeypatch):
+    from huf_core import disk_cache
+    from huf_core.adapters import traffic_phase_band_elements
+
+    csv = _traffic_csv(tmp_path / "phase.csv")
+    key = elements_key("traffic", csv, {})
+    assert elements_key("traffic", csv, {}, code_fingerprint="huf_core_v2") != key
+    store = DiskCache(tmp_path / "cache")
+    cfg = HUFConfig(budget_type="mass", exclusion="local", tau=0.2)
+    elements, _ = cached_elements(store, "traffic", csv, lambda: traffic_phase_band_elements(csv))
+    HUFCore(elements, dataset_id="disk", cache=CycleCache(backing=store)).cycle(cfg)
+
+    # an upgraded package (new code version) misses both levels
+    monkeypatch.setattr(disk_cache, "code_version", lambda: "9.9.9+feedbeef")
+    upgraded = CycleCache(backing=DiskCache(tmp_path / "cache"))
+    HUFCore(elements, dataset_id="disk", cache=upgraded).cycle(cfg)
+    assert upgraded.hits == 0
+    assert elements_key("traffic", csv, {}) != key
+    assert DiskCache(tmp_path / "cache").load_elements(elements_key("traffic", csv, {})) is None
+
+
+def test_disk_cache_prunes_periodically(tmp_path, monkeypatch):
+    store = DiskCache(tmp_path / "cache", max_bytes=10**9, prune_every=4)
+    scans = []
+    real = DiskCache.prune
+    monkeypatch.setattr(DiskCache, "prune", lambda self, max_bytes=None: scans.append(1) or real(self, max_bytes))
+    for i in range(9):
+        store.put(("fp", f"p{i}"), {"error_budget": {"i": i}})
+    assert len(scans) == 3  # first store, then every 4th
+    small = DiskCache(tmp_path / "cache", max_bytes=1)
+    small.put(("fp", "big"), {"error_budget": {"x": 1}})  # over the cap: pruned at once
+    assert small.entries().empty
@@ -0,0 +1,80 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from huf_core import HUFCore, HUFConfig
+
+
+def _budget_elements():
+    rows = []
+    for fund in ("Operating", "Water", "Planning"):
+        for j, acct in enumerate(("Salaries", "Contracts", "Supplies", "Rent")):
+            value = {"Operating": 100, "Water": 30, "Planning": 6}[fund] / (j + 1)
+            rows.append({
+                "element_id": f"{fund}/{acct}",
+                "regime_id": f"Fund={fund}",
+                "value": value,
+                "trace_path": json.dumps(["Budget", "EXP", f"Fund={fund}", f"Account={acct}", f"cell={fund[0]}{j}"]),
+            })
+    return pd.DataFrame(rows)
+
+
+def test_hierarchy_levels_roll_up_and_match_flat_cycle_per_level():
+    elements = _budget_elements()
+    core = HUFCore(elements, dataset_id="tree")
+    tree = core.regime_tree
+    assert tree.depth == 4
+    assert [len(x) for x in tree.labels] == [1, 1, 3, 12]
+
+    cfg = HUFConfig(budget_type="mass", exclusion="local", tau=0.15)
+    art = core.cycle_hierarchy(cfg, level=2)  # Fund level == regime_id
+    flat = core.cycle(cfg, engine="numpy")
+    assert art["active_set"].frame["item_id"].tolist() == flat["active_set"].frame["item_id"].tolist()
+    assert art["error_budget"] == flat["error_budget"]
+
+    levels = art["coherence_hierarchy"]
+    for k, grp in levels.groupby("level"):
+        assert grp["rho_global_pre"].sum() == pytest.approx(1.0)
+        assert grp["rho_global_post"].sum() == pytest.approx(1.0)
+        assert grp["rho_discarded_pre"].sum() == pytest.approx(flat["error_budget"]["discarded_budget_global"])
+    fund = levels[levels["level"] == 2].set_index("regime_id")
+    ref = flat["coherence_map"].set_index("regime_id")
+    ref.index = "Budget/EXP/" + ref.index
+    for col in ("rho_global_pre", "rho_global_post", "rho_discarded_pre", "local_unity_post"):
+        np.testing.assert_allclose(fund.loc[ref.index, col], ref[col], rtol=1e-12)
+    assert (fund["parent_id"] == "Budget/EXP").all()
+    assert levels[levels["level"] == 0]["discarded_budget_local"].iloc[0] == pytest.approx(flat["error_budget"]["discarded_budget_global"])
+
+
+def test_hierarchy_falls_back_to_regime_id_without_paths():
+    elements = _budget_elements().drop(columns="trace_path")
+    core = HUFCore(elements, dataset_id="flat")
+    assert core.regime_tree.depth == 1
+    cfg = HUFConfig(budget_type="mass", exclusion="dual", tau=0.05, tau_local=0.3)
+    art = core.cycle_hierarchy(cfg)
+    ref = core.cycle(cfg)
+    pd.testing.assert_frame_equal(art["coherence_map"], ref["coherence_map"], check_exact=True)
+    assert art["active_set"] == ref["active_set"]
+    with pytest.raises(ValueError):
+        core.cycle_hierarchy(cfg, level=1)
+
+
+def test_hierarchy_keys_nodes_by_path_components():
+    from huf_core.hierarchy import RegimeTree
+
+    elements = pd.DataFrame({
+        "element_id": ["e0", "e1", "e2"],
+        "regime_id": ["A", "A", "B"],
+        "value": [1.0, 2.0, 3.0],
+        "trace_path": [json.dumps(["a/b", "c", "e0"]), json.dumps(["a", "b/c", "e1"]), json.dumps(["a", "b", "e2"])],
+    })
+    tree = RegimeTree.from_elements(elements)
+    assert list(tree.labels[0]) == ["a", "a/b"]
+    assert list(tree.labels[1]) == ["a/b", "a/b\\/c", "a\\/b/c"]
+    assert len(set(tree.element_codes(1))) == 3
+
+    bad = elements.assign(trace_path=[json.dumps("a/b"), json.dumps(["a", "e1"]), json.dumps(["b", "e2"])])
+    with pytest.raises(ValueError, match="not a JSON list"):
+        RegimeTree.from_elements(bad)
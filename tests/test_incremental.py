@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from huf_core import HUFConfig
+from huf_core.incremental import IncrementalHUFCore
+
+
+def _assert_matches_full_cycle(inc, cfg):
+    art = inc.to_core().cycle(cfg)
+    kept = {r["item_id"] for r in art["active_set"]}
+    assert set(inc.to_elements()["element_id"]) - kept == inc.excluded
+    assert abs(art["error_budget"]["discarded_budget_global"] - inc.discarded_budget_global) < 1e-9
+    for r in art["active_set"]:
+        assert abs(r["rho_global_post"] - inc.rho_global_post(r["item_id"])) < 1e-12
+        assert abs(r["rho_local_post"] - inc.rho_local_post(r["item_id"])) < 1e-12
+
+
+@pytest.mark.parametrize("cfg", [
+    HUFConfig(budget_type="mass", exclusion="global", tau=0.004),
+    HUFConfig(budget_type="mass", exclusion="local", tau=0.05),
+    HUFConfig(budget_type="mass", exclusion="dual", tau=0.004, tau_local=0.05),
+])
+def test_incremental_deltas_track_full_cycle(cfg):
+    rng = np.random.default_rng(11)
+    n = 200
+    elements = pd.DataFrame({
+        "element_id": [f"e{i}" for i in range(n)],
+        "regime_id": [f"R{r}" for r in rng.integers(0, 5, n)],
+        "value": np.round(rng.random(n) ** 3 * 100, 2),
+    })
+    inc = IncrementalHUFCore(elements, cfg)
+    _assert_matches_full_cycle(inc, cfg)
+
+    next_id = n
+    for _ in range(40):
+        ids = sorted(inc.to_elements()["element_id"])
+        deletes = list(rng.choice(ids, size=2, replace=False))
+        rest = [i for i in ids if i not in deletes]
+        updates = {str(e): float(np.round(rng.random() ** 3 * 100, 2)) for e in rng.choice(rest, size=2, replace=False)}
+        inserts = pd.DataFrame({
+            "element_id": [f"e{next_id}", f"e{next_id + 1}"],
+            "regime_id": [f"R{rng.integers(0, 6)}", "R0"],
+            "value": [float(np.round(rng.random() ** 3 * 100, 2)), 0.5],
+        })
+        next_id += 2
+
+        before = set(inc.excluded)
+        res = inc.apply_delta(inserts=inserts, updates=updates, deletes=deletes)
+        after = set(inc.excluded)
+        assert set(res["newly_excluded"]) == after - before
+        assert set(res["newly_kept"]) == (before - after) - set(deletes)
+        _assert_matches_full_cycle(inc, cfg)
+
+
+def test_incremental_rejects_bad_deltas():
+    elements = pd.DataFrame({"element_id": ["a", "b"], "regime_id": ["R", "R"], "value": [1.0, 2.0]})
+    inc = IncrementalHUFCore(elements, HUFConfig(budget_type="mass", exclusion="global", tau=0.1))
+    with pytest.raises(KeyError):
+        inc.apply_delta(deletes=["zz"])
+    with pytest.raises(ValueError):
+        inc.apply_delta(inserts=[{"element_id": "a", "regime_id": "R", "value": 1.0}])
+    with pytest.raises(ValueError):
+        inc.apply_delta(updates={"b": -1.0})
+    assert len(inc) == 2
+
+
+def test_failed_delta_leaves_tracker_unchanged():
+    rng = np.random.default_rng(3)
+    n = 500
+    elements = pd.DataFrame({
+        "element_id": [f"e{i}" for i in range(n)],
+        "regime_id": [f"R{r}" for r in rng.integers(0, 5, n)],
+        "value": rng.random(n) * 10,
+    })
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=0.001)
+    inc = IncrementalHUFCore(elements, cfg)
+    excluded, total = set(inc.excluded), inc.total
+    with pytest.raises(ValueError):
+        inc.apply_delta(
+            inserts=[{"element_id": "big", "regime_id": "R0", "value": 1e4}, {"element_id": "neg", "regime_id": "R0", "value": -1.0}],
+            updates={"e1": 5.0},
+            deletes=["e2"],
+        )
+    assert inc.excluded == excluded and inc.total == total and len(inc) == n
+    # a following delta still matches a full recompute
+    inc.apply_delta(inserts=[{"element_id": "big", "regime_id": "R0", "value": 1e4}])
+    _assert_matches_full_cycle(inc, cfg)
@@ -0,0 +1,179 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from huf_core import HUFCore, HUFConfig
+
+
+def _elements(n=400, regimes=7, seed=3):
+    rng = np.random.default_rng(seed)
+    value = rng.random(n) ** 4 * 100
+    value[: n // 3] = np.round(value[: n // 3], 1)  # ties
+    value[rng.random(n) < 0.05] = 0.0
+    return pd.DataFrame({
+        "element_id": [f"e{i}" for i in range(n)],
+        "regime_id": [f"R{r}" for r in rng.integers(0, regimes, n)],
+        "value": value,
+        "trace_path": [json.dumps(["Root", f"e{i}"]) if i % 5 else "" for i in range(n)],
+        "inputs_ref": "unit",
+        "method_ref": "synthetic",
+    })
+
+
+@pytest.mark.parametrize("cfg", [
+    HUFConfig(budget_type="mass", exclusion="global", tau=0.001),
+    HUFConfig(budget_type="mass", exclusion="local", tau=0.02),
+    HUFConfig(budget_type="mass", exclusion="dual", tau=0.002, tau_local=0.05),
+])
+def test_numpy_engine_matches_pandas_bit_for_bit(cfg):
+    core = HUFCore(_elements(), dataset_id="engine_test")
+    ref = core.cycle(cfg)
+    art = core.cycle(cfg, engine="numpy")
+
+    pd.testing.assert_frame_equal(ref["coherence_map"], art["coherence_map"], check_exact=True)
+    assert ref["active_set"] == art["active_set"]
+    assert ref["trace_report"] == art["trace_report"]
+    assert ref["error_budget"] == art["error_budget"]
+
+
+def test_numpy_engine_passes_kept_frame_to_error_metric():
+    core = HUFCore(_elements(), dataset_id="engine_test")
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=0.001)
+    seen = {}
+
+    def metric(kept):
+        seen.setdefault("frames", []).append(kept)
+        return {"kept_rows": int(kept.shape[0])}
+
+    ref = core.cycle(cfg, error_metric=metric)
+    art = core.cycle(cfg, error_metric=metric, engine="numpy")
+    assert ref["error_budget"] == art["error_budget"]
+    pd.testing.assert_frame_equal(seen["frames"][0], seen["frames"][1], check_exact=True)
+
+
+def test_numpy_engine_rejects_empty_kept_set_and_unknown_engine():
+    core = HUFCore(_elements(), dataset_id="engine_test")
+    with pytest.raises(ValueError):
+        core.cycle(HUFConfig(budget_type="mass", exclusion="global", tau=1.0), engine="numpy")
+    with pytest.raises(ValueError):
+        core.cycle(HUFConfig(budget_type="mass", exclusion="global", tau=0.0), engine="spark")
+
+
+def test_cycle_many_matches_single_cycles():
+    core = HUFCore(_elements(), dataset_id="engine_test")
+    configs = [
+        HUFConfig(budget_type=b, exclusion=e, tau=t, tau_local=tl)
+        for b in ("mass", "energy")
+        for e, t, tl in [("global", 0.001, None), ("global", 0.004, None), ("local", 0.02, None), ("dual", 0.002, 0.05)]
+    ]
+    batch = core.cycle_many(configs, lazy=True)
+    assert len(batch) == len(configs)
+    assert batch.masks.shape == (4, 400)  # budget_type does not change the mask
+    for cfg, art in zip(configs, core.cycle_many(configs)):
+        ref = core.cycle(cfg, engine="numpy")
+        pd.testing.assert_frame_equal(ref["coherence_map"], art["coherence_map"], check_exact=True)
+        assert ref["active_set"] == art["active_set"]
+        assert ref["trace_report"] == art["trace_report"]
+        assert ref["error_budget"] == art["error_budget"]
+    assert batch[1]["error_budget"]["discarded_budget_global"] > batch[0]["error_budget"]["discarded_budget_global"]
+
+
+def test_columnar_artifact_tables_behave_like_record_lists(tmp_path):
+    from huf_core.io import write_artifacts
+
+    core = HUFCore(_elements(), dataset_id="engine_test")
+    art = core.cycle(HUFConfig(budget_type="mass", exclusion="global", tau=0.001), engine="numpy")
+    active, trace = art["active_set"], art["trace_report"]
+    assert active[0]["rank"] == 1 and active[-1]["rank"] == len(active)
+    assert active[:2] == list(active)[:2]
+    assert set(trace[0]) == set(trace.fields)
+    assert isinstance(trace[0]["regime_path"], list)
+
+    write_artifacts(tmp_path, art)
+    written = pd.read_csv(tmp_path / "artifact_2_active_set.csv")
+    assert list(written.columns) == list(active.fields)
+    assert len(written) == len(active)
+    lines = (tmp_path / "artifact_3_trace_report.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == trace.to_list()
+
+
+def test_record_tables_concatenate_and_serialize_as_lists():
+    from huf_core.artifacts import json_default
+
+    art = HUFCore(_elements(), dataset_id="engine_test").cycle(HUFConfig(budget_type="mass", exclusion="global", tau=0.001))
+    trace = art["trace_report"]
+    assert not isinstance(trace, list)
+    assert trace + [] == [] + trace == trace.to_list()
+    assert json.loads(json.dumps(art["trace_report"], default=json_default)) == trace.to_list()
+    with pytest.raises(TypeError):
+        json.dumps(trace)
+
+
+def test_read_only_ingestion_shares_caller_arrays():
+    elements = _elements()
+    snapshot = elements.copy()
+    cfg = HUFConfig(budget_type="mass", exclusion="dual", tau=0.002, tau_local=0.05)
+    ref = HUFCore(elements, dataset_id="engine_test").cycle(cfg)
+
+    core = HUFCore(elements, dataset_id="engine_test", copy=False)
+    assert np.shares_memory(core.columnar.value, elements["value"].to_numpy())
+    for engine in ("pandas", "numpy"):
+        art = core.cycle(cfg, engine=engine)
+        pd.testing.assert_frame_equal(ref["coherence_map"], art["coherence_map"], check_exact=True)
+        assert ref["active_set"] == art["active_set"]
+    # cycles derive their columns elsewhere; the caller's table is untouched
+    pd.testing.assert_frame_equal(elements, snapshot)
+    assert list(core.elements.columns) == list(snapshot.columns)
+
+
+@pytest.mark.parametrize("engine", ["pandas", "numpy"])
+def test_compact_schema_matches_plain_artifacts(engine):
+    from huf_core import compact_elements
+
+    plain = _elements()
+    compact = compact_elements(plain)
+    assert isinstance(compact["regime_id"].dtype, pd.CategoricalDtype)
+    assert compact.memory_usage(deep=True).sum() < plain.memory_usage(deep=True).sum()
+
+    cfg = HUFConfig(budget_type="mass", exclusion="dual", tau=0.002, tau_local=0.05)
+    ref = HUFCore(plain, dataset_id="compact").cycle(cfg, engine=engine)
+    art = HUFCore(compact, dataset_id="compact", copy=False).cycle(cfg, engine=engine)
+    pd.testing.assert_frame_equal(ref["coherence_map"], art["coherence_map"], check_exact=True)
+    assert ref["active_set"] == art["active_set"]
+    assert ref["trace_report"] == art["trace_report"]
+
+
+def test_compact_float32_accumulates_in_float64():
+    from huf_core import compact_elements
+
+    plain = _elements()
+    compact = compact_elements(plain, float32=True)
+    # user-made categoricals with unused / unsorted categories are canonicalized on ingestion
+    compact["regime_id"] = compact["regime_id"].cat.add_categories(["A_unused"]).cat.reorder_categories(
+        ["A_unused"] + sorted(plain["regime_id"].unique(), reverse=True)
+    )
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=0.001)
+    core = HUFCore(compact, dataset_id="compact32")
+    art = core.cycle(cfg)
+    assert art["active_set"] == core.cycle(cfg, engine="numpy")["active_set"]
+
+    ref = HUFCore(plain.assign(value=plain["value"].astype(np.float32).astype(np.float64)), dataset_id="compact32").cycle(cfg)
+    pd.testing.assert_frame_equal(ref["coherence_map"], art["coherence_map"], check_exact=True)
+    assert ref["active_set"] == art["active_set"]
+
+
+def test_engines_agree_on_null_regime():
+    from huf_core.engine import ColumnarFrame
+
+    elements = _elements(n=50)
+    elements.loc[7, "regime_id"] = np.nan
+    cfg = HUFConfig(budget_type="mass", exclusion="local", tau=0.02)
+    for engine in ("pandas", "numpy"):
+        with pytest.raises(ValueError, match="regime_id must not be null"):
+            HUFCore(elements, dataset_id="null_regime").cycle(cfg, engine=engine)
+    # the columnar frame refuses the missing code itself (no silent last-regime total)
+    for regime_col in (elements["regime_id"], elements["regime_id"].astype("category")):
+        with pytest.raises(ValueError, match="regime_id must not be null"):
+            ColumnarFrame.from_elements(elements.assign(regime_id=regime_col))
@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+import pytest
 from huf_core import HUFCore, HUFConfig
 
 def test_stability_packet_shape():
@@ -12,3 +14,172 @@ def test_stability_packet_shape():
     sp = core.stability_packet(base, [0.02,0.03,0.05,0.07,0.10])
     assert sp.shape[0] == 5
     assert set(["tau","active_count","discarded_budget_global","jaccard_vs_baseline","spearman_regime_rho_vs_baseline","near_threshold_count"]).issubset(sp.columns)
+
+
+def test_stability_packet_sweep_engine_matches_cycle():
+    elements = pd.DataFrame({
+        "element_id": [f"A{i}" for i in range(20)],
+        "regime_id": ["R1"]*10 + ["R2"]*10,
+        "value": list(range(20,0,-1)),
+    })
+    core = HUFCore(elements, dataset_id="unit_test2")
+    for base, taus in [
+        (HUFConfig(budget_type="mass", exclusion="global", tau=0.05), [0.02, 0.03, 0.05, 0.07, 0.5]),
+        (HUFConfig(budget_type="mass", exclusion="local", tau=0.05), [0.02, 0.05, 0.1, 0.2]),
+        (HUFConfig(budget_type="mass", exclusion="dual", tau=0.05, tau_local=0.15), [0.02, 0.05, 0.5]),
+    ]:
+        ref = core.stability_packet(base, taus)
+        fast = core.stability_packet(base, taus, engine="sweep")
+        pd.testing.assert_frame_equal(ref, fast, check_exact=False, rtol=1e-12)
+
+
+def test_stability_curve_matches_cycle_between_breakpoints():
+    elements = pd.DataFrame({
+        "element_id": [f"A{i}" for i in range(20)],
+        "regime_id": ["R1"]*10 + ["R2"]*10,
+        "value": [5, 5, 4, 3, 3, 2, 1, 1, 0, 0] + list(range(10, 0, -1)),
+    })
+    core = HUFCore(elements, dataset_id="unit_test3")
+    for cfg in [
+        HUFConfig(budget_type="mass", exclusion="global", tau=0.0),
+        HUFConfig(budget_type="mass", exclusion="local", tau=0.0),
+        HUFConfig(budget_type="mass", exclusion="dual", tau=0.0, tau_local=0.2),
+    ]:
+        curve = core.stability_curve(cfg)
+        assert curve["tau_from"].iloc[0] == float("-inf") and curve["tau_to"].iloc[-1] == float("inf")
+        for row in curve.itertuples(index=False):
+            tau = row.tau_to if row.tau_to != float("inf") else row.tau_from * 2 + 1.0
+            probe = HUFConfig(**{**cfg.__dict__, "tau": tau})
+            try:
+                art = core.cycle(probe)
+            except ValueError:
+                assert row.invalid
+                continue
+            assert not row.invalid
+            assert row.active_count == len(art["active_set"])
+            assert abs(row.discarded_budget_global - art["error_budget"]["discarded_budget_global"]) < 1e-12
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_stability_packet_pool_executors_match_serial(executor):
+    import json
+
+    rng = np.random.default_rng(11)
+    n = 500
+    elements = pd.DataFrame({
+        "element_id": [f"e{i}" for i in range(n)],
+        "regime_id": [f"R{r}" for r in rng.integers(0, 9, n)],
+        "value": rng.random(n) ** 3 * 10,
+        "trace_path": [json.dumps(["Root", f"e{i}"]) for i in range(n)],
+    })
+    core = HUFCore(elements, dataset_id="pool_test")
+    cfg = HUFConfig(budget_type="mass", exclusion="dual", tau=0.001, tau_local=0.05)
+    taus = [0.001, 0.002, 0.004, 0.008, 1.0]  # last point removes everything -> invalid
+
+    ref = core.stability_packet(cfg, taus)
+    out = core.stability_packet(cfg, taus, executor=executor, max_workers=2)
+    pd.testing.assert_frame_equal(ref, out, check_exact=True)
+    with pytest.raises(ValueError):
+        core.stability_packet(cfg, taus, executor="cluster")
+
+
+def test_tau_for_retained_target_matches_sorted_cumsum():
+    rng = np.random.default_rng(5)
+    n = 20_000  # large enough to exercise the bucketed selection, not just the leaf sort
+    elements = pd.DataFrame({
+        "element_id": [f"e{i}" for i in range(n)],
+        "regime_id": [f"R{r}" for r in rng.integers(0, 12, n)],
+        "value": np.round(rng.pareto(1.3, n), 3),
+    })
+    core = HUFCore(elements, dataset_id="target_test")
+    targets = [0.5, 0.9, 0.95, 0.97, 0.99]
+
+    for frame, x in [("global", core.columnar.rho_global_pre), ("local", core.columnar.rho_local_pre)]:
+        order = np.argsort(-x, kind="stable")
+        cum = np.cumsum(core.columnar.rho_global_pre[order])
+        expected = x[order][np.searchsorted(cum, targets)]
+        np.testing.assert_array_equal(core.tau_for_retained_target(targets, frame=frame), expected)
+
+    tau = core.tau_for_retained_target(0.97, frame="dual", tau_local=0.01)
+    assert isinstance(tau, float)
+    art = core.cycle(HUFConfig(budget_type="mass", exclusion="dual", tau=tau, tau_local=0.01))
+    assert 1.0 - art["error_budget"]["discarded_budget_global"] >= 0.97
+    with pytest.raises(ValueError):
+        core.tau_for_retained_target(1.5)
+
+
+def test_retained_target_thresholds_match_sorted_cumsum_at_breakpoints():
+    from huf_core.sweep import retained_target_thresholds
+
+    rng = np.random.default_rng(11)
+    for decimals in (0, 2, 6):
+        for n in (50, 20_000):
+            v = np.round(rng.pareto(1.3, n), decimals) + 0.001
+            x = v / v.sum()
+            order = np.argsort(-x, kind="stable")
+            cum = np.cumsum(x[order])
+            ks = rng.integers(0, n, 20)
+            need = np.concatenate(([1.0, cum[-1]], cum[ks], np.nextafter(cum[ks], 0.0), np.nextafter(cum[ks], 2.0)))
+            need = need[need <= 1.0]
+            expected = x[order][np.minimum(np.searchsorted(cum, need), n - 1)]
+            np.testing.assert_array_equal(retained_target_thresholds(x, x, need), expected)
+
+
+def test_similarity_kernels_match_pairwise_definitions():
+    from itertools import combinations
+
+    from huf_core.core import jaccard, spearman_rank_corr
+    from huf_core.similarity import jaccard_codes, jaccard_matrix, kendall_matrix, spearman_matrix
+
+    rng = np.random.default_rng(2)
+    masks = rng.random((4, 300)) < 0.4
+    masks[3] = False
+    jm = jaccard_matrix(masks)
+    x = np.round(rng.random((4, 12)), 1)  # ties
+    sm = spearman_matrix(x)
+    km = kendall_matrix(x)
+    for i, j in combinations(range(4), 2):
+        a, b = np.flatnonzero(masks[i]), np.flatnonzero(masks[j])
+        assert jm[i, j] == jaccard(a.tolist(), b.tolist()) == jaccard_codes(a, b)
+        assert sm[i, j] == pytest.approx(spearman_rank_corr(pd.Series(x[i]), pd.Series(x[j])), abs=1e-12)
+        # Kendall tau-b by brute force over column pairs
+        s_i = np.sign(np.subtract.outer(x[i], x[i]))[np.triu_indices(12, 1)]
+        s_j = np.sign(np.subtract.outer(x[j], x[j]))[np.triu_indices(12, 1)]
+        ref = (s_i * s_j).sum() / np.sqrt(np.count_nonzero(s_i) * np.count_nonzero(s_j))
+        assert km[i, j] == pytest.approx(ref, abs=1e-12)
+    assert np.allclose(np.diag(sm), 1.0) and np.allclose(np.diag(km), 1.0)
+
+
+def test_kendall_matrix_many_columns_with_ties():
+    from huf_core.similarity import kendall_matrix
+
+    rng = np.random.default_rng(5)
+    m = 1500
+    x = np.round(rng.random((3, m)), 2)  # many ties
+    x[2] = x[0][::-1]
+    km = kendall_matrix(x)
+    iu = np.triu_indices(m, 1)
+    signs = [np.sign(np.subtract.outer(row, row))[iu] for row in x]
+    for i in range(3):
+        for j in range(i + 1, 3):
+            ref = (signs[i] * signs[j]).sum() / np.sqrt(np.count_nonzero(signs[i]) * np.count_nonzero(signs[j]))
+            assert km[i, j] == pytest.approx(ref, abs=1e-12)
+    assert kendall_matrix(np.ones((2, m)))[0, 1] == 0.0
+
+
+def test_sweep_similarity_tables():
+    rng = np.random.default_rng(4)
+    n = 300
+    elements = pd.DataFrame({
+        "element_id": [f"e{i}" for i in range(n)],
+        "regime_id": [f"R{r}" for r in rng.integers(0, 6, n)],
+        "value": rng.random(n) ** 2,
+    })
+    core = HUFCore(elements, dataset_id="similarity")
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=0.001)
+    taus = [0.001, 0.003, 0.006, 1.0]
+    sim = core.sweep_similarity(cfg, taus)
+    sp = core.stability_packet(cfg, taus)
+    np.testing.assert_allclose(sim["jaccard"].iloc[0, :3], sp["jaccard_vs_baseline"].iloc[:3], rtol=1e-12)
+    assert sim["kendall"].shape == (4, 4) and sim["spearman"].iloc[:, 3].isna().all()
+    assert sim["jaccard"].iloc[1, 2] == sim["jaccard"].iloc[2, 1]
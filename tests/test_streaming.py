@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from huf_core import HUFCore, HUFConfig
+from huf_core.io import write_artifacts
+from huf_core.streaming import stream_cycle
+
+
+def _elements(n=3000, seed=7):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "element_id": [f"e{i:05d}" for i in range(n)],
+        "regime_id": [f"R{r}" for r in rng.integers(0, 9, n)],
+        "value": rng.random(n) ** 3,  # no ties
+        "trace_path": [json.dumps(["Root", f"e{i:05d}"]) for i in range(n)],
+        "inputs_ref": "unit",
+        "method_ref": "synthetic",
+    })
+
+
+@pytest.mark.parametrize("cfg", [
+    HUFConfig(budget_type="mass", exclusion="global", tau=0.0002),
+    HUFConfig(budget_type="mass", exclusion="dual", tau=0.0002, tau_local=0.002),
+])
+def test_stream_cycle_matches_in_memory_artifacts(tmp_path, cfg):
+    elements = _elements()
+    src = tmp_path / "elements.csv"
+    elements.to_csv(src, index=False)
+
+    ref_dir = tmp_path / "ref"
+    write_artifacts(ref_dir, HUFCore(elements, dataset_id="s").cycle(cfg))
+    res = stream_cycle(src, cfg, tmp_path / "stream", dataset_id="s", chunksize=700, buffer_rows=100)
+
+    ref_active = pd.read_csv(ref_dir / "artifact_2_active_set.csv")
+    active = pd.read_csv(tmp_path / "stream" / "artifact_2_active_set.csv")
+    assert res["kept"] == len(ref_active)
+    pd.testing.assert_frame_equal(ref_active, active, check_exact=False, rtol=1e-12)
+
+    ref_cm = pd.read_csv(ref_dir / "artifact_1_coherence_map.csv")
+    cm = pd.read_csv(tmp_path / "stream" / "artifact_1_coherence_map.csv")
+    pd.testing.assert_frame_equal(ref_cm, cm, check_exact=False, rtol=1e-9)
+
+    ref_trace = (ref_dir / "artifact_3_trace_report.jsonl").read_text(encoding="utf-8").splitlines()
+    trace = (tmp_path / "stream" / "artifact_3_trace_report.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(x)["item_id"] for x in ref_trace] == [json.loads(x)["item_id"] for x in trace]
+    assert json.loads(trace[0])["regime_path"] == json.loads(ref_trace[0])["regime_path"]
+
+
+def test_stream_cycle_accepts_chunk_lists_but_not_one_shot_iterators(tmp_path):
+    elements = _elements(n=500)
+    chunks = [elements.iloc[i:i + 128] for i in range(0, len(elements), 128)]
+    cfg = HUFConfig(budget_type="mass", exclusion="local", tau=0.01)
+    res = stream_cycle(chunks, cfg, tmp_path / "a", dataset_id="s")
+    assert res["kept"] == len(HUFCore(elements, dataset_id="s").cycle(cfg)["active_set"])
+    with pytest.raises(TypeError):
+        stream_cycle(iter(chunks), cfg, tmp_path / "b", dataset_id="s")
+
+
+def test_stream_cycle_int_regimes_and_compressed_output(tmp_path):
+    from huf_core.io import read_artifacts, read_manifest
+
+    elements = _elements(n=600).assign(regime_id=lambda df: df["element_id"].str[1:].astype(int) % 5)
+    chunks = [elements.iloc[i:i + 150] for i in range(0, len(elements), 150)]
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=0.0005)
+    res = stream_cycle(chunks, cfg, tmp_path / "s", dataset_id="s", compression="gzip", buffer_rows=64)
+
+    ref = HUFCore(elements.assign(regime_id=elements["regime_id"].astype(str)), dataset_id="s").cycle(cfg)
+    assert res["kept"] == len(ref["active_set"])
+    assert sorted(res["coherence_map"]["regime_id"]) == ["0", "1", "2", "3", "4"]
+    got = read_artifacts(tmp_path / "s")
+    assert list(got["active_set"]["item_id"]) == list(ref["active_set"].frame["item_id"])
+    manifest = read_manifest(tmp_path / "s")
+    assert manifest["inputs_ref"] == ["unit"]
+    assert manifest["artifacts"]["artifact_3_trace_report.jsonl.gz"]["rows"] == res["kept"]
+    assert not [p for p in (tmp_path / "s").iterdir() if p.name.startswith(".")]
+
+
+def test_stream_cycle_merges_many_runs_in_rounds(tmp_path):
+    elements = _elements(n=2000)
+    chunks = [elements.iloc[i:i + 25] for i in range(0, len(elements), 25)]  # 80 runs
+    cfg = HUFConfig(budget_type="mass", exclusion="global", tau=0.0002)
+    stream_cycle(chunks, cfg, tmp_path / "flat", dataset_id="s", merge_fan_in=128)
+    res = stream_cycle(chunks, cfg, tmp_path / "rounds", dataset_id="s", buffer_rows=16, merge_fan_in=3)
+
+    ref = HUFCore(elements, dataset_id="s").cycle(cfg)
+    assert res["kept"] == len(ref["active_set"])
+    for name in ("artifact_2_active_set.csv", "artifact_3_trace_report.jsonl"):
+        assert (tmp_path / "flat" / name).read_bytes() == (tmp_path / "rounds" / name).read_bytes()
+    active = pd.read_csv(tmp_path / "rounds" / "artifact_2_active_set.csv")
+    assert list(active["item_id"]) == list(ref["active_set"].frame["item_id"])
+    with pytest.raises(ValueError):
+        stream_cycle(chunks, cfg, tmp_path / "bad", dataset_id="s", merge_fan_in=1)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from huf_core.timeseries import CycleSeries, drift_log
+
+
+def _cycles():
+    base = pd.DataFrame({
+        "element_id": ["Kopacki", "Lonjsko", "Crna", "Neretva", "Vransko"],
+        "regime_id": ["north", "north", "north", "south", "south"],
+        "value": [20.0, 30.0, 5.0, 25.0, 20.0],
+    })
+    later = base.assign(value=[20.0, 25.5, 5.0, 29.5, 20.0])
+    last = later[later["element_id"] != "Crna"]  # site stops reporting
+    return {2021: base, 2024: later, 2027: last}
+
+
+def test_cycle_series_shares_and_drift():
+    tables = _cycles()
+    series = CycleSeries.from_tables(tables, dtype=np.float32)
+    assert series.values.shape == (3, 5) and series.values.dtype == np.float32
+    for t, (cycle, table) in enumerate(tables.items()):
+        rho = pd.Series(series.rho(t), index=series.element_id)
+        ref = table.set_index("element_id")["value"] / table["value"].sum()
+        np.testing.assert_allclose(rho.reindex(ref.index), ref, rtol=1e-7)
+
+    drift = series.element_drift(0.04)
+    assert sorted(zip(drift["cycle_to"], drift["element_id"])) == [(2024, "Lonjsko"), (2024, "Neretva"), (2027, "Crna")]
+    crna = drift[drift["element_id"] == "Crna"].iloc[0]
+    assert crna["rho_to"] == 0.0 and crna["direction"] == "down"
+    assert drift.loc[drift["element_id"] == "Neretva", "delta"].iloc[0] == pytest.approx(0.045)
+
+    regimes = series.regime_drift(0.04)
+    assert len(regimes) == 2 * 2
+    assert regimes.groupby("cycle_to")["delta"].sum().abs().max() < 1e-12
+    south = regimes[(regimes["regime_id"] == "south") & (regimes["cycle_to"] == 2024)].iloc[0]
+    assert south["flagged"] and south["delta"] == pytest.approx(0.045)
+
+
+def test_drift_log_sums_duplicate_rows():
+    long = pd.DataFrame({
+        "cycle": ["a", "a", "a", "b", "b"],
+        "element_id": ["x", "x", "y", "x", "y"],
+        "regime_id": ["R", "R", "R", "R", "R"],
+        "value": [1.0, 1.0, 2.0, 1.0, 3.0],
+    })
+    out = drift_log(long, threshold=0.2)
+    assert out["element_drift"]["element_id"].tolist() == ["x", "y"]
+    assert out["element_drift"]["delta"].tolist() == pytest.approx([-0.25, 0.25])
+    assert not out["regime_drift"]["flagged"].any()
+
+
+def test_from_frame_matches_pivot_in_any_row_order():
+    rng = np.random.default_rng(2)
+    long = pd.DataFrame({
+        "cycle": rng.integers(0, 6, 400),
+        "element_id": [f"e{i}" for i in rng.integers(0, 40, 400)],
+        "regime_id": "R",
+        "value": rng.random(400),
+    })
+    series = CycleSeries.from_frame(long)
+    ref = long.pivot_table(index="cycle", columns="element_id", values="value", aggfunc="sum", fill_value=0.0)
+    np.testing.assert_allclose(series.values, ref[list(series.element_id)].to_numpy(), rtol=1e-12)
+    np.testing.assert_allclose(series.total, ref.sum(axis=1).to_numpy(), rtol=1e-12)
+    np.testing.assert_array_equal(CycleSeries.from_frame(long, dtype=np.float32).values, series.values.astype(np.float32))